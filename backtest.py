@@ -136,6 +136,8 @@ class Backtester:
         self.position_avg_price = 0.0  # Ortalama giriş fiyatı
         self.position_cost = 0.0  # Toplam maliyet
         self.trades: List[Trade] = []
+        # Kapanan satışların getirisi (RiskManager Kelly boyutlandırması için)
+        self.closed_history: List[Dict[str, float]] = []
         
         # Stats
         self.winning_trades = 0
@@ -188,7 +190,7 @@ class Backtester:
             
             # 2. Risk Management
             final_decision = base_decision
-            portfolio = {"balance": self.balance}
+            portfolio = {"balance": self.balance, "history": self.closed_history}
             
             if base_decision.get("action") == "BUY":
                 final_decision = risk_manager.evaluate_entry_risk(
@@ -350,6 +352,8 @@ class Backtester:
         
         # Stats güncelle
         self.cumulative_pnl += pnl
+        if cost_basis > 0:
+            self.closed_history.append({"profit_pct": pnl / cost_basis * 100})
         if pnl > 0:
             self.winning_trades += 1
         else:
@@ -655,6 +659,7 @@ class Backtester:
         self.position_avg_price = 0.0
         self.position_cost = 0.0
         self.trades = []
+        self.closed_history = []
         self.winning_trades = 0
         self.losing_trades = 0
         self.cumulative_pnl = 0.0
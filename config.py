@@ -252,6 +252,7 @@ class Settings:
     #                "global_summary" = TTL başına bir kez genel haber özeti oluştur
     NEWS_LLM_MODE: str = "global_summary"
     NEWS_LLM_GLOBAL_TTL_SEC: int = _get_env_int("NEWS_LLM_GLOBAL_TTL_SEC", 900)  # 15 dakika
+    NEWS_ANALYSIS_CONCURRENCY: int = 5  # Makale başı analizde aynı anda işlenen makale
     
     # Market Data Engine Ayarları
     # RSS Feed URL'leri (haber kaynakları)
@@ -326,6 +327,7 @@ class Settings:
     # Live Order Retry Ayarları
     LIVE_ORDER_MAX_RETRIES: int = 3  # Başarısız order için max deneme
     LIVE_ORDER_RETRY_DELAY: float = 2.0  # Denemeler arası bekleme (saniye)
+    LIVE_ORDER_MAX_BACKOFF_SEC: float = 30.0  # Exponential backoff üst sınırı (saniye)
     
     # Order Executor Ayarları
     # Slippage ve fee simülasyonu (paper trading için)
@@ -334,11 +336,28 @@ class Settings:
     
     # Rate Limiting - çok hızlı order spam'ini engeller
     ORDER_MIN_INTERVAL_SEC: float = 1.0  # İki order arası minimum bekleme
+    # Client-side order kotası (Binance spot: 50 order / 10 sn) - 429/418 ban önleme
+    ORDER_RATE_LIMIT_COUNT: int = 50  # Pencere başına maksimum order
+    ORDER_RATE_LIMIT_WINDOW_SEC: float = 10.0  # Kota penceresi (saniye)
     
     # SL/TP Watchdog Ayarları
     # Açık pozisyonların SL/TP kontrolünü ana döngüden bağımsız yapar
     SLTP_WATCHDOG_ENABLED: bool = True  # Watchdog aktif mi?
     SLTP_WATCHDOG_INTERVAL_SEC: int = 30  # Kaç saniyede bir kontrol (varsayılan: 30sn)
+    SLTP_WATCHDOG_MIN_INTERVAL_SEC: float = 5.0  # SL/TP'ye çok yakın pozisyon varken en kısa aralık
+    SLTP_WATCHDOG_MAX_INTERVAL_SEC: float = 60.0  # Tüm pozisyonlar tetikten uzaktayken en uzun aralık
+    SLTP_WATCHDOG_TRIGGER_PCT: float = 2.0  # Bu mesafede (%) interval = SLTP_WATCHDOG_INTERVAL_SEC; daha yakında kısalır
+    PRICE_CACHE_TTL_SEC: float = 5.0  # Ana döngü + watchdog ortak fiyat cache TTL (en fazla interval/2)
+    SLTP_QUIET_BAND_RATIO: float = 0.5  # Fiyat SL/TP mesafesinin bu oranı kadar oynamadıysa kontrolü atla (0 = kapalı, [0, 1) dışı değerler sıkıştırılır)
+    WATCHDOG_CONCURRENCY: int = 5  # SL/TP sweep'inde aynı anda en fazla kaç canlı satış/snapshot isteği
+    SWEEP_LATENCY_WARN_MS: float = 2000.0  # SL/TP sweep süresinin p95'i bunu aşarsa uyarı logu
+    
+    # Portföy Kayıt Ayarları
+    # Kapanmış işlemler history.jsonl'e satır satır eklenir; portfolio.json'da
+    # sadece son HISTORY_HOT_TAIL işlem tutulur. Arşive geçen kayıt yeniden yazılmaz:
+    # sonradan gelen güncellemeler (canlı satış sonucu) sadece kuyruktayken kalıcı olur
+    HISTORY_JSONL: str = "history.jsonl"
+    HISTORY_HOT_TAIL: int = 50
     
     # LoopController Alarm Eşikleri
     # Telegram uyarısı göndermeden önce kaç ardışık hata beklenecek
@@ -398,6 +417,8 @@ class Settings:
     TRAIL_LOOKBACK: int = 22
     # Trailing stop ATR çarpanı: trail = HighestClose - TRAIL_ATR_MULT * ATR
     TRAIL_ATR_MULT: float = 3.0
+    # Watchdog trailing için ATR cache süresi (sn) - her turda snapshot kurulmasın
+    TRAIL_ATR_CACHE_SEC: float = 300.0
     # EMA50 slope hesabı için lookback (kaç bar öncesiyle karşılaştır)
     EMA_SLOPE_LOOKBACK: int = 5
     # Breakout için lookback (HighestHigh/HighestClose)
@@ -415,6 +436,17 @@ class Settings:
     # Volatilite ölçeği sınırları
     MIN_VOL_SCALE: float = 0.5
     MAX_VOL_SCALE: float = 1.5
+    # Kelly boyutlandırma (opsiyonel): son KELLY_WINDOW işlemin kazanma oranı ve
+    # ortalama kazanç/kayıp oranından Kelly payı; KELLY_FRACTION ile ölçeklenir
+    # (0.5 = yarım Kelly) ve işlem başı risk yüzdesini sadece aşağı çeker.
+    # Sadece RiskManager.evaluate_entry_risk'e kapanmış işlem geçmişi veren
+    # yolda (backtest) etkilidir; canlı döngü başlangıçta uyarı loglar
+    KELLY_SIZING_ENABLED: bool = False
+    KELLY_FRACTION: float = 0.5
+    KELLY_WINDOW: int = 50
+    KELLY_MIN_TRADES: int = 20  # Daha az kapanmış işlemde sabit risk kullanılır
+    # Avantaj <= 0 iken bile risk, sabit riskin bu oranının altına inmez (0 = kilitlenme)
+    KELLY_MIN_RISK_FRACTION: float = 0.25
     
     # ─────────────────────────────────────────────────────────────────────────────
     # V1 Execution Ayarları
@@ -24,6 +24,7 @@ Kullanım:
 """
 
 import asyncio
+import json
 import time
 import random
 from enum import Enum
@@ -319,7 +320,7 @@ class ExchangeRouter:
     # ─────────────────────────────────────────────────────────────────────────
     # PRICE CACHE
     # ─────────────────────────────────────────────────────────────────────────
-    def get_price(self, symbol: str) -> Optional[float]:
+    def get_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
         """
         Önbellekten fiyat al.
         
@@ -328,6 +329,7 @@ class ExchangeRouter:
         
         Args:
             symbol: Sembol (örn: BTCUSDT)
+            max_age: Kabul edilen en eski fiyat yaşı (sn); None ise cache TTL
         
         Returns:
             Fiyat float veya None
@@ -340,23 +342,24 @@ class ExchangeRouter:
             
             # TTL kontrolü
             timestamp = self._price_timestamps.get(symbol, 0)
-            if time.time() - timestamp > self._cache_ttl:
+            if time.time() - timestamp > (self._cache_ttl if max_age is None else max_age):
                 return None
             
             return self._price_cache[symbol]
     
-    def get_price_or_fetch(self, symbol: str) -> Optional[float]:
+    def get_price_or_fetch(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
         """
         Önce cache'e bak, yoksa API'den çek.
         
         Args:
             symbol: Sembol (örn: BTCUSDT)
+            max_age: Cache'ten kabul edilen en eski fiyat yaşı (sn); None ise cache TTL
         
         Returns:
             Fiyat float veya None
         """
         # Cache'den dene
-        cached = self.get_price(symbol)
+        cached = self.get_price(symbol, max_age)
         if cached is not None:
             return cached
         
@@ -372,6 +375,71 @@ class ExchangeRouter:
         
         return None
     
+    def get_prices_or_fetch(self, symbols: List[str], max_age: Optional[float] = None) -> Dict[str, float]:
+        """
+        Birden fazla sembol için fiyat al - cache miss'ler tek REST çağrısında.
+        
+        Binance GET /api/v3/ticker/price?symbols=[...] ile tüm eksik semboller
+        N ayrı istek yerine tek round-trip'te çekilir.
+        
+        Args:
+            symbols: Semboller (örn: ["BTCUSDT", "ETHUSDT"])
+            max_age: Cache'ten kabul edilen en eski fiyat yaşı (sn); None ise cache TTL
+        
+        Returns:
+            {SYMBOL: price} - fiyatı alınamayan semboller dict'te yer almaz
+        """
+        prices: Dict[str, float] = {}
+        missing: List[str] = []
+        
+        for symbol in {s.upper() for s in symbols}:
+            cached = self.get_price(symbol, max_age)
+            if cached is not None:
+                prices[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        if missing and self._client:
+            try:
+                tickers = self._client.get_symbol_ticker(symbols=json.dumps(sorted(missing), separators=(",", ":")))
+                for ticker in tickers:
+                    price = float(ticker['price'])
+                    self._update_price_cache(ticker['symbol'], price)
+                    prices[ticker['symbol'].upper()] = price
+            except Exception as e:
+                logger.warning(f"[ExchangeRouter] Toplu fiyat çekilemedi {missing}: {e}")
+        
+        return prices
+    
+    async def get_prices_async(self, symbols: List[str], timeout_s: float = 5.0,
+                               max_age: Optional[float] = None) -> Dict[str, float]:
+        """
+        Async toplu fiyat getter - REST çağrısı thread'de çalışır.
+        
+        Args:
+            symbols: Semboller (örn: ["BTCUSDT", "ETHUSDT"])
+            timeout_s: REST çağrısı timeout
+            max_age: Cache'ten kabul edilen en eski fiyat yaşı (sn); None ise cache TTL
+        
+        Returns:
+            {SYMBOL: price} - fiyatı alınamayan semboller dict'te yer almaz
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(
+                loop.run_in_executor(None, lambda: self.get_prices_or_fetch(symbols, max_age)),
+                timeout=timeout_s
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"[ExchangeRouter] get_prices_async timeout for {symbols}")
+            prices: Dict[str, float] = {}
+            for symbol in symbols:
+                # Timeout fallback'i de çağıranın tazelik sınırına uyar
+                cached = self.get_price(symbol, max_age)
+                if cached is not None:
+                    prices[symbol.upper()] = cached
+            return prices
+    
     def _update_price_cache(self, symbol: str, price: float) -> None:
         """Cache'i güncelle."""
         with self._price_lock:
@@ -585,7 +653,7 @@ class ExchangeRouter:
         await asyncio.gather(*tasks, return_exceptions=True)
         
         # Log sonuç
-        cached_count = len([s for s in self._symbols if self.get_price(s) is not None])
+        cached_count = sum(1 for s in self._symbols if self.get_price(s) is not None)
         logger.info(f"[ExchangeRouter] ✅ Pre-fetched {cached_count}/{len(self._symbols)} prices")
 
     def add_price_callback(self, callback: Callable[[str, float], None]) -> None:
@@ -111,6 +111,9 @@ class ExecutionManager:
         
         # Injected functions
         self._save_portfolio = save_portfolio_fn
+        # suspend_saves() ile ertelenen kayıt (toplu SL/TP sweep'leri için)
+        self._saves_suspended = False
+        self._save_pending = False
         self._log = log_fn or self._default_log
         self._telegram_fn = telegram_fn
         
@@ -221,6 +224,41 @@ class ExecutionManager:
         """Açık pozisyonları döndürür."""
         return self.portfolio.get("positions", [])
     
+    def _persist_portfolio(self):
+        """Portföyü kaydet; suspend_saves() aktifse kaydı ertele."""
+        if not self._save_portfolio:
+            return
+        if self._saves_suspended:
+            self._save_pending = True
+            return
+        self._save_portfolio(self.portfolio)
+    
+    def suspend_saves(self):
+        """
+        Kapanış başına portföy kaydını geçici olarak durdur.
+        
+        Aynı turda birden fazla pozisyon kapatan çağıran (PositionManager)
+        sonunda resume_saves() ile tek kayıt yapar.
+        """
+        self._saves_suspended = True
+    
+    def resume_saves(self, flush: bool = True) -> bool:
+        """
+        Ertelenen kayıtları serbest bırak.
+        
+        Args:
+            flush: Erteleme sırasında kayıt istendiyse hemen yaz
+        
+        Returns:
+            Erteleme sırasında kayıt istendi mi (flush=False ise çağıran yazmalı)
+        """
+        self._saves_suspended = False
+        pending = self._save_pending
+        self._save_pending = False
+        if pending and flush:
+            self._persist_portfolio()
+        return pending
+    
     def open_position(
         self,
         symbol: str,
@@ -267,14 +305,15 @@ class ExecutionManager:
             "partial_tp_target": partial_tp_target, # Price level for partial TP
             "initial_sl": stop_loss,               # Original stop loss (never changes)
             "current_sl": stop_loss,               # Current SL (updated by trailing)
+            # 1R seviyesi (giriş + risk) - watchdog her sweep'te yeniden hesaplamasın
+            "one_r_price": entry_price + (entry_price - stop_loss) if stop_loss and 0 < stop_loss < entry_price else None,
             "highest_close_since_entry": entry_price  # For trailing stop calculation
         }
         
         self.portfolio["balance"] -= trade_cost
         self.portfolio["positions"].append(position)
         
-        if self._save_portfolio:
-            self._save_portfolio(self.portfolio)
+        self._persist_portfolio()
         
         return True, position
     
@@ -348,8 +387,7 @@ class ExecutionManager:
             # Geçmişe partial trade ekle
             self.portfolio["history"].append(partial_trade)
             
-            if self._save_portfolio:
-                self._save_portfolio(self.portfolio)
+            self._persist_portfolio()
             
             return True, profit_loss, partial_trade
         
@@ -378,8 +416,7 @@ class ExecutionManager:
             del self.portfolio["positions"][position_index]
             self.portfolio["history"].append(closed_trade)
             
-            if self._save_portfolio:
-                self._save_portfolio(self.portfolio)
+            self._persist_portfolio()
             
             return True, profit_loss, closed_trade
     
@@ -654,8 +691,7 @@ class ExecutionManager:
                             order_type="MARKET"
                         )
                         position["live_order_id"] = live_order.get("orderId")
-                        if self._save_portfolio:
-                            self._save_portfolio(self.portfolio)
+                        self._persist_portfolio()
                         self._log(f"🔴 CANLI EMİR: {symbol} OrderId={live_order.get('orderId')}", "OK")
                         self._stats["live_orders_placed"] += 1
                         break  # Başarılı, döngüden çık
@@ -806,8 +842,7 @@ class ExecutionManager:
                         
                         closed["live_sell_order_id"] = live_order.get("orderId")
                         closed["live_sell_status"] = "FILLED"
-                        if self._save_portfolio:
-                            self._save_portfolio(self.portfolio)
+                        self._persist_portfolio()
                         
                         self._log(f"🔴 CANLI SATIŞ BAŞARILI: {symbol} OrderId={live_order.get('orderId')}", "OK")
                         self._stats["live_orders_placed"] += 1
@@ -825,8 +860,7 @@ class ExecutionManager:
                                 self.portfolio["history"][-1]["live_sell_failed"] = True
                                 self.portfolio["history"][-1]["live_sell_error"] = str(e)
                                 self.portfolio["history"][-1]["recovery_needed"] = True
-                                if self._save_portfolio:
-                                    self._save_portfolio(self.portfolio)
+                                self._persist_portfolio()
                             
                             self._stats["live_orders_failed"] += 1
             
@@ -272,6 +272,8 @@ class LoopController:
                 except asyncio.CancelledError:
                     pass
                 logger.info("🐕 Watchdog task stopped.")
+            # Son kapanışların Telegram bildirimleri gönderilmeden çıkma
+            await self.position_manager.drain_telegram()
 
     async def run_once(self):
         """Executes one 15-min cycle."""
@@ -342,7 +344,8 @@ class LoopController:
         # 4d. Run News Analysis Pipeline (Per-Article LLM Analysis)
         new_articles_count = 0
         try:
-            new_articles_count = self.market_data_engine.run_news_analysis_pipeline()
+            # Senkron HTTP + LLM çağrıları event loop'u (watchdog) bloklamasın
+            new_articles_count = await asyncio.to_thread(self.market_data_engine.run_news_analysis_pipeline)
             if new_articles_count > 0:
                 logger.info(f"📰 Analyzed {new_articles_count} new articles")
         except Exception as e:
@@ -742,6 +745,9 @@ class LoopController:
                 if self.execution_manager._save_portfolio:
                     self.execution_manager._save_portfolio(portfolio)
                 
+                # Boşta bekleyen SL/TP watchdog'unu uyandır
+                self.position_manager.notify_position_opened()
+                
                 logger.info(
                     f"  ✅ V2 BUY Executed for {symbol} | "
                     f"Type: {entry_type} | "
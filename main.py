@@ -287,6 +287,11 @@ print_boot_banner()
 
 ISLENMIS_HABERLER_DOSYASI = "islenmis_haberler.txt"
 PORTFOLIO_DOSYASI = "portfolio.json"
+# Kapanmış işlem arşivi (JSON-Lines, sadece sona ekleme)
+HISTORY_DOSYASI = getattr(SETTINGS, 'HISTORY_JSONL', "history.jsonl")
+# portfolio.json'da tutulan son işlem sayısı; arşive geçen kayıt bir daha yazılmaz,
+# sonradan gelen güncellemeler (canlı satış sonucu) sadece bu kuyruktayken kalıcı olur
+HISTORY_SICAK_KUYRUK = getattr(SETTINGS, 'HISTORY_HOT_TAIL', 50)
 TRADE_LOG_DOSYASI = "trade_decisions_log.json"  # AI karar detayları için
 # Paper mod için PAPER_START_EQUITY kullan, yoksa config'den BASLANGIC_BAKIYE
 BASLANGIC_BAKIYE = PAPER_START_EQUITY if RUN_PROFILE == "paper" else SETTINGS.BASLANGIC_BAKIYE
@@ -357,6 +362,7 @@ def load_portfolio():
                 portfolio["positions"] = []
             if "history" not in portfolio:
                 portfolio["history"] = []
+            _history_arsivini_yukle(portfolio)
             return portfolio
     except json.JSONDecodeError as e:
         log(f"Portföy JSON hatası: {e}, sıfırlanıyor...", "ERR")
@@ -371,11 +377,76 @@ def load_portfolio():
         log(f"Portföy yükleme hatası: {e}", "ERR")
         return {"balance": BASLANGIC_BAKIYE, "positions": [], "history": []}
 
+# history.jsonl'e yazılmış kayıt sayısı ve dosyanın o anki boyutu
+_history_arsiv = {"sayi": 0, "bayt": 0}
+
+def _history_arsivini_yukle(portfolio):
+    """portfolio.json'daki son işlemlerin önüne history.jsonl arşivini ekler."""
+    arsiv_sayisi = portfolio.pop("history_archived", 0)
+    arsiv_bayt = portfolio.pop("history_archived_bytes", 0)
+    if arsiv_sayisi:
+        from utils.io import read_jsonl
+        arsiv = read_jsonl(HISTORY_DOSYASI, limit=arsiv_sayisi)
+        if len(arsiv) < arsiv_sayisi:
+            log(f"History arşivi eksik: {len(arsiv)}/{arsiv_sayisi} kayıt okunabildi", "WARN")
+            arsiv_bayt = os.path.getsize(HISTORY_DOSYASI) if os.path.exists(HISTORY_DOSYASI) else 0
+        portfolio["history"] = arsiv + portfolio["history"]
+        arsiv_sayisi = len(arsiv)
+    _history_arsiv["sayi"] = arsiv_sayisi
+    _history_arsiv["bayt"] = arsiv_bayt
+
+def _history_arsivle(history) -> int:
+    """
+    Sıcak kuyruktan taşan işlemleri history.jsonl'e ekler.
+    
+    Her işlem bir kez yazılır; kayıt maliyeti toplam işlem sayısından
+    bağımsızdır. Returns: arşivdeki kayıt sayısı.
+    
+    Kısıt: arşive geçen kayıt bir daha yazılmaz. Bir işlem kaydındaki sonraki
+    değişiklikler (örn. gecikmeli canlı satış sonucu) sadece kayıt sıcak
+    kuyruktayken (son HISTORY_SICAK_KUYRUK işlem) kalıcı olur; canlı satışlar
+    aynı sweep içinde sonuçlandığı için kuyruk bunun için yeterince uzun olmalı.
+    
+    Dosya hatasında (OSError) arşiv ilerletilmez; kayıtlar sıcak kuyrukta
+    kalır ve portfolio.json yine yazılır.
+    """
+    from utils.io import append_jsonl
+    
+    if len(history) < _history_arsiv["sayi"]:
+        # History dışarıdan sıfırlandı/kısaltıldı: arşivi baştan kur
+        _history_arsiv["sayi"] = 0
+        _history_arsiv["bayt"] = 0
+    
+    hedef = len(history) - HISTORY_SICAK_KUYRUK
+    if hedef > _history_arsiv["sayi"]:
+        try:
+            # Yarım kalmış bir önceki ekleme varsa son bilinen sağlam boyuta dön
+            if os.path.exists(HISTORY_DOSYASI) and os.path.getsize(HISTORY_DOSYASI) != _history_arsiv["bayt"]:
+                os.truncate(HISTORY_DOSYASI, _history_arsiv["bayt"])
+            if append_jsonl(HISTORY_DOSYASI, history[_history_arsiv["sayi"]:hedef]):
+                bayt = os.path.getsize(HISTORY_DOSYASI)
+                _history_arsiv["sayi"] = hedef
+                _history_arsiv["bayt"] = bayt
+        except OSError as e:
+            log(f"History arşivleme hatası (kayıtlar portfolio.json'da kalıyor): {e}", "ERR")
+    return _history_arsiv["sayi"]
+
 def save_portfolio(portfolio):
-    """Portföyü JSON dosyasına atomik olarak kaydeder."""
+    """
+    Portföyü JSON dosyasına atomik olarak kaydeder.
+    
+    Eski işlemler history.jsonl'de tutulur; portfolio.json'a sadece son
+    HISTORY_SICAK_KUYRUK işlem ve arşiv sayacı yazılır.
+    """
     try:
         from utils.io import write_atomic_json
-        return write_atomic_json(PORTFOLIO_DOSYASI, portfolio)
+        history = portfolio.get("history", [])
+        arsiv_sayisi = _history_arsivle(history)
+        kayit = dict(portfolio)
+        kayit["history"] = history[arsiv_sayisi:]
+        kayit["history_archived"] = arsiv_sayisi
+        kayit["history_archived_bytes"] = _history_arsiv["bayt"]
+        return write_atomic_json(PORTFOLIO_DOSYASI, kayit)
     except ImportError:
         # Fallback if utils.io not available
         try:
@@ -391,12 +462,30 @@ def save_portfolio(portfolio):
 # TELEGRAM HELPER
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Token başına tek Bot: HTTP bağlantısı (TLS/keep-alive) bildirimler arasında korunur
+_telegram_botlari = {}
+
+def _telegram_botu(bot_token):
+    bot = _telegram_botlari.get(bot_token)
+    if bot is None:
+        bot = _telegram_botlari[bot_token] = telegram.Bot(token=bot_token)
+    return bot
+
+async def telegram_botlarini_kapat():
+    """Kapanışta paylaşılan Bot'ların HTTP bağlantılarını kapatır."""
+    for bot in list(_telegram_botlari.values()):
+        try:
+            await bot.shutdown()
+        except Exception as e:
+            log(f"Telegram bot kapatma hatası: {e}", "WARN")
+    _telegram_botlari.clear()
+
 async def telegrama_bildirim_gonder(bot_token, chat_id, mesaj):
     if not bot_token or not chat_id:
         log("Telegram: Bot token veya Chat ID eksik", "ERR")
         return
     try:
-        bot = telegram.Bot(token=bot_token)
+        bot = _telegram_botu(bot_token)
         if len(mesaj) > 4000:
             mesaj = mesaj[:4000] + "\n\n...(Mesaj kısaltıldı)..."
         await bot.send_message(chat_id=chat_id, text=mesaj, parse_mode='HTML', disable_web_page_preview=True)
@@ -481,6 +570,9 @@ async def ana_dongu():
         # Initialize RiskManager
         risk_manager = RiskManager()
         log("RiskManager başlatıldı", "OK")
+        if getattr(SETTINGS, 'KELLY_SIZING_ENABLED', False):
+            # Canlı girişler evaluate_entry_risk'ten geçmez: Kelly sadece backtest'te etkili
+            log("KELLY_SIZING_ENABLED canlı döngüde etkisiz (sadece backtest boyutlandırması)", "WARN")
         
     except Exception as e:
         log(f"Modüler mimari başlatma hatası: {e}", "ERR")
@@ -585,7 +677,10 @@ async def ana_dongu():
         log(f"TelegramCommandHandler başlatılamadı: {e}", "WARN")
 
     # ──────────────── ANA DÖNGÜYÜ BAŞLAT ────────────────
-    await loop_controller.run()
+    try:
+        await loop_controller.run()
+    finally:
+        await telegram_botlarini_kapat()
 
 if __name__ == "__main__":
     try:
@@ -36,9 +36,12 @@ import requests
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Set, Tuple
 from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from config import SETTINGS
+from utils.gemini import get_gemini_model
+from utils.io import loads_json
 # llm_utils removed - using internal _safe_json_loads method
 
 # Merkezi logger'ı import et
@@ -69,6 +72,10 @@ except ImportError:
     CCXT_AVAILABLE = False
 
 
+# LLM JSON temizliği: kapanıştan önceki sondaki virgül (",}" / ",]")
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CCXT DATA PROVIDER
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -389,6 +396,12 @@ class MarketDataEngine:
     # API Timeout (config'den oku)
     API_TIMEOUT = getattr(SETTINGS, 'API_TIMEOUT_DEFAULT', 10)
     
+    # Toplu fiyat fallback'inde aynı anda en fazla kaç REST isteği
+    PRICE_FETCH_CONCURRENCY = 5
+    
+    # Haber pipeline'ında aynı anda analiz edilen makale sayısı (içerik + LLM)
+    NEWS_ANALYSIS_CONCURRENCY = getattr(SETTINGS, 'NEWS_ANALYSIS_CONCURRENCY', 5)
+    
     CACHE_TTL = {
         "fng": 3600,      # 1 hour (fixed - rarely changes)
         "reddit": 900,    # 15 min
@@ -449,6 +462,8 @@ class MarketDataEngine:
         
         # Lock for cache dict operations
         self._cache_lock = Lock()
+        # llm_metrics sayaçları/EMA'ları haber thread havuzundan da güncellenir
+        self._metrics_lock = Lock()
         
         # LLM Metrics
         self.llm_metrics = {
@@ -718,18 +733,20 @@ class MarketDataEngine:
             )
             
             # Handle exceptions and use sync fallback
-            if isinstance(df_1d, Exception) or df_1d is None:
-                logger.warning(f"[V2] 1d async fetch failed, trying sync: {df_1d if isinstance(df_1d, Exception) else 'None'}")
-                df_1d = self._get_klines_sync(symbol_clean, "1d", 200)
-            if isinstance(df_4h, Exception) or df_4h is None:
-                logger.warning(f"[V2] 4h async fetch failed, trying sync: {df_4h if isinstance(df_4h, Exception) else 'None'}")
-                df_4h = self._get_klines_sync(symbol_clean, "4h", 200)
-            if isinstance(df_1h, Exception) or df_1h is None:
-                logger.warning(f"[V2] 1h async fetch failed, trying sync: {df_1h if isinstance(df_1h, Exception) else 'None'}")
-                df_1h = self._get_klines_sync(symbol_clean, "1h", 200)
-            if isinstance(df_15m, Exception) or df_15m is None:
-                logger.warning(f"[V2] 15m async fetch failed, trying sync: {df_15m if isinstance(df_15m, Exception) else 'None'}")
-                df_15m = self._get_klines_sync(symbol_clean, "15m", 100)
+            # Senkron fallback'ler thread'de birlikte çalışır: event loop'u (diğer
+            # sembollerin snapshot'larını) bloklamaz, süre toplam yerine max(fetch) olur
+            frames = {"1d": df_1d, "4h": df_4h, "1h": df_1h, "15m": df_15m}
+            failed = [tf for tf, df in frames.items() if isinstance(df, Exception) or df is None]
+            if failed:
+                for tf in failed:
+                    df = frames[tf]
+                    logger.warning(f"[V2] {tf} async fetch failed, trying sync: {df if isinstance(df, Exception) else 'None'}")
+                fallbacks = await asyncio.gather(*(
+                    asyncio.to_thread(self._get_klines_sync, symbol_clean, tf, 100 if tf == "15m" else 200)
+                    for tf in failed
+                ))
+                frames.update(zip(failed, fallbacks))
+                df_1d, df_4h, df_1h, df_15m = frames.values()
             
             # Log candle fetch status (DEBUG - reduces log spam)
             logger.debug(
@@ -1097,15 +1114,22 @@ class MarketDataEngine:
 
     def get_llm_metrics(self) -> Dict[str, Any]:
         """LLM metriklerini döndür."""
-        return dict(self.llm_metrics)
+        with self._metrics_lock:
+            return dict(self.llm_metrics)
+    
+    def _bump_metric(self, key: str, amount: int = 1) -> None:
+        """LLM sayaç metriğini thread-safe artır."""
+        with self._metrics_lock:
+            self.llm_metrics[key] += amount
     
     def _update_latency_ema(self, key: str, latency_ms: float, alpha: float = 0.2) -> None:
         """Update latency EMA."""
-        old_ema = self.llm_metrics.get(key, 0.0)
-        if old_ema == 0.0:
-            self.llm_metrics[key] = latency_ms
-        else:
-            self.llm_metrics[key] = alpha * latency_ms + (1 - alpha) * old_ema
+        with self._metrics_lock:
+            old_ema = self.llm_metrics.get(key, 0.0)
+            if old_ema == 0.0:
+                self.llm_metrics[key] = latency_ms
+            else:
+                self.llm_metrics[key] = alpha * latency_ms + (1 - alpha) * old_ema
 
     def get_global_news_summary(self) -> Optional[Dict[str, Any]]:
         """
@@ -1166,23 +1190,14 @@ Output ONLY valid JSON with this structure:
 """
         
         try:
-            import google.generativeai as genai
-            
             gemini_key = SETTINGS.GEMINI_API_KEY
             if not gemini_key:
                 return None
             
-            genai.configure(api_key=gemini_key)
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
-            model = genai.GenerativeModel('models/gemini-2.5-flash', safety_settings=safety_settings)
+            model = get_gemini_model(gemini_key)
             
             # Metrics: Start Timer
-            self.llm_metrics["news_calls"] += 1
+            self._bump_metric("news_calls")
             start_time = time.perf_counter()
             
             response = model.generate_content(prompt)
@@ -1192,8 +1207,8 @@ Output ONLY valid JSON with this structure:
             self._update_latency_ema("news_latency_ema_ms", elapsed_ms)
             
             if not response.parts:
-                self.llm_metrics["news_failures"] += 1
-                self.llm_metrics["news_fallbacks"] += 1
+                self._bump_metric("news_failures")
+                self._bump_metric("news_fallbacks")
                 return None
             
             # Parse response using llm_utils
@@ -1211,13 +1226,13 @@ Output ONLY valid JSON with this structure:
             # Parse failed
             if not result:
                 logger.warning("[NEWS LLM PARSE FAIL] JSON parsing failed")
-            self.llm_metrics["news_failures"] += 1
-            self.llm_metrics["news_fallbacks"] += 1
+            self._bump_metric("news_failures")
+            self._bump_metric("news_fallbacks")
             return None
             
         except Exception as e:
-            self.llm_metrics["news_failures"] += 1
-            self.llm_metrics["news_fallbacks"] += 1
+            self._bump_metric("news_failures")
+            self._bump_metric("news_fallbacks")
             logger.warning(f"[MarketDataEngine] Global news summary error: {e}")
             return None
 
@@ -1295,23 +1310,14 @@ IMPORTANT: For coins NOT mentioned in any post, return "No specific discussion f
 """
         
         try:
-            import google.generativeai as genai
-            
             gemini_key = SETTINGS.GEMINI_API_KEY
             if not gemini_key:
                 return None
             
-            genai.configure(api_key=gemini_key)
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
-            model = genai.GenerativeModel('models/gemini-2.5-flash', safety_settings=safety_settings)
+            model = get_gemini_model(gemini_key)
             
             # Metrics: Start Timer
-            self.llm_metrics["reddit_calls"] += 1
+            self._bump_metric("reddit_calls")
             start_time = time.perf_counter()
             
             response = model.generate_content(prompt)
@@ -1321,7 +1327,7 @@ IMPORTANT: For coins NOT mentioned in any post, return "No specific discussion f
             self._update_latency_ema("reddit_latency_ema_ms", elapsed_ms)
             
             if not response.parts:
-                self.llm_metrics["reddit_failures"] += 1
+                self._bump_metric("reddit_failures")
                 return None
             
             # Parse response using internal method
@@ -1338,11 +1344,11 @@ IMPORTANT: For coins NOT mentioned in any post, return "No specific discussion f
             # Parse failed
             if not result:
                 logger.warning("[REDDIT LLM PARSE FAIL] JSON parsing failed")
-            self.llm_metrics["reddit_failures"] += 1
+            self._bump_metric("reddit_failures")
             return None
             
         except Exception as e:
-            self.llm_metrics["reddit_failures"] += 1
+            self._bump_metric("reddit_failures")
             logger.warning(f"[MarketDataEngine] Reddit LLM summary error: {e}")
             return None
 
@@ -1353,18 +1359,14 @@ IMPORTANT: For coins NOT mentioned in any post, return "No specific discussion f
         """
         if not text:
             return None
-        text = text.strip()
-        # Remove triple backtick fences
-        if "```" in text:
-            text = re.sub(r'^```(?:json)?\s*', '', text)
-            text = re.sub(r'```\s*$', '', text)
-            text = text.strip()
+        # Kod bloğu çitleri (```json ... ```) süslü parantez içermez: ayrıca
+        # temizlemeye gerek yok, dış parantez aralığı tek geçişte bulunur
         # Find brace span
         first = text.find('{')
         last = text.rfind('}')
         if first == -1 or last == -1 or first > last:
             return None
-        return text[first:last+1]
+        return text[first:last + 1]
 
     def _safe_json_loads(self, text: str) -> Optional[Dict[str, Any]]:
         """Safely parse JSON from LLM output."""
@@ -1372,13 +1374,11 @@ IMPORTANT: For coins NOT mentioned in any post, return "No specific discussion f
         if not extracted:
             return None
         try:
-            return json.loads(extracted)
+            return loads_json(extracted)
         except json.JSONDecodeError:
             # Simple cleanup attempts
             try:
-                cleaned = re.sub(r',\s*}', '}', extracted)
-                cleaned = re.sub(r',\s*]', ']', cleaned)
-                return json.loads(cleaned)
+                return loads_json(_TRAILING_COMMA_RE.sub(r'\1', extracted))
             except json.JSONDecodeError:
                 return None
     
@@ -1452,12 +1452,14 @@ IMPORTANT: For coins NOT mentioned in any post, return "No specific discussion f
     # ─────────────────────────────────────────────────────────────────────────
     # PRICE (uses ExchangeRouter)
     # ─────────────────────────────────────────────────────────────────────────
-    def get_current_price(self, symbol: str) -> Optional[float]:
+    def get_current_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
         """
         ExchangeRouter üzerinden güncel fiyat al.
         
         Args:
             symbol: Sembol (örn: BTCUSDT veya BTC)
+            max_age: Router cache'inden kabul edilen en eski fiyat yaşı (sn);
+                None ise router'ın kendi TTL'i
         
         Returns:
             Fiyat float veya None
@@ -1475,13 +1477,76 @@ IMPORTANT: For coins NOT mentioned in any post, return "No specific discussion f
         
         # Use get_price_or_fetch to fallback to REST API on cache miss
         # Critical for watchdog SL/TP monitoring reliability
-        price = self._router.get_price_or_fetch(symbol)
+        price = self._router.get_price_or_fetch(symbol, max_age)
         
         if price is not None:
             logger.debug(f"[MarketDataEngine] Price from REST API for {symbol}: ${price:.2f}")
         
         return price
 
+
+    async def get_current_prices(self, symbols: List[str], max_age: Optional[float] = None) -> Dict[str, float]:
+        """
+        Birden fazla sembolün güncel fiyatını tek seferde al.
+        
+        ExchangeRouter'ın toplu endpoint'i ile N sembol için tek REST
+        round-trip yapılır (cache'te olanlar hiç istek üretmez). Toplu çağrı
+        yoksa/eksik kalırsa kalan semboller asyncio.gather ile paralel
+        (PRICE_FETCH_CONCURRENCY ile sınırlı) çekilir.
+        
+        Args:
+            symbols: Semboller (örn: ["BTCUSDT", "ETH"])
+            max_age: Router cache'inden kabul edilen en eski fiyat yaşı (sn);
+                None ise router'ın kendi TTL'i. Giriş taramasının birkaç saniye
+                önce çektiği fiyat SL/TP kontrolünde REST'e gitmeden kullanılır.
+        
+        Returns:
+            {symbol: price} - anahtarlar çağıranın verdiği formatta,
+            fiyatı alınamayan semboller dict'te yer almaz
+        """
+        if not symbols:
+            return {}
+        
+        if self.offline_mode:
+            price = float(self.offline_row.get("close") or self.offline_row.get("price") or 0.0)
+            return {symbol: price for symbol in symbols}
+        
+        if not self._router:
+            logger.warning("[MarketDataEngine] ExchangeRouter yok, fiyat alınamadı")
+            return {}
+        
+        # Çağıranın formatı -> BTCUSDT formatı
+        full_symbols = {
+            symbol: symbol.upper() if symbol.upper().endswith("USDT") else f"{symbol.upper()}USDT"
+            for symbol in symbols
+        }
+        
+        unique_symbols = list(set(full_symbols.values()))
+        fetched: Dict[str, float] = {}
+        if hasattr(self._router, "get_prices_async"):
+            fetched = await self._router.get_prices_async(unique_symbols, max_age=max_age)
+        
+        # Fallback: batch endpoint yok veya eksik kaldıysa sembol bazlı paralel çek
+        missing = [full for full in unique_symbols if fetched.get(full) is None]
+        if missing:
+            semaphore = asyncio.Semaphore(self.PRICE_FETCH_CONCURRENCY)
+            
+            async def fetch_one(full_symbol: str) -> Optional[float]:
+                async with semaphore:
+                    if hasattr(self._router, "get_price_async"):
+                        return await self._router.get_price_async(full_symbol)
+                    return await asyncio.to_thread(self._router.get_price_or_fetch, full_symbol)
+            
+            results = await asyncio.gather(*(fetch_one(full) for full in missing), return_exceptions=True)
+            for full, result in zip(missing, results):
+                if isinstance(result, (int, float)) and result > 0:
+                    fetched[full] = float(result)
+        
+        return {
+            symbol: fetched[full]
+            for symbol, full in full_symbols.items()
+            if fetched.get(full) is not None
+        }
     
     def get_price_or_fetch(self, symbol: str) -> Optional[float]:
         """Cache miss durumunda API'den çek."""
@@ -2077,10 +2142,11 @@ IMPORTANT: For coins NOT mentioned in any post, return "No specific discussion f
         
         # Check if already analyzed (URL-based cache)
         now = time.time()
-        if url in self._analyzed_news_cache:
+        with self._cache_lock:
+            cached = self._analyzed_news_cache.get(url)
             cache_time = self._analyzed_news_cache_ts.get(url, 0)
-            if now - cache_time < self._article_analysis_ttl:
-                return self._analyzed_news_cache[url]
+        if cached is not None and now - cache_time < self._article_analysis_ttl:
+            return cached
         
         title = article_data.get("title", "")
         content = article_data.get("content", "")
@@ -2112,23 +2178,14 @@ Rules:
 """
         
         try:
-            import google.generativeai as genai
-            
             gemini_key = SETTINGS.GEMINI_API_KEY
             if not gemini_key:
                 return None
             
-            genai.configure(api_key=gemini_key)
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
-            model = genai.GenerativeModel('models/gemini-2.5-flash', safety_settings=safety_settings)
+            model = get_gemini_model(gemini_key)
             
             # Metrics
-            self.llm_metrics["article_calls"] += 1
+            self._bump_metric("article_calls")
             start_time = time.perf_counter()
             
             response = model.generate_content(prompt)
@@ -2137,7 +2194,7 @@ Rules:
             self._update_latency_ema("article_latency_ema_ms", elapsed_ms)
             
             if not response.parts:
-                self.llm_metrics["article_failures"] += 1
+                self._bump_metric("article_failures")
                 return None
             
             result = self._safe_json_loads(response.text.strip())
@@ -2151,18 +2208,19 @@ Rules:
                     result["source"] = article_data.get("source", "Unknown")
                     result["analyzed_at"] = now
                     
-                    # Cache it
-                    self._analyzed_news_cache[url] = result
-                    self._analyzed_news_cache_ts[url] = now
+                    # Cache it (pipeline thread havuzundan eşzamanlı yazılabilir)
+                    with self._cache_lock:
+                        self._analyzed_news_cache[url] = result
+                        self._analyzed_news_cache_ts[url] = now
                     return result
             
             if not result:
                 logger.warning("[ARTICLE PARSE FAIL] JSON parsing failed")
-            self.llm_metrics["article_failures"] += 1
+            self._bump_metric("article_failures")
             return None
             
         except Exception as e:
-            self.llm_metrics["article_failures"] += 1
+            self._bump_metric("article_failures")
             logger.warning(f"[MarketDataEngine] Article analysis error: {e}")
             return None
 
@@ -2179,20 +2237,27 @@ Rules:
             return 0
         
         articles = rss_data["articles"][:10]  # Limit to 10 per cycle
-        new_count = 0
         
-        # 2. For each article, try to get content and analyze
-        for article in articles:
-            url = article.get("link", "")
-            if not url:
-                continue
-            
-            # Skip if already analyzed
-            if url in self._analyzed_news_cache:
-                cache_time = self._analyzed_news_cache_ts.get(url, 0)
-                if time.time() - cache_time < self._article_analysis_ttl:
+        # Skip if already analyzed
+        now = time.time()
+        pending = []
+        with self._cache_lock:
+            for article in articles:
+                url = article.get("link", "")
+                if not url:
                     continue
-            
+                if url in self._analyzed_news_cache:
+                    cache_time = self._analyzed_news_cache_ts.get(url, 0)
+                    if now - cache_time < self._article_analysis_ttl:
+                        continue
+                pending.append(article)
+        
+        if not pending:
+            self._cleanup_old_article_cache()
+            return 0
+        
+        def process(article) -> bool:
+            url = article.get("link", "")
             try:
                 # Try to fetch full content
                 content = self._get_article_content(url)
@@ -2206,13 +2271,17 @@ Rules:
                 }
                 
                 # Analyze
-                result = self.analyze_single_article(article_data)
-                if result:
-                    new_count += 1
-                    
+                return bool(self.analyze_single_article(article_data))
+                
             except Exception as e:
                 logger.warning(f"[MarketDataEngine] Article pipeline error for {url[:50]}: {e}")
-                continue
+                return False
+        
+        # 2. Makaleler I/O ağırlıklı (HTTP + Gemini): sırayla değil, sınırlı
+        # eşzamanlılıkla işlenir; toplam süre ~en yavaş makale kadar olur
+        workers = max(1, min(len(pending), self.NEWS_ANALYSIS_CONCURRENCY))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="news-llm") as pool:
+            new_count = sum(pool.map(process, pending))
         
         # 3. Cleanup old cache entries (older than TTL)
         self._cleanup_old_article_cache()
@@ -2222,13 +2291,14 @@ Rules:
     def _cleanup_old_article_cache(self) -> None:
         """Remove expired entries from article cache."""
         now = time.time()
-        expired_urls = [
-            url for url, ts in self._analyzed_news_cache_ts.items()
-            if now - ts > self._article_analysis_ttl
-        ]
-        for url in expired_urls:
-            self._analyzed_news_cache.pop(url, None)
-            self._analyzed_news_cache_ts.pop(url, None)
+        with self._cache_lock:
+            expired_urls = [
+                url for url, ts in self._analyzed_news_cache_ts.items()
+                if now - ts > self._article_analysis_ttl
+            ]
+            for url in expired_urls:
+                self._analyzed_news_cache.pop(url, None)
+                self._analyzed_news_cache_ts.pop(url, None)
 
     def get_coin_specific_news(self, symbol: str) -> List[Dict[str, Any]]:
         """
@@ -2243,8 +2313,12 @@ Rules:
         # Normalize: BTCUSDT -> BTC
         coin = symbol.upper().replace("USDT", "").replace("USD", "")
         
+        # Pipeline arka planda cache'e yazarken iterasyon için anlık kopya
+        with self._cache_lock:
+            analyses = list(self._analyzed_news_cache.values())
+        
         relevant = []
-        for url, analysis in self._analyzed_news_cache.items():
+        for analysis in analyses:
             related_coins = analysis.get("related_coins", [])
             # Match if coin is mentioned OR if it's market-wide news
             if coin in related_coins or "MARKET" in related_coins:
@@ -2650,16 +2724,7 @@ Rules:
             return None
         
         try:
-            import google.generativeai as genai
-            
-            genai.configure(api_key=gemini_api_key)
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
-            model = genai.GenerativeModel('models/gemini-2.5-flash', safety_settings=safety_settings)
+            model = get_gemini_model(gemini_api_key)
             
             prompt = f"""
             GÖREV: Aşağıdaki haber başlığını ve metnini analiz et. Çıktın SADECE geçerli bir JSON objesi olmalı.
@@ -2680,7 +2745,7 @@ Rules:
             """
             
             # Metrics: Start Timer
-            self.llm_metrics["news_calls"] += 1
+            self._bump_metric("news_calls")
             start_time = time.perf_counter()
             
             response = model.generate_content(prompt)
@@ -2690,8 +2755,8 @@ Rules:
             self._update_latency_ema("news_latency_ema_ms", elapsed_ms)
             
             if not response.parts:
-                self.llm_metrics["news_failures"] += 1
-                self.llm_metrics["news_fallbacks"] += 1
+                self._bump_metric("news_failures")
+                self._bump_metric("news_fallbacks")
                 return None
             
             # Robust Parsing
@@ -2712,13 +2777,13 @@ Rules:
                     logger.warning(f"[MarketDataEngine] LLM eksik anahtar: {list(analiz.keys())}")
             
             # Parse fail logic
-            self.llm_metrics["news_failures"] += 1
-            self.llm_metrics["news_fallbacks"] += 1
+            self._bump_metric("news_failures")
+            self._bump_metric("news_fallbacks")
             return None
             
         except Exception as e:
-            self.llm_metrics["news_failures"] += 1
-            self.llm_metrics["news_fallbacks"] += 1
+            self._bump_metric("news_failures")
+            self._bump_metric("news_fallbacks")
             logger.warning(f"[MarketDataEngine] LLM haber analizi hatası: {e}")
             return None
     
@@ -59,9 +59,28 @@ import logging
 import random
 import time
 import uuid
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, Optional, Tuple
 
+# NumPy import (batch slippage/fee hesabı için - opsiyonel)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Numba import (batch kernel JIT derlemesi için - opsiyonel)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    njit = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
 # Binance exception import
 try:
     from binance.exceptions import BinanceAPIException
@@ -91,9 +110,223 @@ except ImportError:
         SIMULATED_SLIPPAGE_PCT = 0.001
         SIMULATED_FEE_PCT = 0.001
         ORDER_MIN_INTERVAL_SEC = 1.0
+        ORDER_RATE_LIMIT_COUNT = 50
+        ORDER_RATE_LIMIT_WINDOW_SEC = 10.0
     SETTINGS = MockSettings()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# INTEGER-SCALED FİYAT ARİTMETİĞİ
+# ═══════════════════════════════════════════════════════════════════════════════
+# Fiyat/miktar 1e-8 "tick" cinsinden tamsayıya çevrilir (Binance hassasiyeti).
+# Slippage/fee oranları 1e-6 birimli tamsayıya çevrilir (0.01 bp çözünürlük):
+# %0.075 (BNB indirimli fee) gibi kesirli bp oranlar yuvarlanmadan uygulanır,
+# int64 NumPy/Numba yolunda da taşma payı kalır (~$90M notional'a kadar).
+# Float round() artefaktlarını (2999.9999999999995 gibi) önler, PnL deterministik olur.
+PRICE_SCALE = 10 ** 8
+RATE_SCALE = 10 ** 6
+BP_SCALE = 10_000
+
+
+def _pct_to_rate(pct: float) -> int:
+    """Oranı (0.00075 = %0.075) 1e-6 birimli tamsayıya çevir (0.00075 -> 750)."""
+    return int(round(pct * RATE_SCALE))
+
+
+def _bp_to_rate(bp: float) -> int:
+    """Basis point'i (kesirli olabilir, 7.5 bp) 1e-6 birimli tamsayıya çevir (7.5 -> 750)."""
+    return int(round(bp * (RATE_SCALE // BP_SCALE)))
+
+
+def _apply_slippage_and_fees_int(
+    price: float,
+    quantity: float,
+    slippage_rate: int,
+    fee_rate: int
+) -> Tuple[int, int]:
+    """
+    Slippage ve fee'yi tick cinsinden tamsayı aritmetiğiyle hesapla.
+    
+    Oranlar RATE_SCALE (1e-6) birimindedir. exec_px = p + p*s/S biçiminde
+    hesaplanır (p*(S+s)/S ile aynı sonuç, ara çarpım daha küçük).
+    
+    Returns:
+        Tuple[executed_price_ticks, fee_ticks] (half-up yuvarlama)
+    """
+    half = RATE_SCALE // 2
+    price_int = int(round(price * PRICE_SCALE))
+    exec_px = price_int + (price_int * slippage_rate + half) // RATE_SCALE
+    notional = int(round(exec_px * quantity))
+    fee = (notional * fee_rate + half) // RATE_SCALE
+    return exec_px, fee
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _slippage_fees_kernel(price_int, quantities, slippage_rate, fee_rate, out_px, out_fee):
+        """
+        Fused slippage/fee döngüsü (nopython). NumPy yoluyla aynı int64 tick
+        aritmetiği - ara dizi oluşturmadan tek geçişte hesaplar. Tamsayı
+        işlemleri olduğu için fastmath gerekmez, sonuç deterministiktir.
+        """
+        half = RATE_SCALE // 2
+        for i in prange(price_int.size):
+            px = price_int[i] + (price_int[i] * slippage_rate + half) // RATE_SCALE
+            out_px[i] = px
+            notional = np.int64(np.rint(px * quantities[i]))
+            out_fee[i] = (notional * fee_rate + half) // RATE_SCALE
+
+
+def simulate_slippage_and_fees_batch(
+    prices,
+    quantities,
+    slippage_bp: Optional[float] = None,
+    fee_bp: Optional[float] = None
+):
+    """
+    Vektörel slippage ve fee simülasyonu (backtest / Monte-Carlo için).
+    
+    Tek tek ``simulate_slippage_and_fees`` çağırmak yerine chunk başına bir kez
+    çağrılır. Sonuçlar skaler fonksiyonla birebir aynıdır (int64 tick aritmetiği).
+    numba kuruluysa JIT derlenmiş paralel kernel kullanılır.
+    
+    Args:
+        prices: Baz fiyatlar (array-like)
+        quantities: İşlem miktarları (array-like, prices ile aynı boyut)
+        slippage_bp: Slippage (basis point, kesirli olabilir; None ise config'den alınır)
+        fee_bp: Fee (basis point, kesirli olabilir; None ise config'den alınır)
+    
+    Returns:
+        Tuple[executed_prices: np.ndarray, fees: np.ndarray]
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("simulate_slippage_and_fees_batch için numpy gerekli")
+    
+    if slippage_bp is None:
+        slippage_rate = _pct_to_rate(getattr(SETTINGS, 'SIMULATED_SLIPPAGE_PCT', 0.001))
+    else:
+        slippage_rate = _bp_to_rate(slippage_bp)
+    if fee_bp is None:
+        fee_rate = _pct_to_rate(getattr(SETTINGS, 'SIMULATED_FEE_PCT', 0.001))
+    else:
+        fee_rate = _bp_to_rate(fee_bp)
+    
+    prices = np.asarray(prices, dtype=np.float64)
+    quantities = np.asarray(quantities, dtype=np.float64)
+    half = RATE_SCALE // 2
+    
+    price_int = np.rint(prices * PRICE_SCALE).astype(np.int64)
+    
+    # Numba varsa fused kernel (ara dizi yok), yoksa NumPy vektörel yol
+    if NUMBA_AVAILABLE:
+        exec_px = np.empty_like(price_int)
+        fee = np.empty_like(price_int)
+        _slippage_fees_kernel(price_int, quantities, slippage_rate, fee_rate, exec_px, fee)
+        return exec_px / PRICE_SCALE, fee / PRICE_SCALE
+    
+    exec_px = price_int + (price_int * slippage_rate + half) // RATE_SCALE
+    notional = np.rint(exec_px * quantities).astype(np.int64)
+    fee = (notional * fee_rate + half) // RATE_SCALE
+    
+    return exec_px / PRICE_SCALE, fee / PRICE_SCALE
+
+
+# Simüle order response şablonları - sabit alanlar bir kez kurulur,
+# her çağrıda sadece copy() + değişken alanların ataması yapılır.
+_ORDER_TEMPLATE: Dict[str, Any] = {
+    "symbol": "",
+    "orderId": 0,
+    "orderListId": -1,
+    "clientOrderId": "",
+    "transactTime": 0,
+    "price": "0.00000000",
+    "origQty": "",
+    "executedQty": "",
+    "cummulativeQuoteQty": "",
+    "status": "FILLED",
+    "timeInForce": "GTC",
+    "type": "MARKET",
+    "side": "",
+    "fills": None,
+    # Simülasyon meta bilgisi
+    "_simulated": True,
+    "_executed_price": 0.0,
+    "_fee": 0.0
+}
+
+_FILL_TEMPLATE: Dict[str, Any] = {
+    "price": "",
+    "qty": "",
+    "commission": "",
+    "commissionAsset": "USDT",
+    "tradeId": 0
+}
+
+
+# create_order'ın kendisinin doldurduğu API parametreleri - kwargs ile override edilemez
+_RESERVED_ORDER_KEYS = frozenset({"symbol", "side", "type", "quantity", "price", "newClientOrderId"})
+
+
+@dataclass(frozen=True)
+class _OrderTypeSpec:
+    """Binance order tipi parametre gereksinimleri."""
+    requires_price: bool = False
+    requires_stop: bool = False  # stopPrice (veya trailingDelta) zorunlu
+    time_in_force: bool = False  # timeInForce gönderilir (varsayılan GTC)
+
+
+# Order tipi -> parametre kuralları (tek kod yolu, tek validasyon tablosu).
+# ICEBERG ayrı bir tip değildir: LIMIT / LIMIT_MAKER'a icebergQty kwargs'ı verilir.
+_ORDER_TYPE_SPECS: Dict[str, _OrderTypeSpec] = {
+    "MARKET": _OrderTypeSpec(),
+    "LIMIT": _OrderTypeSpec(requires_price=True, time_in_force=True),
+    "LIMIT_MAKER": _OrderTypeSpec(requires_price=True),
+    "STOP_LOSS": _OrderTypeSpec(requires_stop=True),
+    "STOP_LOSS_LIMIT": _OrderTypeSpec(requires_price=True, requires_stop=True, time_in_force=True),
+    "TAKE_PROFIT": _OrderTypeSpec(requires_stop=True),
+    "TAKE_PROFIT_LIMIT": _OrderTypeSpec(requires_price=True, requires_stop=True, time_in_force=True),
+}
+
+
+class OrderRateLimiter:
+    """
+    Client-side order kotası (sliding window token bucket).
+    
+    Binance spot order limiti (varsayılan 50 order / 10 sn) aşılmadan önce
+    çağıranı bekletir; böylece 429/418 ve Retry-After yoluna hiç düşülmez.
+    Eşzamanlı çağıranlar kota sınırında sıraya girer.
+    """
+    
+    def __init__(self, max_orders: int, window_sec: float):
+        self.max_orders = max_orders
+        self.window_sec = window_sec
+        self._sent: deque = deque()
+        self._lock = asyncio.Lock()
+    
+    def _expire(self, now: float) -> None:
+        """Pencere dışına çıkan order zamanlarını at."""
+        while self._sent and now - self._sent[0] >= self.window_sec:
+            self._sent.popleft()
+    
+    @property
+    def used(self) -> int:
+        """Mevcut pencerede kullanılan order sayısı."""
+        self._expire(time.monotonic())
+        return len(self._sent)
+    
+    async def acquire(self) -> None:
+        """Kotadan bir token al; kota doluysa en eski token düşene kadar bekle."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                if len(self._sent) < self.max_orders:
+                    self._sent.append(now)
+                    return
+                wait_time = self.window_sec - (now - self._sent[0])
+                logger.warning("⏳ Order kotası dolu (%d/%ss), %.2fs bekleniyor", self.max_orders, self.window_sec, wait_time)
+                await asyncio.sleep(wait_time)
+
 
 class OrderExecutor:
     """
@@ -112,7 +345,9 @@ class OrderExecutor:
         self,
         client: Optional[Any] = None,
         dry_run: bool = True,
-        max_retries: int = 3
+        max_retries: int = 3,
+        simulate_latency: bool = False,
+        simulated_latency_s: float = 0.1
     ):
         """
         OrderExecutor'ı başlat.
@@ -121,6 +356,8 @@ class OrderExecutor:
             client: Binance Client instance. dry_run=False için zorunlu.
             dry_run: True = simülasyon, False = gerçek işlem. Default: True
             max_retries: API hatalarında tekrar deneme sayısı. Default: 3
+            simulate_latency: Dry run'da yapay gecikme ekle (UI demo için). Default: False
+            simulated_latency_s: Yapay gecikme süresi (saniye). Default: 0.1
         
         Raises:
             ValueError: dry_run=False ve client=None ise
@@ -128,9 +365,17 @@ class OrderExecutor:
         self.client = client
         self.dry_run = dry_run
         self.max_retries = max_retries
+        self.simulate_latency = simulate_latency
+        self.simulated_latency_s = simulated_latency_s
         
-        # Rate limiting için son order zamanı
-        self._last_order_time: float = 0.0
+        # Rate limiting: bir sonraki order'a izin verilen an (tüm semboller, monotonic)
+        self._next_order_time: float = 0.0
+        
+        # Client-side order kotası (canlı mod API çağrıları için)
+        self._order_limiter = OrderRateLimiter(
+            max_orders=getattr(SETTINGS, 'ORDER_RATE_LIMIT_COUNT', 50),
+            window_sec=getattr(SETTINGS, 'ORDER_RATE_LIMIT_WINDOW_SEC', 10.0)
+        )
         
         # Canlı modda client zorunlu
         if not dry_run and client is None:
@@ -167,6 +412,9 @@ class OrderExecutor:
         """
         Slippage ve fee simülasyonu.
         
+        Hesaplama 1e-8 tick cinsinden tamsayı aritmetiğiyle yapılır; oranlar
+        1e-6 birimli tamsayıya çevrilir (0.01 bp çözünürlük, %0.075 birebir).
+        
         Args:
             price: Baz fiyat
             quantity: İşlem miktarı
@@ -182,14 +430,12 @@ class OrderExecutor:
         if fee_pct is None:
             fee_pct = getattr(SETTINGS, 'SIMULATED_FEE_PCT', 0.001)
         
-        # Slippage uygula
-        executed_price = price * (1 + slippage_pct)
-        
-        # Fee hesapla
-        trade_value = executed_price * quantity
-        fee_amount = trade_value * fee_pct
+        # Tick cinsinden tamsayı aritmetiği - ölçek sınırda bir kez geri çevrilir
+        exec_px, fee = _apply_slippage_and_fees_int(
+            price, quantity, _pct_to_rate(slippage_pct), _pct_to_rate(fee_pct)
+        )
         
-        return round(executed_price, 8), round(fee_amount, 8)
+        return exec_px / PRICE_SCALE, fee / PRICE_SCALE
     
     def _create_simulated_order(
         self,
@@ -209,7 +455,7 @@ class OrderExecutor:
             side: BUY veya SELL
             quantity: İşlem miktarı
             order_type: MARKET, LIMIT, vb.
-            price: Limit fiyatı (LIMIT emirler için)
+            price: Limit fiyatı (fiyat gerektiren LIMIT ailesi emirler için)
             **kwargs: Ek parametreler
         
         Returns:
@@ -228,38 +474,114 @@ class OrderExecutor:
         # Slippage ve fee uygula
         executed_price, fee = self.simulate_slippage_and_fees(price, quantity)
         
-        # Binance response formatı
-        order_response = {
-            "symbol": symbol,
-            "orderId": order_id,
-            "orderListId": -1,
-            "clientOrderId": client_order_id,
-            "transactTime": timestamp,
-            "price": str(price) if order_type == "LIMIT" else "0.00000000",
-            "origQty": str(quantity),
-            "executedQty": str(quantity),
-            "cummulativeQuoteQty": str(round(executed_price * quantity, 8)),
-            "status": "FILLED",
-            "timeInForce": kwargs.get("timeInForce", "GTC"),
-            "type": order_type,
-            "side": side,
-            "fills": [
-                {
-                    "price": str(executed_price),
-                    "qty": str(quantity),
-                    "commission": str(fee),
-                    "commissionAsset": "USDT" if "USDT" in symbol else "BNB",
-                    "tradeId": order_id + 1
-                }
-            ],
-            # Simülasyon meta bilgisi
-            "_simulated": True,
-            "_executed_price": executed_price,
-            "_fee": fee
-        }
+        # Binance response formatı (şablondan)
+        qty_str = str(quantity)
+        
+        fill = _FILL_TEMPLATE.copy()
+        fill["price"] = str(executed_price)
+        fill["qty"] = qty_str
+        fill["commission"] = str(fee)
+        if "USDT" not in symbol:
+            fill["commissionAsset"] = "BNB"
+        fill["tradeId"] = order_id + 1
+        
+        order_response = _ORDER_TEMPLATE.copy()
+        order_response["symbol"] = symbol
+        order_response["orderId"] = order_id
+        order_response["clientOrderId"] = client_order_id
+        order_response["transactTime"] = timestamp
+        # LIMIT ailesi (LIMIT_MAKER, *_LIMIT) limit fiyatını raporlar; tablo validasyonla aynı
+        spec = _ORDER_TYPE_SPECS.get(order_type)
+        if spec is not None and spec.requires_price:
+            order_response["price"] = str(price)
+        order_response["origQty"] = qty_str
+        order_response["executedQty"] = qty_str
+        order_response["cummulativeQuoteQty"] = str(round(executed_price * quantity, 8))
+        order_response["timeInForce"] = kwargs.get("timeInForce", "GTC")
+        order_response["type"] = order_type
+        order_response["side"] = side
+        order_response["fills"] = [fill]
+        order_response["_executed_price"] = executed_price
+        order_response["_fee"] = fee
         
         return order_response
     
+    def _validate_order_params(
+        self,
+        side: str,
+        quantity: float,
+        order_type: str,
+        price: Optional[float],
+        extra: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, str]:
+        """
+        Emir parametrelerini doğrula ve normalize et.
+        
+        Gereksinimler _ORDER_TYPE_SPECS tablosundan okunur.
+        
+        Returns:
+            Tuple[side, order_type] (büyük harfe çevrilmiş)
+        
+        Raises:
+            ValueError: Geçersiz parametreler
+        """
+        side = side.upper()
+        if side not in ("BUY", "SELL"):
+            raise ValueError(f"Geçersiz side: {side}. 'BUY' veya 'SELL' olmalı.")
+        
+        order_type = order_type.upper()
+        spec = _ORDER_TYPE_SPECS.get(order_type)
+        if spec is None:
+            raise ValueError(
+                f"Desteklenmeyen order_type: {order_type}. "
+                f"Geçerli tipler: {', '.join(_ORDER_TYPE_SPECS)}"
+            )
+        
+        if spec.requires_price and price is None:
+            raise ValueError(f"{order_type} emirler için price zorunlu!")
+        
+        extra = extra or {}
+        if spec.requires_stop and extra.get("stopPrice") is None and extra.get("trailingDelta") is None:
+            raise ValueError(f"{order_type} emirler için stopPrice (veya trailingDelta) zorunlu!")
+        
+        if quantity <= 0:
+            raise ValueError(f"Geçersiz quantity: {quantity}. Pozitif olmalı.")
+        
+        return side, order_type
+    
+    def create_order_sync(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        order_type: str = "MARKET",
+        price: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Senkron simüle emir (backtest için).
+        
+        Event loop, rate limit beklemesi ve gecikme simülasyonu olmadan
+        doğrudan simüle order response döner. Sadece dry_run modunda çalışır.
+        
+        Raises:
+            RuntimeError: dry_run=False ise
+            ValueError: Geçersiz parametreler
+        """
+        if not self.dry_run:
+            raise RuntimeError("create_order_sync sadece dry_run modunda kullanılabilir")
+        
+        side, order_type = self._validate_order_params(side, quantity, order_type, price, kwargs)
+        
+        return self._create_simulated_order(
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            order_type=order_type,
+            price=price,
+            **kwargs
+        )
+    
     async def create_order(
         self,
         symbol: str,
@@ -279,8 +601,9 @@ class OrderExecutor:
             symbol: İşlem sembolü (örn: BTCUSDT, ETHUSDT)
             side: İşlem yönü - "BUY" veya "SELL"
             quantity: İşlem miktarı
-            order_type: Emir tipi - "MARKET", "LIMIT", vb. Default: "MARKET"
-            price: Fiyat (LIMIT emirler için zorunlu)
+            order_type: Emir tipi - "MARKET", "LIMIT", "LIMIT_MAKER", "STOP_LOSS",
+                "STOP_LOSS_LIMIT", "TAKE_PROFIT", "TAKE_PROFIT_LIMIT". Default: "MARKET"
+            price: Fiyat (LIMIT tipleri için zorunlu)
             **kwargs: Ek Binance API parametreleri (timeInForce, stopPrice, vb.)
         
         Returns:
@@ -295,42 +618,42 @@ class OrderExecutor:
             >>> order = await executor.create_order("BTCUSDT", "BUY", 0.001)
             >>> print(order["status"])  # "FILLED"
         """
-        # Parametre validasyonu
-        side = side.upper()
-        if side not in ("BUY", "SELL"):
-            raise ValueError(f"Geçersiz side: {side}. 'BUY' veya 'SELL' olmalı.")
-        
-        order_type = order_type.upper()
-        if order_type == "LIMIT" and price is None:
-            raise ValueError("LIMIT emirler için price zorunlu!")
+        # Named parametrelerle çakışan anahtarları at (aksi halde
+        # "got multiple values" TypeError'ı retry döngüsünde boşa deneme yakar)
+        kwargs = {k: v for k, v in kwargs.items() if k not in _RESERVED_ORDER_KEYS}
         
-        if quantity <= 0:
-            raise ValueError(f"Geçersiz quantity: {quantity}. Pozitif olmalı.")
+        # Parametre validasyonu
+        side, order_type = self._validate_order_params(side, quantity, order_type, price, kwargs)
         
-        # Rate limiting - çok hızlı order spam'ini engelle
+        # Rate limiting - çok hızlı order spam'ini engelle (tüm order'lar arası).
+        # Slot beklemeden önce ayrılır, eşzamanlı çağıranlar sırayla aralıklanır.
         min_interval = getattr(SETTINGS, 'ORDER_MIN_INTERVAL_SEC', 1.0)
-        elapsed = time.time() - self._last_order_time
-        if elapsed < min_interval:
-            wait_time = min_interval - elapsed
-            logger.debug(f"Rate limit: {wait_time:.2f}s bekleniyor...")
+        now = time.monotonic()
+        slot = max(now, self._next_order_time)
+        self._next_order_time = slot + min_interval
+        if slot > now:
+            wait_time = slot - now
+            logger.debug("Rate limit: %.2fs bekleniyor...", wait_time)
             await asyncio.sleep(wait_time)
-        self._last_order_time = time.time()
         
         # Client order ID oluştur
         client_order_id = self._generate_client_order_id(symbol)
         
-        logger.info(
-            f"{'[DRY RUN] ' if self.dry_run else ''}"
-            f"Emir oluşturuluyor: {side} {quantity} {symbol} @ {order_type}"
-            f"{f' ${price}' if price else ''}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%sEmir oluşturuluyor: %s %s %s @ %s%s",
+                "[DRY RUN] " if self.dry_run else "",
+                side, quantity, symbol, order_type,
+                f" ${price}" if price else ""
+            )
         
         # ═══════════════════════════════════════════════════════════════════
         # DRY RUN MODU - Simülasyon
         # ═══════════════════════════════════════════════════════════════════
         if self.dry_run:
-            # Küçük gecikme simülasyonu
-            await asyncio.sleep(0.1)
+            # Gecikme simülasyonu sadece açıkça istenirse (backtest'i yavaşlatmasın)
+            if self.simulate_latency:
+                await asyncio.sleep(self.simulated_latency_s)
             
             order = self._create_simulated_order(
                 symbol=symbol,
@@ -342,8 +665,8 @@ class OrderExecutor:
             )
             
             logger.info(
-                f"[DRY RUN] ✅ Simüle edilmiş emir: "
-                f"OrderId={order['orderId']}, Status={order['status']}"
+                "[DRY RUN] ✅ Simüle edilmiş emir: OrderId=%s, Status=%s",
+                order["orderId"], order["status"]
             )
             
             return order
@@ -353,45 +676,36 @@ class OrderExecutor:
         # ═══════════════════════════════════════════════════════════════════
         last_exception = None
         
+        # API parametreleri döngü dışında bir kez kurulur (order tipi tablosundan)
+        spec = _ORDER_TYPE_SPECS[order_type]
+        call_kwargs = {
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "quantity": quantity,
+            "newClientOrderId": client_order_id,
+            **kwargs
+        }
+        if spec.requires_price:
+            call_kwargs["price"] = str(price)
+        if spec.time_in_force:
+            call_kwargs.setdefault("timeInForce", "GTC")
+        else:
+            call_kwargs.pop("timeInForce", None)
+        
         for attempt in range(1, self.max_retries + 1):
             try:
-                logger.info(f"API çağrısı deneme {attempt}/{self.max_retries}")
+                logger.info("API çağrısı deneme %d/%d", attempt, self.max_retries)
+                
+                # Her deneme gerçek bir API order'ı - kotadan düş
+                await self._order_limiter.acquire()
                 
                 # Binance API çağrısı
-                if order_type == "MARKET":
-                    order = self.client.create_order(
-                        symbol=symbol,
-                        side=side,
-                        type=order_type,
-                        quantity=quantity,
-                        newClientOrderId=client_order_id,
-                        **kwargs
-                    )
-                elif order_type == "LIMIT":
-                    order = self.client.create_order(
-                        symbol=symbol,
-                        side=side,
-                        type=order_type,
-                        quantity=quantity,
-                        price=str(price),
-                        timeInForce=kwargs.get("timeInForce", "GTC"),
-                        newClientOrderId=client_order_id,
-                        **kwargs
-                    )
-                else:
-                    order = self.client.create_order(
-                        symbol=symbol,
-                        side=side,
-                        type=order_type,
-                        quantity=quantity,
-                        price=str(price) if price else None,
-                        newClientOrderId=client_order_id,
-                        **kwargs
-                    )
+                order = self.client.create_order(**call_kwargs)
                 
                 logger.info(
-                    f"✅ Emir başarılı: OrderId={order.get('orderId')}, "
-                    f"Status={order.get('status')}"
+                    "✅ Emir başarılı: OrderId=%s, Status=%s",
+                    order.get("orderId"), order.get("status")
                 )
                 
                 return order
@@ -542,7 +856,6 @@ class OrderExecutor:
                 quantity=quantity,
                 order_type="LIMIT",
                 price=price,
-                timeInForce=kwargs.get("timeInForce", "GTC"),
                 **kwargs
             )
             result["order"] = order
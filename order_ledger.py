@@ -17,8 +17,12 @@ Usage:
     ledger.record(signal_id, "filled", order_id, qty, price)
 """
 
+import json
 import os
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -63,63 +67,149 @@ class LedgerEntry:
         return asdict(self)
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    signal_id  TEXT PRIMARY KEY,
+    symbol     TEXT,
+    side       TEXT,
+    status     TEXT,
+    created_ts INTEGER,
+    order_ids  TEXT,
+    filled_qty REAL,
+    avg_price  REAL
+)
+"""
+
+_INDEX_CREATED_TS = "CREATE INDEX IF NOT EXISTS idx_ledger_created_ts ON ledger (created_ts)"
+
+_ENTRY_COLUMNS = "symbol, side, status, created_ts, order_ids, filled_qty, avg_price"
+
+
 class OrderLedger:
     """
     Order Idempotency Ledger.
     
     Prevents duplicate orders for the same signal_id.
     
-    File: data/order_ledger.json
+    Storage is an append/upsert SQLite table keyed by signal_id (WAL mode),
+    so each record() is a single-row write instead of a full-file rewrite and
+    startup does not parse the whole ledger. A legacy JSON ledger is imported
+    once on first open.
+    
+    is_blocked() first checks a bounded LRU of recent statuses (preloaded with
+    the newest STATUS_CACHE_SIZE rows at startup), so duplicates of recent
+    signals skip the database; misses fall back to a primary-key lookup.
+    Startup time and memory stay bounded regardless of ledger history.
+    
+    Thread-safe: database access and cache mutation are serialized by a lock.
+    After close() the ledger behaves as disabled.
+    
+    File: data/order_ledger.db (legacy: data/order_ledger.json)
     """
     
-    def __init__(self, filepath: str = "data/order_ledger.json", enabled: bool = None):
+    STATUS_CACHE_SIZE = 10_000
+    
+    def __init__(
+        self,
+        filepath: str = "data/order_ledger.db",
+        enabled: bool = None,
+        legacy_json_path: Optional[str] = "data/order_ledger.json"
+    ):
         """
         Initialize OrderLedger.
         
         Args:
-            filepath: Ledger file path
+            filepath: SQLite ledger file path (":memory:" supported)
             enabled: Override ORDER_LEDGER_ENABLED config
+            legacy_json_path: Old JSON ledger to migrate on first open (None = skip)
         """
         self.filepath = filepath
+        self.legacy_json_path = legacy_json_path
         self.enabled = enabled if enabled is not None else getattr(SETTINGS, 'ORDER_LEDGER_ENABLED', True)
-        self._cache: Dict[str, Dict] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._status_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
         
         if self.enabled:
             self._load()
     
     def _load(self) -> None:
-        """Load ledger from file."""
-        try:
-            from utils.io import read_json_safe
-            self._cache = read_json_safe(self.filepath, default={})
-        except ImportError:
-            # Fallback if utils.io not available
-            import json
-            if os.path.exists(self.filepath):
-                try:
-                    with open(self.filepath, 'r', encoding='utf-8') as f:
-                        self._cache = json.load(f)
-                except:
-                    self._cache = {}
-            else:
-                self._cache = {}
+        """Open ledger database (and migrate legacy JSON if present)."""
+        if self.filepath != ":memory:":
+            dir_name = os.path.dirname(self.filepath)
+            if dir_name:
+                os.makedirs(dir_name, exist_ok=True)
+        
+        self._conn = sqlite3.connect(self.filepath, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_INDEX_CREATED_TS)
+        
+        self._migrate_legacy_json()
+        
+        # Warm the LRU with the newest entries only (idx_ledger_created_ts);
+        # older signal_ids are resolved by primary-key lookup on demand
+        recent = self._conn.execute(
+            "SELECT signal_id, status FROM ledger ORDER BY created_ts DESC LIMIT ?",
+            (self.STATUS_CACHE_SIZE,)
+        ).fetchall()
+        for signal_id, status in reversed(recent):
+            self._cache_status(signal_id, status or "")
+    
+    def _cache_status(self, signal_id: str, status: str) -> None:
+        """Remember status of a recently seen entry (bounded LRU)."""
+        self._status_cache[signal_id] = status
+        self._status_cache.move_to_end(signal_id)
+        if len(self._status_cache) > self.STATUS_CACHE_SIZE:
+            self._status_cache.popitem(last=False)
     
-    def _save(self) -> bool:
-        """Save ledger to file atomically."""
+    def _migrate_legacy_json(self) -> None:
+        """Import entries from the legacy JSON ledger into an empty database."""
+        if not self.legacy_json_path or not os.path.exists(self.legacy_json_path):
+            return
+        
+        if self._conn.execute("SELECT 1 FROM ledger LIMIT 1").fetchone():
+            return
+        
         try:
-            from utils.io import write_atomic_json
-            return write_atomic_json(self.filepath, self._cache, backup=True, max_backups=3)
+            from utils.io import read_json_safe
+            legacy = read_json_safe(self.legacy_json_path, default={})
         except ImportError:
-            # Fallback
-            import json
             try:
-                os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
-                with open(self.filepath, 'w', encoding='utf-8') as f:
-                    json.dump(self._cache, f, indent=2)
-                return True
-            except Exception as e:
-                logger.error(f"[ORDER_LEDGER] Save failed: {e}")
-                return False
+                with open(self.legacy_json_path, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+            except Exception:
+                legacy = {}
+        
+        if not isinstance(legacy, dict) or not legacy:
+            return
+        
+        rows = [
+            (
+                signal_id,
+                entry.get("symbol", ""),
+                entry.get("side", ""),
+                entry.get("status", ""),
+                int(entry.get("created_ts", 0)),
+                json.dumps(entry.get("order_ids") or []),
+                float(entry.get("filled_qty", 0.0)),
+                float(entry.get("avg_price", 0.0))
+            )
+            for signal_id, entry in legacy.items()
+        ]
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO ledger (signal_id, {_ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        logger.info(f"[ORDER_LEDGER] Migrated {len(rows)} entries from {self.legacy_json_path}")
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
     def is_blocked(self, signal_id: str) -> Tuple[bool, str]:
         """
@@ -137,11 +227,22 @@ class OrderLedger:
         if not signal_id:
             return False, "empty_signal_id"
         
-        if signal_id not in self._cache:
-            return False, "new_signal"
-        
-        entry = self._cache[signal_id]
-        status = entry.get("status", "")
+        with self._lock:
+            if self._conn is None:
+                return False, "ledger_disabled"
+            
+            # Fast path: recent entry in LRU; otherwise indexed primary-key lookup
+            status = self._status_cache.get(signal_id)
+            if status is None:
+                row = self._conn.execute(
+                    "SELECT status FROM ledger WHERE signal_id = ?", (signal_id,)
+                ).fetchone()
+                
+                if row is None:
+                    return False, "new_signal"
+                
+                status = row[0] or ""
+                self._cache_status(signal_id, status)
         
         # Block if submitted or filled
         if status in (OrderStatus.SUBMITTED.value, OrderStatus.FILLED.value):
@@ -185,76 +286,116 @@ class OrderLedger:
         if not self.enabled:
             return True
         
-        self._cache[signal_id] = {
-            "symbol": symbol,
-            "side": side,
-            "status": status,
-            "created_ts": int(time.time()),
-            "order_ids": order_ids or [],
-            "filled_qty": filled_qty,
-            "avg_price": avg_price
-        }
-        
-        saved = self._save()
+        with self._lock:
+            if self._conn is None:
+                return True
+            try:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO ledger (signal_id, {_ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (signal_id, symbol, side, status, int(time.time()),
+                     json.dumps(order_ids or []), filled_qty, avg_price)
+                )
+            except sqlite3.Error as e:
+                logger.error(f"[ORDER_LEDGER] Save failed: {e}")
+                return False
+            
+            self._cache_status(signal_id, status)
         
-        if saved:
-            logger.debug(f"[ORDER_LEDGER] Recorded: {signal_id} | {symbol} {side} | status={status}")
+        logger.debug("[ORDER_LEDGER] Recorded: %s | %s %s | status=%s", signal_id, symbol, side, status)
         
-        return saved
+        return True
     
     def update_status(self, signal_id: str, status: str, filled_qty: float = None, avg_price: float = None) -> bool:
         """Update existing entry status."""
-        if not self.enabled or signal_id not in self._cache:
+        if not self.enabled:
             return False
         
-        self._cache[signal_id]["status"] = status
-        
-        if filled_qty is not None:
-            self._cache[signal_id]["filled_qty"] = filled_qty
-        if avg_price is not None:
-            self._cache[signal_id]["avg_price"] = avg_price
-        
-        return self._save()
+        with self._lock:
+            if self._conn is None:
+                return False
+            try:
+                cur = self._conn.execute(
+                    "UPDATE ledger SET status = ?, "
+                    "filled_qty = COALESCE(?, filled_qty), avg_price = COALESCE(?, avg_price) "
+                    "WHERE signal_id = ?",
+                    (status, filled_qty, avg_price, signal_id)
+                )
+            except sqlite3.Error as e:
+                logger.error(f"[ORDER_LEDGER] Save failed: {e}")
+                return False
+            
+            if cur.rowcount == 0:
+                return False
+            
+            self._cache_status(signal_id, status)
+            return True
     
     def get_entry(self, signal_id: str) -> Optional[Dict]:
         """Get ledger entry for signal_id."""
-        return self._cache.get(signal_id)
+        with self._lock:
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                f"SELECT {_ENTRY_COLUMNS} FROM ledger WHERE signal_id = ?", (signal_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        return LedgerEntry(
+            symbol=row[0],
+            side=row[1],
+            status=row[2],
+            created_ts=row[3],
+            order_ids=json.loads(row[4] or "[]"),
+            filled_qty=row[5],
+            avg_price=row[6]
+        ).to_dict()
     
     def cleanup_old(self, max_age_days: int = 30) -> int:
         """Remove entries older than max_age_days."""
         if not self.enabled:
             return 0
         
-        now = int(time.time())
-        max_age_secs = max_age_days * 24 * 3600
-        
-        to_remove = []
-        for signal_id, entry in self._cache.items():
-            created_ts = entry.get("created_ts", 0)
-            if now - created_ts > max_age_secs:
-                to_remove.append(signal_id)
+        cutoff = int(time.time()) - max_age_days * 24 * 3600
         
-        for signal_id in to_remove:
-            del self._cache[signal_id]
+        with self._lock:
+            if self._conn is None:
+                return 0
+            # Range scan on idx_ledger_created_ts: only expired rows are visited
+            stale_ids = [
+                row[0] for row in
+                self._conn.execute("SELECT signal_id FROM ledger WHERE created_ts < ?", (cutoff,))
+            ]
+            if not stale_ids:
+                return 0
+            
+            removed = self._conn.execute(
+                "DELETE FROM ledger WHERE created_ts < ?", (cutoff,)
+            ).rowcount
+            
+            for signal_id in stale_ids:
+                self._status_cache.pop(signal_id, None)
         
-        if to_remove:
-            self._save()
-            logger.info(f"[ORDER_LEDGER] Cleaned up {len(to_remove)} old entries")
+        if removed:
+            logger.info(f"[ORDER_LEDGER] Cleaned up {removed} old entries")
         
-        return len(to_remove)
+        return removed
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # GLOBAL INSTANCE
 # ═══════════════════════════════════════════════════════════════════════════════
 _ledger: Optional[OrderLedger] = None
+_ledger_lock = threading.Lock()
 
 
 def get_ledger() -> OrderLedger:
-    """Get or create global ledger instance."""
+    """Get or create global ledger instance (thread-safe)."""
     global _ledger
     if _ledger is None:
-        _ledger = OrderLedger()
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = OrderLedger()
     return _ledger
 
 
@@ -271,7 +412,7 @@ if __name__ == "__main__":
     
     # Test directory
     test_dir = tempfile.mkdtemp()
-    test_file = os.path.join(test_dir, "ledger.json")
+    test_file = os.path.join(test_dir, "ledger.db")
     
     try:
         # Test 1: New signal not blocked
@@ -325,4 +466,6 @@ if __name__ == "__main__":
         print("=" * 50)
         
     finally:
+        ledger.close()
+        ledger2.close()
         shutil.rmtree(test_dir)
@@ -1,9 +1,23 @@
 
 import time
+import random
 import asyncio
+import logging
+import statistics
+from collections import deque
+from contextlib import asynccontextmanager
+from operator import itemgetter
 from datetime import datetime
 from trade_logger import logger
 
+# NumPy import (toplu SL/TP tetik tespiti için - opsiyonel)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 # Exit reason enum
 try:
     from exit_reason import ExitReason
@@ -25,6 +39,37 @@ except ImportError:
     config = None
 
 
+# Retry ile düzelmeyecek Binance hata kodları: OrderExecutor'daki liste
+# (timestamp, bakiye, order, lot size, precision) + yetki hataları
+# (-1022 imza, -2014 API key formatı, -2015 geçersiz key/IP/izin)
+_PERMANENT_ORDER_ERROR_CODES = frozenset({-1021, -2010, -2011, -1013, -1111, -1022, -2014, -2015})
+
+# Art arda gelen portföy kayıtlarının birleştirildiği pencere (saniye)
+_SAVE_DEBOUNCE_SEC = 0.5
+
+# Gönderilmeyi bekleyen en fazla Telegram bildirimi (dolunca yenileri düşer)
+_TELEGRAM_QUEUE_SIZE = 100
+
+# Toplu gönderimde mesajlar arası ayraç ve Telegram sendMessage karakter sınırı
+_TELEGRAM_SEPARATOR = "\n━━━━━━━━━━\n"
+_TELEGRAM_MAX_CHARS = 4096
+# Aynı sohbete art arda gönderimler arası en kısa süre (Telegram ~1 mesaj/sn/sohbet)
+_TELEGRAM_MIN_INTERVAL_SEC = 1.0
+# Kapanışta kuyruktaki Telegram bildirimlerinin gönderilmesi için üst süre
+_TELEGRAM_DRAIN_TIMEOUT_SEC = 10.0
+
+# SLTP_QUIET_BAND_RATIO üst sınırı: oran >= 1 iken SL/TP'yi geçmiş fiyat da
+# "sessiz" sayılabilirdi; geçerli aralık [0, 1)
+_QUIET_BAND_MAX_RATIO = 0.9
+
+# Aşama başına saklanan son gecikme ölçümü sayısı (ms)
+_LATENCY_WINDOW = 1024
+_LATENCY_STAGES = ("sweep", "price_fetch", "close", "live_order", "telegram")
+
+# Ana SL/TP döngüsünün her pozisyonda okuduğu alanlar (tek C çağrısında)
+_SWEEP_FIELDS = itemgetter("symbol", "id", "stop_loss", "take_profit", "entry_price")
+
+
 class PositionManager:
     """
     Manages portfolio open positions, monitors risk (SL/TP),
@@ -51,9 +96,75 @@ class PositionManager:
         self.save_portfolio_fn = save_portfolio_fn
         self.telegram_fn = telegram_fn
         self.telegram_config = telegram_config or {}
-        self._consecutive_losses = self._calculate_initial_consecutive_losses()
+        # Telegram ayarları bir kez çözümlenir (her sweep'te .get() yok)
+        self._tg_token = self.telegram_config.get("bot_token")
+        self._tg_chat = self.telegram_config.get("chat_id")
+        self._tg_enabled = bool(self.telegram_fn and self._tg_token and self._tg_chat)
+        # SETTINGS değerleri bir kez çözümlenir (döngü içinde getattr yok)
+        self.reload_settings()
+        # Portföyde saklanan sayaç varsa history taranmaz (eski dosyalarda hesaplanır)
+        stored_losses = self.portfolio.get("consecutive_losses")
+        if stored_losses is None:
+            stored_losses = self._calculate_initial_consecutive_losses()
+        self._set_consecutive_losses(stored_losses)
+        # get_portfolio_summary için artımlı sayaçlar (history tekrar taranmaz)
+        self._counted_history = None
+        self._counted_trades = 0
+        self._winning_trades = 0
+        self._losing_trades = 0
+        self._total_pnl = 0.0
         # Smart logging: track last logged state per position to reduce log spam
         self._watchdog_last_log = {}  # {position_id: {"price": float, "action": str}}
+        self._watchdog_stop = asyncio.Event()
+        # Boştaki watchdog'u uyandırır (notify_position_opened / stop_watchdog)
+        self._positions_opened = asyncio.Event()
+        # check_positions_and_apply_risk ve watchdog sweep'lerini serileştirir
+        self._close_lock = asyncio.Lock()
+        # Debounce'lu portföy kaydı: art arda gelen kayıtlar tek yazıma iner
+        self._save_dirty = False
+        self._save_task = None
+        # Telegram bildirimleri kuyruğa atılır, tek bir worker gönderir
+        self._telegram_queue = asyncio.Queue(maxsize=_TELEGRAM_QUEUE_SIZE)
+        self._telegram_task = None
+        self._telegram_next_send = 0.0  # monotonic; _TELEGRAM_MIN_INTERVAL_SEC aralığı
+        # Ana döngü ve watchdog arasında paylaşılan kısa ömürlü fiyat cache'i
+        self._price_cache = {}  # {symbol: (price, monotonic_ts)}
+        # Sessiz piyasada SL/TP kontrolünü atlamak için son kontrol fiyatı
+        self._last_checked_price = {}  # {position_id: price}
+        # v1_watchdog_check trailing ATR cache'i
+        self._atr_cache = {}  # {symbol: (atr, monotonic_ts)}
+        # Aşama bazlı gecikme ölçümleri (ms) - get_latency_stats()
+        self._latency = {stage: deque(maxlen=_LATENCY_WINDOW) for stage in _LATENCY_STAGES}
+
+    def reload_settings(self):
+        """
+        SL/TP döngülerinin kullandığı SETTINGS değerlerini yeniden oku.
+        
+        __init__'te çağrılır; config runtime'da değişirse tekrar çağrılmalı.
+        Watchdog aralığı bir sonraki start_watchdog'da geçerli olur.
+        """
+        self._max_retries = getattr(SETTINGS, 'LIVE_ORDER_MAX_RETRIES', 3)
+        self._retry_delay = getattr(SETTINGS, 'LIVE_ORDER_RETRY_DELAY', 2.0)
+        self._max_backoff = getattr(SETTINGS, 'LIVE_ORDER_MAX_BACKOFF_SEC', 30.0)
+        self._watchdog_enabled = getattr(SETTINGS, 'SLTP_WATCHDOG_ENABLED', True)
+        self._watchdog_interval = getattr(SETTINGS, 'SLTP_WATCHDOG_INTERVAL_SEC', 30)
+        self._watchdog_min_interval = getattr(SETTINGS, 'SLTP_WATCHDOG_MIN_INTERVAL_SEC', 5.0)
+        self._watchdog_max_interval = getattr(SETTINGS, 'SLTP_WATCHDOG_MAX_INTERVAL_SEC', 60.0)
+        self._watchdog_trigger_pct = getattr(SETTINGS, 'SLTP_WATCHDOG_TRIGGER_PCT', 2.0)
+        self._price_cache_ttl = min(
+            getattr(SETTINGS, 'PRICE_CACHE_TTL_SEC', 5.0),
+            self._watchdog_interval / 2
+        )
+        self._quiet_band_ratio = self._validated_quiet_band_ratio(
+            getattr(SETTINGS, 'SLTP_QUIET_BAND_RATIO', 0.5)
+        )
+        self._sweep_concurrency = max(1, getattr(SETTINGS, 'WATCHDOG_CONCURRENCY', 5))
+        self._trail_atr_ttl = getattr(SETTINGS, 'TRAIL_ATR_CACHE_SEC', 300.0)
+        self._partial_tp_enabled = getattr(SETTINGS, 'PARTIAL_TP_ENABLED', True)
+        self._partial_tp_fraction = getattr(SETTINGS, 'PARTIAL_TP_FRACTION', 0.5)
+        self._trailing_enabled = getattr(SETTINGS, 'TRAILING_ENABLED', True)
+        self._trail_atr_mult = getattr(SETTINGS, 'TRAIL_ATR_MULT', 3.0)
+        self._sweep_warn_ms = getattr(SETTINGS, 'SWEEP_LATENCY_WARN_MS', 2000.0)
 
     def _calculate_initial_consecutive_losses(self):
         """Count trailing consecutive losses from history on init."""
@@ -79,18 +190,286 @@ class PositionManager:
         """Return current consecutive loss count."""
         return self._consecutive_losses
 
+    def _set_consecutive_losses(self, count: int):
+        """Sayacı güncelle ve portföye yaz (bir sonraki kayıtla diske gider)."""
+        self._consecutive_losses = count
+        self.portfolio["consecutive_losses"] = count
+
     def reset_consecutive_losses(self):
         """Reset consecutive losses counter."""
-        self._consecutive_losses = 0
+        self._set_consecutive_losses(0)
 
     def register_trade_result(self, pnl: float):
         """Update consecutive loss counter based on trade result."""
         if pnl is None:
             return
         if pnl < 0:
-            self._consecutive_losses += 1
+            self._set_consecutive_losses(self._consecutive_losses + 1)
         else:
-            self._consecutive_losses = 0
+            self._set_consecutive_losses(0)
+
+    def _record_latency(self, stage: str, start_time: float):
+        """perf_counter() başlangıcından bu yana geçen süreyi (ms) kaydet."""
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self._latency[stage].append(elapsed_ms)
+        
+        # Yavaş sweep'te pencerenin p95'ine bak (hızlı yolda quantile hesaplanmaz)
+        if stage == "sweep" and elapsed_ms > self._sweep_warn_ms:
+            p95 = self._latency_percentiles(self._latency[stage])["p95"]
+            if p95 > self._sweep_warn_ms:
+                logger.warning("⏱️ SL/TP sweep yavaşladı: p95=%.0fms (eşik %.0fms)", p95, self._sweep_warn_ms)
+
+    @staticmethod
+    def _latency_percentiles(samples) -> dict:
+        """Ölçüm penceresi için p50/p95/p99/max (ms)."""
+        data = list(samples)
+        if len(data) < 2:
+            value = data[0] if data else 0.0
+            return {"count": len(data), "p50": value, "p95": value, "p99": value, "max": value}
+        cuts = statistics.quantiles(data, n=100, method="inclusive")
+        return {"count": len(data), "p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(data)}
+
+    def get_latency_stats(self) -> dict:
+        """
+        SL/TP döngüsü aşamalarının gecikme istatistikleri (telemetri için).
+        
+        Returns:
+            {aşama: {"count", "p50", "p95", "p99", "max"}} - değerler ms,
+            son _LATENCY_WINDOW ölçüm üzerinden
+        """
+        return {stage: self._latency_percentiles(samples) for stage, samples in self._latency.items()}
+
+    def _close_position(self, position_id, price: float, reason: str, partial_qty=None):
+        """ExecutionManager.close_position'ı süresini ölçerek çağır."""
+        start_time = time.perf_counter()
+        try:
+            if partial_qty is None:
+                return self.execution_manager.close_position(position_id, price, reason)
+            return self.execution_manager.close_position(position_id, price, reason, partial_qty=partial_qty)
+        finally:
+            self._record_latency("close", start_time)
+
+    async def _get_prices(self, symbols: list) -> dict:
+        """
+        Kısa TTL'li fiyat cache'i üzerinden toplu fiyat al.
+        
+        check_positions_and_apply_risk ve watchdog aynı sembolü birkaç saniye
+        arayla sorgular; TTL içindeki fiyatlar tekrar çekilmez. TTL,
+        PRICE_CACHE_TTL_SEC ile ayarlanır ve watchdog aralığının yarısını aşmaz.
+        """
+        ttl = self._price_cache_ttl
+        now = time.monotonic()
+        prices = {}
+        missing = []
+        for symbol in symbols:
+            cached = self._price_cache.get(symbol)
+            if cached is not None and now - cached[1] < ttl:
+                prices[symbol] = cached[0]
+            else:
+                missing.append(symbol)
+        
+        if missing:
+            start_time = time.perf_counter()
+            # Router cache'i (websocket / giriş taraması) TTL içindeyse REST'e gidilmez
+            fetched = await self.market_data_engine.get_current_prices(missing, max_age=ttl)
+            self._record_latency("price_fetch", start_time)
+            fetched_at = time.monotonic()
+            for symbol, price in fetched.items():
+                self._price_cache[symbol] = (price, fetched_at)
+                prices[symbol] = price
+        
+        return prices
+
+    @staticmethod
+    def _validated_quiet_band_ratio(ratio: float) -> float:
+        """SLTP_QUIET_BAND_RATIO'yu [0, 1) aralığına sıkıştır; aralık dışıysa uyar."""
+        if ratio < 0:
+            logger.warning("SLTP_QUIET_BAND_RATIO=%s negatif, 0'a çekildi (sessiz bant kapalı)", ratio)
+            return 0.0
+        if ratio >= 1:
+            logger.warning("SLTP_QUIET_BAND_RATIO=%s >= 1, %.2f'e çekildi (SL/TP geçişi atlanabilirdi)",
+                           ratio, _QUIET_BAND_MAX_RATIO)
+            return _QUIET_BAND_MAX_RATIO
+        return ratio
+
+    def _in_quiet_band(self, position_id, price: float, stop_loss: float, take_profit: float) -> bool:
+        """
+        Fiyat son kontrolden beri SL/TP'yi tetikleyemeyecek kadar az mı oynadı?
+        
+        Hareket, son fiyatın SL ve TP'ye uzaklığının SLTP_QUIET_BAND_RATIO
+        katından küçükse (oran < 1) fiyat bu seviyeleri geçmiş olamaz; kontrol
+        güvenle atlanabilir. Oran 0 ise özellik kapalıdır.
+        """
+        last_price = self._last_checked_price.get(position_id)
+        self._last_checked_price[position_id] = price
+        if last_price is None or not self._quiet_band_ratio or not stop_loss:
+            return False
+        distance = last_price - stop_loss
+        if take_profit and take_profit > 0:
+            distance = min(distance, take_profit - last_price)
+        return distance > 0 and abs(price - last_price) < self._quiet_band_ratio * distance
+
+    async def _get_trail_atrs(self, symbols) -> dict:
+        """
+        Trailing stop için 1h ATR değerlerini TTL cache üzerinden al.
+        
+        Cache'te olmayan semboller için snapshot'lar WATCHDOG_CONCURRENCY
+        sınırıyla paralel kurulur; ATR TRAIL_ATR_CACHE_SEC boyunca yeniden
+        hesaplanmaz.
+        """
+        now = time.monotonic()
+        atrs = {}
+        missing = []
+        for symbol in symbols:
+            cached = self._atr_cache.get(symbol)
+            if cached is not None and now - cached[1] < self._trail_atr_ttl:
+                atrs[symbol] = cached[0]
+            else:
+                missing.append(symbol)
+        
+        if missing:
+            snapshots = await self._gather_bounded(
+                [self.market_data_engine.build_snapshot(symbol) for symbol in missing]
+            )
+            fetched_at = time.monotonic()
+            for symbol, snapshot in zip(missing, snapshots):
+                if not isinstance(snapshot, dict):
+                    continue
+                tf_1h = snapshot.get("tf", {}).get("1h", {})
+                atr = tf_1h.get("atr", snapshot.get("technical", {}).get("atr", 0)) or 0
+                self._atr_cache[symbol] = (atr, fetched_at)
+                atrs[symbol] = atr
+        
+        return atrs
+
+    def _invalidate_price(self, symbol: str):
+        """Kapanan pozisyonun fiyatını cache'ten düş (yeniden açılışta taze fiyat)."""
+        self._price_cache.pop(symbol, None)
+
+    def _finalize_close(self, symbol: str, position_id, pnl: float, closed_trade: dict, *,
+                        log_emoji: str, log_msg: str, title_tag: str, close_reason: str,
+                        entry_price: float, exit_price: float, note: str, quantity: float,
+                        live_trading_enabled: bool, is_error: bool = False):
+        """
+        Tam kapanış sonrası ortak adımlar: defter, log, Telegram, canlı satış.
+        
+        Returns:
+            Canlı satış gerekiyorsa _execute_live_sell coroutine'i (çağıran
+            sweep sonunda toplu çalıştırır), yoksa None
+        """
+        self._on_position_closed(symbol, position_id, pnl)
+        log_level = logging.ERROR if is_error else logging.INFO
+        logger.log(log_level, "%s %s: %s kapatıldı | PnL: $%.2f", log_emoji, log_msg, symbol, pnl)
+        
+        if self._tg_enabled:
+            total_value = self._calculate_total_portfolio_value()
+            mesaj = (
+                f"{log_emoji} <b>{log_msg} ({title_tag})</b>\n\n"
+                f"<b>Coin:</b> {symbol}/USDT\n"
+                f"<b>Giriş:</b> ${entry_price:.4f}\n"
+                f"<b>Çıkış:</b> ${exit_price:.4f}\n"
+                f"<b>PnL:</b> ${pnl:.2f} ({closed_trade.get('profit_pct', 0):.1f}%)\n\n"
+                f"<i>{note}</i>\n\n"
+                f"<b>💰 Toplam Portföy:</b> ${total_value:,.2f}"
+            )
+            self._enqueue_telegram(mesaj)
+        
+        if live_trading_enabled and self.executor:
+            return self._execute_live_sell(symbol, quantity, close_reason, closed_trade)
+        return None
+
+    def _on_position_closed(self, symbol: str, position_id, pnl: float):
+        """Tam kapanış sonrası ortak defter işleri (her iki SL/TP döngüsü için)."""
+        self.register_trade_result(pnl)
+        self._invalidate_price(symbol)
+        self._last_checked_price.pop(position_id, None)
+
+    @staticmethod
+    def _detect_sltp_hits(positions: list, prices: dict):
+        """
+        Tüm pozisyonlar için SL/TP tetiklerini tek seferde hesapla.
+        
+        NumPy varsa fiyat/SL/TP dizileri tek vektör karşılaştırmasıyla
+        işlenir; fiyatı olmayan pozisyonlar NaN olduğundan tetiklenmez.
+        SL/TP'si None veya 0 olan seviye "tanımsız" sayılır (her iki yolda).
+        
+        Returns:
+            (sl_hit, tp_hit): pozisyon sırasıyla bool listeleri
+        """
+        if NUMPY_AVAILABLE:
+            count = len(positions)
+            nan = float("nan")
+            px = np.fromiter((prices.get(p.get("symbol"), nan) for p in positions), float, count)
+            sl = np.fromiter((p.get("stop_loss") or nan for p in positions), float, count)
+            tp = np.fromiter((p.get("take_profit") or nan for p in positions), float, count)
+            sl_hit = px <= sl
+            tp_hit = (px >= tp) & ~sl_hit
+            return sl_hit.tolist(), tp_hit.tolist()
+        
+        sl_hit = []
+        tp_hit = []
+        for p in positions:
+            price = prices.get(p.get("symbol"))
+            stop_loss = p.get("stop_loss")
+            take_profit = p.get("take_profit")
+            # NumPy yolu ile aynı kural: fiyat yoksa ya da SL/TP boş/0 ise tetik yok
+            hit_sl = price is not None and bool(stop_loss) and price <= stop_loss
+            sl_hit.append(hit_sl)
+            tp_hit.append(not hit_sl and price is not None and bool(take_profit) and price >= take_profit)
+        return sl_hit, tp_hit
+
+    @staticmethod
+    def _v1_watchdog_candidates(positions: list, prices: dict, trail_atrs: dict,
+                                partial_tp_enabled: bool, trailing_enabled: bool) -> list:
+        """
+        V1 watchdog'da bu sweep'te işlem gerektirebilecek pozisyonları seç.
+        
+        Aday: SL tetiklenmiş, 1R partial TP seviyesine ulaşmış ya da
+        trailing güncellemesi olası (partial alınmış + ATR var) pozisyonlar.
+        Geri kalanlar için döngü gövdesi hiç çalışmaz.
+        
+        Returns:
+            Aday pozisyonların indeksleri (liste sırasıyla)
+        """
+        nan = float("nan")
+        
+        def current_sl(p):
+            return p.get("current_sl", p.get("stop_loss", 0)) or 0
+        
+        if NUMPY_AVAILABLE:
+            count = len(positions)
+            px = np.fromiter((prices.get(p.get("symbol")) or nan for p in positions), float, count)
+            sl = np.fromiter((current_sl(p) for p in positions), float, count)
+            entry = np.fromiter((p.get("entry_price", 0) or 0 for p in positions), float, count)
+            init_sl = np.fromiter((p.get("initial_sl", current_sl(p)) or 0 for p in positions), float, count)
+            taken = np.fromiter((bool(p.get("partial_taken", False)) for p in positions), bool, count)
+            # Açılışta saklanan 1R seviyesi; eski pozisyonlarda giriş/ilk SL'den türetilir
+            one_r = np.fromiter((p.get("one_r_price") or nan for p in positions), float, count)
+            one_r = np.where(np.isnan(one_r), 2 * entry - init_sl, one_r)
+            
+            mask = px <= sl
+            if partial_tp_enabled:
+                mask |= ~taken & (entry > 0) & (init_sl > 0) & (px >= one_r)
+            if trailing_enabled:
+                has_atr = np.fromiter((trail_atrs.get(p.get("symbol"), 0) > 0 for p in positions), bool, count)
+                mask |= taken & has_atr & ~np.isnan(px)
+            return np.flatnonzero(mask).tolist()
+        
+        candidates = []
+        for idx, p in enumerate(positions):
+            price = prices.get(p.get("symbol"))
+            if not price:
+                continue
+            stop = current_sl(p)
+            entry_price = p.get("entry_price", 0) or 0
+            initial_sl = p.get("initial_sl", stop) or 0
+            taken = p.get("partial_taken", False)
+            if (price <= stop
+                    or (partial_tp_enabled and not taken and entry_price > 0 and initial_sl > 0
+                        and price >= (p.get("one_r_price") or 2 * entry_price - initial_sl))
+                    or (trailing_enabled and taken and trail_atrs.get(p.get("symbol"), 0) > 0)):
+                candidates.append(idx)
+        return candidates
 
     def _calculate_total_portfolio_value(self) -> float:
         """
@@ -100,20 +479,23 @@ class PositionManager:
             Total value in USD
         """
         total = self.portfolio.get("balance", 0.0)
+        cache_get = self._price_cache.get
         
         for pos in self.portfolio.get("positions", []):
-            if pos.get("status") != "OPEN":
+            get = pos.get
+            if get("status") != "OPEN":
                 continue
             
-            symbol = pos.get("symbol", "")
-            quantity = pos.get("quantity", 0)
+            symbol = get("symbol", "")
+            quantity = get("quantity", 0)
             
             if quantity <= 0:
                 continue
             
-            # Try to get current price from market_data_engine
-            current_price = None
-            if self.market_data_engine:
+            # Önce sweep'lerin doldurduğu fiyat cache'i, yoksa market_data_engine
+            cached = cache_get(symbol)
+            current_price = cached[0] if cached else None
+            if not current_price and self.market_data_engine:
                 try:
                     current_price = self.market_data_engine.get_current_price(symbol)
                 except Exception:
@@ -121,34 +503,64 @@ class PositionManager:
             
             # Fallback to entry price if market data unavailable
             if not current_price:
-                current_price = pos.get("entry_price", 0)
+                current_price = get("entry_price", 0)
             
             if current_price and current_price > 0:
                 total += quantity * current_price
         
         return total
 
+    def _sync_trade_counters(self):
+        """
+        History'ye son çağrıdan beri eklenen işlemleri sayaçlara işle.
+        
+        History'yi ExecutionManager yazar; sadece yeni kayıtlar taranır, böylece
+        özet her çağrıda O(yeni işlem) olur. History listesi değiştirildiyse
+        (yeniden yükleme) veya kısaldıysa (reset) baştan sayılır.
+        """
+        history = self.portfolio.get("history", [])
+        if history is not self._counted_history or len(history) < self._counted_trades:
+            self._counted_history = history
+            self._counted_trades = 0
+            self._winning_trades = 0
+            self._losing_trades = 0
+            self._total_pnl = 0.0
+        
+        # Dilim kopyası almadan sadece yeni kayıtları gez
+        for idx in range(self._counted_trades, len(history)):
+            pnl = history[idx].get("profit_loss", 0) or 0
+            if pnl > 0:
+                self._winning_trades += 1
+            elif pnl < 0:
+                self._losing_trades += 1
+            self._total_pnl += pnl
+        self._counted_trades = len(history)
+
+    def invalidate_aggregates(self):
+        """
+        History dışarıdan düzenlendiğinde (kayıt silme/değiştirme) türetilmiş
+        sayaçları sıfırla: özet bir sonraki çağrıda baştan sayılır, ardışık
+        zarar sayacı history'den yeniden hesaplanır.
+        """
+        self._counted_history = None
+        self._set_consecutive_losses(self._calculate_initial_consecutive_losses())
+
     def get_portfolio_summary(self):
         """
         Returns aggregated portfolio metrics.
         Moved from scraper-v90.py (get_portfolio_summary).
         """
-        positions = self.get_open_positions()
-        history = self.portfolio.get("history", [])
-        
-        total_trades = len(history)
-        winning_trades = len([h for h in history if h.get("profit_loss", 0) > 0])
-        losing_trades = len([h for h in history if h.get("profit_loss", 0) < 0])
-        total_pnl = sum(h.get("profit_loss", 0) for h in history)
+        self._sync_trade_counters()
+        total_trades = self._counted_trades
         
         return {
             "balance": self.portfolio["balance"],
-            "open_positions": len(positions),
+            "open_positions": len(self.get_open_positions()),
             "total_trades": total_trades,
-            "winning_trades": winning_trades,
-            "losing_trades": losing_trades,
-            "win_rate": (winning_trades / total_trades * 100) if total_trades > 0 else 0,
-            "total_pnl": total_pnl
+            "winning_trades": self._winning_trades,
+            "losing_trades": self._losing_trades,
+            "win_rate": (self._winning_trades / total_trades * 100) if total_trades > 0 else 0,
+            "total_pnl": self._total_pnl
         }
 
     async def check_positions_and_apply_risk(self, live_trading_enabled=False):
@@ -171,122 +583,317 @@ class PositionManager:
         logger.info("💼 PORTFÖY YÖNETİMİ (SL/TP KONTROLÜ)")
         logger.info("─" * 50)
         
-        logger.info(f"Açık pozisyon sayısı: {len(positions)}")
+        logger.info("Açık pozisyon sayısı: %d", len(positions))
         
         closed_count = 0
         total_pnl = 0
+        sweep_start = time.perf_counter()
         
-        bot_token = self.telegram_config.get("bot_token")
-        chat_id = self.telegram_config.get("chat_id")
-        
-        # Iterate over a copy
-        for position in positions[:]:
-            symbol = position.get("symbol")
-            position_id = position.get("id")
-            stop_loss = position.get("stop_loss")
-            take_profit = position.get("take_profit")
-            entry_price = position.get("entry_price")
-            
-            # Get current price from MarketDataEngine
-            current_price = self.market_data_engine.get_current_price(symbol)
-            
-            if current_price is None:
-                logger.warning(f"  {symbol}: Fiyat alınamadı (MarketDataEngine), atlanıyor")
-                continue
-            
-            logger.info(f"  {symbol}: ${current_price:.4f} (SL: ${stop_loss:.4f} | TP: ${take_profit:.4f})")
-            
-            close_reason = None
-            log_emoji = ""
-            log_msg = ""
-            is_error = False
-            
-            if current_price <= stop_loss:
-                close_reason = "SL"
-                log_emoji = "🛑"
-                log_msg = "STOP LOSS"
-                is_error = True
-            elif current_price >= take_profit:
-                close_reason = "TP"
-                log_emoji = "💰"
-                log_msg = "TAKE PROFIT"
-                is_error = False
+        # Okuma aşaması kilitsiz: fiyatlar listenin anlık kopyası için çekilir
+        positions_snapshot = tuple(positions)
+        # Batch price fetch: one round-trip for all open positions
+        prices = await self._get_prices([p.get("symbol") for p in positions_snapshot])
+        live_sells = []
+        try:
+            # Watchdog ile aynı anda aynı pozisyonu kapatmamak için kapanış bölümü kilitli
+            async with self._close_lock, self._deferred_close_saves():
+                # Fiyat beklenirken watchdog'un kapattığı pozisyonları atla
+                open_ids = {p.get("id") for p in positions}
+                sl_hit, tp_hit = self._detect_sltp_hits(positions_snapshot, prices)
+                # Her pozisyonda çözülen attribute'lar döngü dışında local'e alınır
+                get_price = prices.get
+                in_quiet_band = self._in_quiet_band
+                log_debug = logger.debug
+                log_info = logger.info
+                close_position = self._close_position
             
-            if close_reason:
-                # Delegate paper close to ExecutionManager
-                success, pnl, closed_trade = self.execution_manager.close_position(position_id, current_price, close_reason)
-                
-                if success:
-                    closed_count += 1
-                    total_pnl += pnl
-                    self.register_trade_result(pnl)
-                    msg = f"{log_emoji} {log_msg}: {symbol} kapatıldı | PnL: ${pnl:.2f}"
-                    
-                    if is_error:
-                         logger.error(msg)
-                    else:
-                         logger.info(msg)
+                # Kopya üzerinde gez: close_position canlı listeden silse de döngü etkilenmez
+                for i, position in enumerate(positions_snapshot):
+                    try:
+                        symbol, position_id, stop_loss, take_profit, entry_price = _SWEEP_FIELDS(position)
+                    except KeyError as e:
+                        logger.warning("  Eksik pozisyon alanı %s, atlanıyor: %s", e, position.get("id"))
+                        continue
+                    if position_id not in open_ids:
+                        continue
                     
-                    if self.telegram_fn and bot_token and chat_id:
-                        total_value = self._calculate_total_portfolio_value()
-                        mesaj = (
-                            f"{log_emoji} <b>{log_msg} ({close_reason})</b>\n\n"
-                            f"<b>Coin:</b> {symbol}/USDT\n"
-                            f"<b>Giriş:</b> ${entry_price:.4f}\n"
-                            f"<b>Çıkış:</b> ${current_price:.4f}\n"
-                            f"<b>PnL:</b> ${pnl:.2f} ({closed_trade['profit_pct']:.1f}%)\n\n"
-                            f"<b>💰 Toplam Portföy:</b> ${total_value:,.2f}\n\n"
-                            f"<i>{closed_trade.get('haber_baslik', '')}</i>"
-                        )
-                        await self.telegram_fn(bot_token, chat_id, mesaj)
+                    # Bir pozisyondaki hata sweep'i kesmesin: önceki kapanışların
+                    # canlı satışları finally'de yine gönderilir
+                    try:
+                        current_price = get_price(symbol)
+                
+                        if current_price is None:
+                            logger.warning("  %s: Fiyat alınamadı (MarketDataEngine), atlanıyor", symbol)
+                            continue
+                
+                        # Fiyat SL/TP'ye yaklaşmadıysa bu turu atla
+                        if in_quiet_band(position_id, current_price, stop_loss, take_profit):
+                            continue
+                
+                        # Tetiklenmeyen pozisyonun fiyat satırı sadece DEBUG'da
+                        log_debug("  %s: $%.4f (SL: $%.4f | TP: $%.4f)", symbol, current_price, stop_loss, take_profit)
+                
+                        close_reason = None
+                        log_emoji = ""
+                        log_msg = ""
+                        is_error = False
+                
+                        if sl_hit[i]:
+                            close_reason = "SL"
+                            log_emoji = "🛑"
+                            log_msg = "STOP LOSS"
+                            is_error = True
+                        elif tp_hit[i]:
+                            close_reason = "TP"
+                            log_emoji = "💰"
+                            log_msg = "TAKE PROFIT"
+                            is_error = False
+                
+                        if close_reason:
+                            log_info("  %s: $%.4f (SL: $%.4f | TP: $%.4f) -> %s",
+                                     symbol, current_price, stop_loss, take_profit, close_reason)
+                            # Close öncesi miktar: tam kapanışta pozisyon dict'i listeden düşer
+                            quantity = position.get("quantity", 0)
+                            # Delegate paper close to ExecutionManager
+                            success, pnl, closed_trade = close_position(position_id, current_price, close_reason)
                     
-                    # LIVE TRADING: Executing sell via Executor with retry
-                    if live_trading_enabled and self.executor:
-                        quantity = position.get('quantity', 0)
-                        max_retries = getattr(SETTINGS, 'LIVE_ORDER_MAX_RETRIES', 3)
-                        retry_delay = getattr(SETTINGS, 'LIVE_ORDER_RETRY_DELAY', 2.0)
-                        
-                        for attempt in range(max_retries):
-                            try:
-                                live_order = await self.executor.create_order(
-                                    symbol=f"{symbol}USDT", 
-                                    side="SELL",
-                                    quantity=quantity, 
-                                    order_type="MARKET"
+                            if success:
+                                closed_count += 1
+                                total_pnl += pnl
+                                live_sell = self._finalize_close(
+                                    symbol, position_id, pnl, closed_trade,
+                                    log_emoji=log_emoji, log_msg=log_msg, title_tag=close_reason,
+                                    close_reason=close_reason, entry_price=entry_price, exit_price=current_price,
+                                    note=closed_trade.get('haber_baslik', ''), quantity=quantity,
+                                    live_trading_enabled=live_trading_enabled, is_error=is_error
                                 )
-                                logger.info(f"🔴 CANLI {close_reason} SATIŞ: {symbol} OrderId={live_order.get('orderId')}")
-                                
-                                # Update history with live order info
-                                if self.portfolio.get("history"):
-                                    self.portfolio["history"][-1]["live_sell_order_id"] = live_order.get("orderId")
-                                    self.portfolio["history"][-1]["live_sell_status"] = "FILLED"
-                                    if self.save_portfolio_fn:
-                                        self.save_portfolio_fn(self.portfolio)
-                                break  # Başarılı, döngüden çık
-                                        
-                            except Exception as e:
-                                if attempt < max_retries - 1:
-                                    logger.warning(f"⚠️ CANLI {close_reason} DENEME {attempt + 1}/{max_retries} BAŞARISIZ: {e}")
-                                    await asyncio.sleep(retry_delay)
-                                else:
-                                    logger.error(f"❌ CANLI {close_reason} SATIŞ TÜM DENEMELER BAŞARISIZ: {symbol} - {e}")
-                                    if self.portfolio.get("history"):
-                                        self.portfolio["history"][-1]["live_sell_failed"] = True
-                                        self.portfolio["history"][-1]["live_sell_error"] = str(e)
-                                        if self.save_portfolio_fn:
-                                            self.save_portfolio_fn(self.portfolio)
-                    
-                    await asyncio.sleep(1)
+                                if live_sell:
+                                    live_sells.append(live_sell)
+                    except Exception as e:
+                        logger.error("  %s SL/TP kontrol hatası: %s", symbol, e)
+                        continue  # Diğer pozisyonlara devam et
+        finally:
+            # Kağıt üzerinde kapanan pozisyonların canlı satışı her durumda gönderilir;
+            # kilit dışında, birbirini beklemeden ve sınırlı eşzamanlılıkla
+            await self._gather_bounded(live_sells)
+        # Sweep boyunca biriken değişiklikler tek yazımla diske
+        self.flush_pending_save()
+        self._record_latency("sweep", sweep_start)
             
-            await asyncio.sleep(0.3)  # Rate limiting
-        
         if closed_count > 0:
-            logger.info(f"Toplam kapatılan: {closed_count} | Toplam PnL: ${total_pnl:.2f}")
+            logger.info("Toplam kapatılan: %d | Toplam PnL: $%.2f", closed_count, total_pnl)
         else:
             logger.debug("SL/TP tetiklenmedi, pozisyonlar devam ediyor")
         
         return closed_count, total_pnl
 
+    @asynccontextmanager
+    async def _deferred_close_saves(self):
+        """
+        Blok boyunca ExecutionManager'ın kapanış başına kaydını ertele.
+        
+        Ertelenen kayıt sweep sonundaki flush_pending_save()'e bağlanır; N
+        kapanış tek portföy yazımına iner. save_portfolio_fn verilmemişse
+        ExecutionManager blok sonunda kendisi yazar.
+        """
+        em = self.execution_manager
+        if not hasattr(em, "suspend_saves"):
+            yield
+            return
+        em.suspend_saves()
+        try:
+            yield
+        finally:
+            if em.resume_saves(flush=not self.save_portfolio_fn):
+                self._save_dirty = True
+
+    def _schedule_save(self):
+        """
+        Portföy kaydını debounce ederek planla.
+        
+        Kısa sürede gelen birden fazla istek _SAVE_DEBOUNCE_SEC sonra tek bir
+        save_portfolio_fn çağrısına indirgenir. Event loop yoksa hemen kaydeder.
+        """
+        if not self.save_portfolio_fn:
+            return
+        self._save_dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_pending_save()
+            return
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._debounced_save())
+
+    async def _debounced_save(self):
+        """Debounce penceresi dolunca bekleyen kaydı yaz."""
+        await asyncio.sleep(_SAVE_DEBOUNCE_SEC)
+        try:
+            self.flush_pending_save()
+        except Exception as e:
+            logger.error("Portföy kaydetme hatası: %s", e)
+
+    def flush_pending_save(self):
+        """Bekleyen portföy kaydı varsa hemen yaz."""
+        if self._save_dirty and self.save_portfolio_fn:
+            self._save_dirty = False
+            self.save_portfolio_fn(self.portfolio)
+
+    def _enqueue_telegram(self, mesaj: str):
+        """
+        Telegram bildirimini kuyruğa at (fire-and-forget).
+        
+        Kapanış döngüsü Telegram RTT'sini beklemez; worker ilk kullanımda başlar.
+        Kuyruk doluysa bildirim uyarı ile düşürülür.
+        """
+        try:
+            self._telegram_queue.put_nowait(mesaj)
+        except asyncio.QueueFull:
+            logger.warning("Telegram kuyruğu dolu, bildirim atlandı")
+            return
+        if self._telegram_task is None or self._telegram_task.done():
+            self._telegram_task = asyncio.get_running_loop().create_task(self._telegram_worker())
+
+    @staticmethod
+    def _batch_telegram_messages(mesajlar: list) -> list:
+        """
+        Mesajları ayraçla birleştirip Telegram sınırına sığan parçalara böl.
+        
+        Tek başına sınırı aşan mesaj kendi parçasında kalır (bölünmez;
+        HTML etiketleri yarıda kesilmesin).
+        """
+        batches = []
+        current = ""
+        for mesaj in mesajlar:
+            if current and len(current) + len(_TELEGRAM_SEPARATOR) + len(mesaj) > _TELEGRAM_MAX_CHARS:
+                batches.append(current)
+                current = mesaj
+            else:
+                current = f"{current}{_TELEGRAM_SEPARATOR}{mesaj}" if current else mesaj
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _telegram_worker(self):
+        """
+        Kuyruktaki Telegram bildirimlerini gönder.
+        
+        Bir sweep'te biriken bildirimler (kuyrukta o an bekleyenlerin tümü)
+        tek sendMessage çağrısında birleştirilir; N kapanış = 1 round-trip.
+        """
+        while True:
+            mesajlar = [await self._telegram_queue.get()]
+            while not self._telegram_queue.empty():
+                mesajlar.append(self._telegram_queue.get_nowait())
+            
+            for batch in self._batch_telegram_messages(mesajlar):
+                # Sohbet başına limit: önceki gönderimden bu yana yeterince geçmediyse bekle
+                wait_time = self._telegram_next_send - time.monotonic()
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+                self._telegram_next_send = time.monotonic() + _TELEGRAM_MIN_INTERVAL_SEC
+                start_time = time.perf_counter()
+                try:
+                    await self.telegram_fn(self._tg_token, self._tg_chat, batch)
+                except Exception as e:
+                    logger.error("Telegram hatası: %s", e)
+                finally:
+                    self._record_latency("telegram", start_time)
+            for _ in mesajlar:
+                self._telegram_queue.task_done()
+
+    async def drain_telegram(self, timeout: float = _TELEGRAM_DRAIN_TIMEOUT_SEC):
+        """
+        Kapanışta kuyrukta bekleyen Telegram bildirimlerinin gönderilmesini bekle.
+        
+        Son sweep'te kapanan pozisyonların bildirimi kaybolmasın diye; timeout
+        dolarsa kalanlar uyarıyla bırakılır. Ardından worker durdurulur.
+        """
+        task = self._telegram_task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(self._telegram_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Telegram kuyruğu boşaltılamadı, %d bildirim atlandı",
+                           self._telegram_queue.qsize())
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._telegram_task = None
+
+    async def _gather_bounded(self, coros: list):
+        """
+        Coroutine'leri en fazla WATCHDOG_CONCURRENCY eşzamanlılıkla çalıştır.
+        
+        Hatalar toplanır ve loglanır; biri patlarsa diğerleri iptal edilmez.
+        """
+        if not coros:
+            return []
+        semaphore = asyncio.Semaphore(self._sweep_concurrency)
+        
+        async def run(coro):
+            async with semaphore:
+                return await coro
+        
+        results = await asyncio.gather(*(run(c) for c in coros), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Eşzamanlı görev hatası: %s", result)
+        return results
+
+    async def _execute_live_sell(self, symbol: str, quantity: float, close_reason: str, trade_record: dict):
+        """
+        Kapanan pozisyon için canlı MARKET SELL emrini retry ile gönder.
+        
+        Sonuç (order id veya hata), close_position'ın döndürdüğü history
+        kaydına yazılır; history[-1] kullanılmaz çünkü araya başka bir
+        kapanış girmiş olabilir.
+        """
+        binance_symbol = f"{symbol}USDT"
+        for attempt in range(self._max_retries):
+            start_time = time.perf_counter()
+            try:
+                live_order = await self.executor.create_order(
+                    symbol=binance_symbol,
+                    side="SELL",
+                    quantity=quantity,
+                    order_type="MARKET"
+                )
+                self._record_latency("live_order", start_time)
+                logger.info("🔴 CANLI %s SATIŞ: %s OrderId=%s", close_reason, symbol, live_order.get('orderId'))
+                self._record_live_sell_result(trade_record, live_order)
+                return live_order
+            except Exception as e:
+                permanent = getattr(e, "code", None) in _PERMANENT_ORDER_ERROR_CODES
+                if not permanent and attempt < self._max_retries - 1:
+                    logger.warning("⚠️ CANLI %s DENEME %d/%d BAŞARISIZ: %s", close_reason, attempt + 1, self._max_retries, e)
+                    # Exponential backoff + full jitter (üst sınır: LIVE_ORDER_MAX_BACKOFF_SEC)
+                    backoff = min(self._retry_delay * (2 ** attempt), self._max_backoff)
+                    await asyncio.sleep(random.uniform(0, backoff))
+                else:
+                    if permanent:
+                        logger.error("❌ CANLI %s SATIŞ KALICI HATA (kod: %s): %s - %s", close_reason, e.code, symbol, e)
+                    else:
+                        logger.error("❌ CANLI %s SATIŞ TÜM DENEMELER BAŞARISIZ: %s - %s", close_reason, symbol, e)
+                    self._record_live_sell_result(trade_record, None, error=e)
+                    break
+        return None
+
+    def _record_live_sell_result(self, trade_record: dict, order, error=None):
+        """Canlı satış sonucunu ilgili history kaydına işle ve portföyü kaydet."""
+        if not trade_record:
+            return
+        if error is None:
+            trade_record["live_sell_order_id"] = order.get("orderId")
+            trade_record["live_sell_status"] = "FILLED"
+        else:
+            trade_record["live_sell_failed"] = True
+            trade_record["live_sell_error"] = str(error)
+        self._schedule_save()
+
     # ═══════════════════════════════════════════════════════════════════════════
     # SL/TP WATCHDOG - Bağımsız Pozisyon İzleme Görevi
     # ═══════════════════════════════════════════════════════════════════════════
@@ -303,9 +910,9 @@ class PositionManager:
         Args:
             live_trading_enabled: Canlı trading aktif mi?
         """
-        # Config'den ayarları al
-        enabled = getattr(SETTINGS, 'SLTP_WATCHDOG_ENABLED', True)
-        interval = getattr(SETTINGS, 'SLTP_WATCHDOG_INTERVAL_SEC', 30)
+        # Ayarlar reload_settings() ile önceden çözümlendi
+        enabled = self._watchdog_enabled
+        interval = self._watchdog_interval
         
         if not enabled:
             logger.info("🐕 SL/TP Watchdog devre dışı (config'de kapalı)")
@@ -313,9 +920,9 @@ class PositionManager:
         
         logger.info(f"🐕 SL/TP Watchdog başlatıldı (her {interval}sn)")
         
-        self._watchdog_running = True
+        self._watchdog_stop.clear()
         
-        while self._watchdog_running:
+        while not self._watchdog_stop.is_set():
             try:
                 # Sadece açık pozisyon varsa kontrol yap
                 positions = self.get_open_positions()
@@ -324,20 +931,71 @@ class PositionManager:
                     # Hafif bir kontrol - sadece SL/TP, log header yazmadan
                     await self._quick_sltp_check(positions, live_trading_enabled)
                 
-                await asyncio.sleep(interval)
-                
             except asyncio.CancelledError:
                 logger.info("🐕 SL/TP Watchdog durduruldu (cancelled)")
                 break
             except Exception as e:
                 logger.error(f"🐕 Watchdog hatası: {e}")
-                await asyncio.sleep(interval)
+            
+            # Açık pozisyon yokken periyodik uyanma yerine açılış bildirimini bekle
+            # (bildirilmeyen açılışlara karşı en geç max interval'de bir bakılır).
+            # stop_watchdog() her iki beklemeyi de beklemeden keser.
+            if self.get_open_positions():
+                wait_for_event = self._watchdog_stop
+                timeout = self._next_watchdog_interval()
+            else:
+                self._positions_opened.clear()
+                wait_for_event = self._positions_opened
+                timeout = self._watchdog_max_interval
+            try:
+                await asyncio.wait_for(wait_for_event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                logger.info("🐕 SL/TP Watchdog durduruldu (cancelled)")
+                break
         
+        # Kapanışta debounce penceresinde bekleyen kaydı kaybetme
+        self.flush_pending_save()
         logger.info("🐕 SL/TP Watchdog sonlandı")
     
+    def _next_watchdog_interval(self) -> float:
+        """
+        Bir sonraki watchdog turuna kadar beklenecek süre.
+        
+        Pozisyonların SL/TP'ye en yakın mesafesine göre ölçeklenir: mesafe
+        SLTP_WATCHDOG_TRIGGER_PCT iken taban aralık, yaklaştıkça daha sık,
+        uzaklaştıkça daha seyrek kontrol (min/max ile sınırlı). Aynı fazda
+        uyanmamak için ±%20 jitter eklenir.
+        """
+        min_dist_pct = None
+        for position in self.get_open_positions():
+            cached = self._price_cache.get(position.get("symbol"))
+            if not cached or cached[0] <= 0:
+                continue
+            price = cached[0]
+            stop_loss = position.get("current_sl", position.get("stop_loss"))
+            take_profit = position.get("take_profit")
+            for level, dist in ((stop_loss, price - (stop_loss or 0)), (take_profit, (take_profit or 0) - price)):
+                if level and level > 0:
+                    dist_pct = max(dist, 0.0) / price * 100
+                    if min_dist_pct is None or dist_pct < min_dist_pct:
+                        min_dist_pct = dist_pct
+        
+        interval = self._watchdog_interval
+        if min_dist_pct is not None and self._watchdog_trigger_pct > 0:
+            interval = interval * min_dist_pct / self._watchdog_trigger_pct
+            interval = max(self._watchdog_min_interval, min(self._watchdog_max_interval, interval))
+        return interval * random.uniform(0.8, 1.2)
+
     def stop_watchdog(self):
-        """Watchdog'u durdur."""
-        self._watchdog_running = False
+        """Watchdog'u durdur (bekleyen interval anında kesilir)."""
+        self._watchdog_stop.set()
+        self._positions_opened.set()
+    
+    def notify_position_opened(self):
+        """Yeni pozisyon açıldı: boşta bekleyen watchdog'u hemen uyandır."""
+        self._positions_opened.set()
     
     async def _quick_sltp_check(self, positions: list, live_trading_enabled: bool):
         """
@@ -350,196 +1008,196 @@ class PositionManager:
         - Trailing stop after partial TP
         - Time-based exits
         """
-        bot_token = self.telegram_config.get("bot_token")
-        chat_id = self.telegram_config.get("chat_id")
+        sweep_start = time.perf_counter()
+        # Okuma aşaması kilitsiz: listenin anlık kopyası üzerinden fiyat ve
+        # snapshot'lar çekilir; kilit sadece kararların uygulandığı bölümde tutulur
+        positions_snapshot = tuple(positions)
         
-        for position in positions[:]:  # Copy to avoid modification issues
-            symbol = position.get("symbol")
-            position_id = position.get("id")
-            entry_price = position.get("entry_price", 0)
+        # Batch price fetch: one round-trip per sweep instead of one per position
+        try:
+            prices = await self._get_prices([p.get("symbol") for p in positions_snapshot])
+        except Exception as e:
+            logger.warning("[WATCHDOG] Toplu fiyat alınamadı: %s", e)
+            prices = {}
+        
+        pending = []  # [(position, current_price, needs_exit_check)]
+        get_price = prices.get
+        in_quiet_band = self._in_quiet_band
+        for position in positions_snapshot:
+            current_price = get_price(position.get("symbol"))
+            if current_price is None:
+                logger.warning("[WATCHDOG] %s: Fiyat alınamadı, atlanıyor", position.get("symbol"))
+                continue
+            # Saf SL/TP çıkışlı (V1) pozisyonlarda fiyat bantta kaldıysa
+            # snapshot + exit kontrolüne hiç girme
+            needs_exit_check = True
             entry_type = position.get("entry_type", "UNKNOWN")
+            if entry_type.startswith("V1") or entry_type == "UNKNOWN":
+                stop_loss = position.get("current_sl", position.get("stop_loss", 0))
+                needs_exit_check = not in_quiet_band(
+                    position.get("id"), current_price, stop_loss, position.get("take_profit", 0)
+                )
+            pending.append((position, current_price, needs_exit_check))
+        
+        # Get snapshot for V2 exit logic (needed for trailing stop ATR)
+        # Sembol başına bir kez, WATCHDOG_CONCURRENCY sınırıyla paralel kurulur
+        snapshot_symbols = list({p.get("symbol") for p, _, needs in pending if needs})
+        built = await self._gather_bounded(
+            [self.market_data_engine.build_snapshot(symbol) for symbol in snapshot_symbols]
+        )
+        snapshots = {
+            symbol: snapshot for symbol, snapshot in zip(snapshot_symbols, built)
+            if isinstance(snapshot, dict)
+        }
+        
+        live_sells = []
+        try:
+            # Ana döngü kontrolüyle aynı anda aynı pozisyonu kapatmamak için
+            # kapanış/güncelleme bölümü kilitli
+            async with self._close_lock, self._deferred_close_saves():
+                # Okuma aşamasında diğer sweep'in kapattığı pozisyonları atla
+                open_ids = {p.get("id") for p in positions}
             
-            try:
-                # Get current price
-                current_price = self.market_data_engine.get_current_price(symbol)
-                
-                if current_price is None:
-                    logger.warning(f"[WATCHDOG] {symbol}: Fiyat alınamadı, atlanıyor")
-                    continue
-                
-                # Get snapshot for V2 exit logic (needed for trailing stop ATR)
-                try:
-                    snapshot = await self.market_data_engine.build_snapshot(symbol)
-                except Exception as e:
-                    logger.debug(f"[WATCHDOG] {symbol}: Snapshot build failed: {e}")
-                    # Minimal snapshot for basic SL/TP check
-                    snapshot = {"tf": {"1h": {}, "4h": {}}, "price": current_price}
-                
-                # Update highest close for trailing stop tracking
-                if current_price > position.get("highest_close_since_entry", entry_price):
-                    position["highest_close_since_entry"] = current_price
-                    if self.save_portfolio_fn:
-                        self.save_portfolio_fn(self.portfolio)
-                
-                # Use V2 exit logic
-                exit_result = self.check_exit_conditions(position, current_price, snapshot)
-                action = exit_result.get("action", "HOLD")
-                reason = exit_result.get("reason", "")
+                for position, current_price, needs_exit_check in pending:
+                    get = position.get
+                    symbol = get("symbol")
+                    position_id = get("id")
+                    entry_price = get("entry_price", 0)
+                    entry_type = get("entry_type", "UNKNOWN")
+                    if position_id not in open_ids:
+                        continue
                 
-                # Smart logging: only log if price changed >1% or action changed
-                last_log = self._watchdog_last_log.get(position_id, {})
-                last_price = last_log.get("price", 0)
-                last_action = last_log.get("action", "")
-                
-                price_change_pct = abs(current_price - last_price) / last_price * 100 if last_price > 0 else 100
-                should_log = (price_change_pct >= 1.0 or action != last_action or action != "HOLD")
-                
-                if should_log:
-                    logger.debug(f"[WATCHDOG] {symbol}: price={current_price:.4f}, action={action}, reason={reason[:50]}...")
-                    self._watchdog_last_log[position_id] = {"price": current_price, "action": action}
-                
-                if action == "HOLD":
-                    continue
+                    try:
+                        # Update highest close for trailing stop tracking
+                        if current_price > get("highest_close_since_entry", entry_price):
+                            position["highest_close_since_entry"] = current_price
+                            self._schedule_save()
                     
-                # Determine exit parameters
-                if action == "SELL_PARTIAL":
-                    # Partial TP - sell portion and keep rest
-                    partial_qty = exit_result.get("quantity", position.get("quantity", 0) * 0.5)
+                        if not needs_exit_check:
+                            continue
                     
-                    logger.info(f"🐕 Watchdog: {symbol} PARTIAL TP tetiklendi! (${current_price:.4f}) - {reason}")
+                        snapshot = snapshots.get(symbol)
+                        if snapshot is None:
+                            # Minimal snapshot for basic SL/TP check
+                            snapshot = {"tf": {"1h": {}, "4h": {}}, "price": current_price}
                     
-                    success, pnl, closed_trade = self.execution_manager.close_position(
-                        position_id, current_price, "PARTIAL_TP", partial_qty=partial_qty
-                    )
-                
-                    if success:
-                        # Mark partial TP as taken in the remaining position
-                        # Find the updated position in portfolio
-                        for pos in self.portfolio.get("positions", []):
-                            if pos.get("id") == position_id:
-                                pos["partial_tp_hit"] = True
-                                pos["partial_taken"] = True
-                                # Move stop to breakeven after partial
-                                if entry_price > 0:
-                                    pos["current_sl"] = entry_price
-                                    logger.info(f"[{symbol}] Stop moved to breakeven: ${entry_price:.2f}")
-                                break
+                        # Use V2 exit logic
+                        exit_result = self.check_exit_conditions(position, current_price, snapshot)
+                        action = exit_result.get("action", "HOLD")
+                        reason = exit_result.get("reason", "")
+                    
+                        # Smart logging: only log if price changed >1% or action changed
+                        last_log = self._watchdog_last_log.get(position_id, {})
+                        last_price = last_log.get("price", 0)
+                        last_action = last_log.get("action", "")
+                    
+                        price_change_pct = abs(current_price - last_price) / last_price * 100 if last_price > 0 else 100
+                        should_log = (price_change_pct >= 1.0 or action != last_action or action != "HOLD")
+                    
+                        if should_log:
+                            logger.debug("[WATCHDOG] %s: price=%.4f, action=%s, reason=%.50s...", symbol, current_price, action, reason)
+                            self._watchdog_last_log[position_id] = {"price": current_price, "action": action}
+                    
+                        if action == "HOLD":
+                            continue
                         
-                        if self.save_portfolio_fn:
-                            self.save_portfolio_fn(self.portfolio)
+                        # Determine exit parameters
+                        if action == "SELL_PARTIAL":
+                            # Partial TP - sell portion and keep rest
+                            partial_qty = exit_result.get("quantity", position.get("quantity", 0) * 0.5)
                         
-                        self.register_trade_result(pnl)
-                        logger.info(f"💰 PARTIAL TP: {symbol} | Sold {partial_qty:.6f} | PnL: ${pnl:.2f}")
+                            logger.info("🐕 Watchdog: %s PARTIAL TP tetiklendi! ($%.4f) - %s", symbol, current_price, reason)
                         
-                        # Telegram notification
-                        if self.telegram_fn and bot_token and chat_id:
-                            profit_pct = ((current_price - entry_price) / entry_price * 100) if entry_price else 0
-                            total_value = self._calculate_total_portfolio_value()
-                            mesaj = (
-                                f"💰 <b>PARTIAL TP ({entry_type})</b>\n\n"
-                                f"<b>Coin:</b> {symbol}/USDT\n"
-                                f"<b>Giriş:</b> ${entry_price:.4f}\n"
-                                f"<b>Çıkış:</b> ${current_price:.4f}\n"
-                                f"<b>Kâr:</b> +{profit_pct:.1f}%\n"
-                                f"<b>Satılan:</b> {partial_qty:.6f}\n"
-                                f"<b>PnL:</b> ${pnl:.2f}\n\n"
-                                f"<i>Stop breakeven'a taşındı</i>\n"
-                                f"<b>💰 Toplam Portföy:</b> ${total_value:,.2f}"
+                            success, pnl, closed_trade = self._close_position(
+                                position_id, current_price, "PARTIAL_TP", partial_qty=partial_qty
                             )
-                            try:
-                                await self.telegram_fn(bot_token, chat_id, mesaj)
-                            except Exception as e:
-                                logger.error(f"Telegram hatası: {e}")
-                
-                elif action == "SELL":
-                    # Full position close
-                    quantity = exit_result.get("quantity", position.get("quantity", 0))
-                    
-                    # Determine emoji and log message based on reason
-                    if "stop" in reason.lower():
-                        log_emoji = "🛑"
-                        log_msg = "STOP LOSS"
-                        close_reason = "SL"
-                    elif "trailing" in reason.lower():
-                        log_emoji = "🔻"
-                        log_msg = "TRAILING STOP"
-                        close_reason = "TRAIL_SL"
-                    elif "target" in reason.lower():
-                        log_emoji = "💰"
-                        log_msg = "TAKE PROFIT"
-                        close_reason = "TP"
-                    elif "time" in reason.lower():
-                        log_emoji = "⏰"
-                        log_msg = "TIME EXIT"
-                        close_reason = "TIME"
-                    else:
-                        log_emoji = "📤"
-                        log_msg = "EXIT"
-                        close_reason = "V2_EXIT"
-                    
-                    logger.info(f"🐕 Watchdog: {symbol} {log_msg} tetiklendi! (${current_price:.4f}) - {reason}")
                     
-                    success, pnl, closed_trade = self.execution_manager.close_position(
-                        position_id, current_price, close_reason
-                    )
+                            if success:
+                                # Mark partial TP as taken in the remaining position
+                                # Find the updated position in portfolio
+                                # close_position kısmi satışta aynı dict'i yerinde günceller;
+                                # id ile listeyi taramak yerine elimizdeki referansı kullan
+                                position["partial_tp_hit"] = True
+                                position["partial_taken"] = True
+                                # Move stop to breakeven after partial
+                                if entry_price > 0:
+                                    position["current_sl"] = entry_price
+                                    logger.info("[%s] Stop moved to breakeven: $%.2f", symbol, entry_price)
+                            
+                                self._schedule_save()
+                            
+                                self.register_trade_result(pnl)
+                                logger.info("💰 PARTIAL TP: %s | Sold %.6f | PnL: $%.2f", symbol, partial_qty, pnl)
+                            
+                                # Telegram notification
+                                if self._tg_enabled:
+                                    profit_pct = ((current_price - entry_price) / entry_price * 100) if entry_price else 0
+                                    total_value = self._calculate_total_portfolio_value()
+                                    mesaj = (
+                                        f"💰 <b>PARTIAL TP ({entry_type})</b>\n\n"
+                                        f"<b>Coin:</b> {symbol}/USDT\n"
+                                        f"<b>Giriş:</b> ${entry_price:.4f}\n"
+                                        f"<b>Çıkış:</b> ${current_price:.4f}\n"
+                                        f"<b>Kâr:</b> +{profit_pct:.1f}%\n"
+                                        f"<b>Satılan:</b> {partial_qty:.6f}\n"
+                                        f"<b>PnL:</b> ${pnl:.2f}\n\n"
+                                        f"<i>Stop breakeven'a taşındı</i>\n"
+                                        f"<b>💰 Toplam Portföy:</b> ${total_value:,.2f}"
+                                    )
+                                    self._enqueue_telegram(mesaj)
                     
-                    if success:
-                        self.register_trade_result(pnl)
-                        logger.info(f"{log_emoji} {log_msg}: {symbol} kapatıldı | PnL: ${pnl:.2f}")
+                        elif action == "SELL":
+                            # Full position close
+                            quantity = exit_result.get("quantity", position.get("quantity", 0))
                         
-                        # Telegram notification
-                        if self.telegram_fn and bot_token and chat_id:
-                            total_value = self._calculate_total_portfolio_value()
-                            mesaj = (
-                                f"{log_emoji} <b>{log_msg} ({entry_type})</b>\n\n"
-                                f"<b>Coin:</b> {symbol}/USDT\n"
-                                f"<b>Giriş:</b> ${entry_price:.4f}\n"
-                                f"<b>Çıkış:</b> ${current_price:.4f}\n"
-                                f"<b>PnL:</b> ${pnl:.2f} ({closed_trade.get('profit_pct', 0):.1f}%)\n\n"
-                                f"<i>{reason}</i>\n\n"
-                                f"<b>💰 Toplam Portföy:</b> ${total_value:,.2f}"
+                            # Determine emoji and log message based on reason
+                            if "stop" in reason.lower():
+                                log_emoji = "🛑"
+                                log_msg = "STOP LOSS"
+                                close_reason = "SL"
+                            elif "trailing" in reason.lower():
+                                log_emoji = "🔻"
+                                log_msg = "TRAILING STOP"
+                                close_reason = "TRAIL_SL"
+                            elif "target" in reason.lower():
+                                log_emoji = "💰"
+                                log_msg = "TAKE PROFIT"
+                                close_reason = "TP"
+                            elif "time" in reason.lower():
+                                log_emoji = "⏰"
+                                log_msg = "TIME EXIT"
+                                close_reason = "TIME"
+                            else:
+                                log_emoji = "📤"
+                                log_msg = "EXIT"
+                                close_reason = "V2_EXIT"
+                        
+                            logger.info("🐕 Watchdog: %s %s tetiklendi! ($%.4f) - %s", symbol, log_msg, current_price, reason)
+                        
+                            success, pnl, closed_trade = self._close_position(
+                                position_id, current_price, close_reason
                             )
-                            try:
-                                await self.telegram_fn(bot_token, chat_id, mesaj)
-                            except Exception as e:
-                                logger.error(f"Telegram hatası: {e}")
                         
-                        # Live trading - same retry logic
-                        if live_trading_enabled and self.executor:
-                            max_retries = getattr(SETTINGS, 'LIVE_ORDER_MAX_RETRIES', 3)
-                            retry_delay = getattr(SETTINGS, 'LIVE_ORDER_RETRY_DELAY', 2.0)
-                            
-                            for attempt in range(max_retries):
-                                try:
-                                    live_order = await self.executor.create_order(
-                                        symbol=f"{symbol}USDT",
-                                        side="SELL",
-                                        quantity=quantity,
-                                        order_type="MARKET"
-                                    )
-                                    logger.info(f"🔴 CANLI {close_reason} SATIŞ: {symbol} OrderId={live_order.get('orderId')}")
-                                    
-                                    if self.portfolio.get("history"):
-                                        self.portfolio["history"][-1]["live_sell_order_id"] = live_order.get("orderId")
-                                        self.portfolio["history"][-1]["live_sell_status"] = "FILLED"
-                                        if self.save_portfolio_fn:
-                                            self.save_portfolio_fn(self.portfolio)
-                                    break
-                                except Exception as e:
-                                    if attempt < max_retries - 1:
-                                        logger.warning(f"⚠️ CANLI {close_reason} DENEME {attempt + 1}/{max_retries} BAŞARISIZ: {e}")
-                                        await asyncio.sleep(retry_delay)
-                                    else:
-                                        logger.error(f"❌ CANLI {close_reason} TÜM DENEMELER BAŞARISIZ: {symbol} - {e}")
-                                        if self.portfolio.get("history"):
-                                            self.portfolio["history"][-1]["live_sell_failed"] = True
-                                            self.portfolio["history"][-1]["live_sell_error"] = str(e)
-                                            if self.save_portfolio_fn:
-                                                self.save_portfolio_fn(self.portfolio)
+                            if success:
+                                live_sell = self._finalize_close(
+                                    symbol, position_id, pnl, closed_trade,
+                                    log_emoji=log_emoji, log_msg=log_msg, title_tag=entry_type,
+                                    close_reason=close_reason, entry_price=entry_price, exit_price=current_price,
+                                    note=reason, quantity=quantity, live_trading_enabled=live_trading_enabled
+                                )
+                                if live_sell:
+                                    live_sells.append(live_sell)
 
-            except Exception as e:
-                logger.error(f"[WATCHDOG] {symbol} işlem hatası: {e}")
-                continue  # Diğer pozisyonlara devam et
+                    except Exception as e:
+                        logger.error("[WATCHDOG] %s işlem hatası: %s", symbol, e)
+                        continue  # Diğer pozisyonlara devam et
+        finally:
+            # Canlı satışlar kilit dışında ve her durumda gönderilir; sonuçları
+            # kendi history kayıtlarına yazılır
+            await self._gather_bounded(live_sells)
+        # Sweep boyunca biriken değişiklikler tek yazımla diske
+        self.flush_pending_save()
+        self._record_latency("sweep", sweep_start)
 
     # ═══════════════════════════════════════════════════════════════════════════
     # HYBRID V2: Entry-Type Aware Exit Conditions
@@ -898,15 +1556,33 @@ class PositionManager:
         if not positions:
             return
         
-        partial_tp_enabled = getattr(SETTINGS, 'PARTIAL_TP_ENABLED', True)
-        partial_tp_fraction = getattr(SETTINGS, 'PARTIAL_TP_FRACTION', 0.5)
-        trailing_enabled = getattr(SETTINGS, 'TRAILING_ENABLED', True)
-        trail_atr_mult = getattr(SETTINGS, 'TRAIL_ATR_MULT', 3.0)
+        # V1 ayarları reload_settings() ile önceden çözümlendi
+        partial_tp_enabled = self._partial_tp_enabled
+        partial_tp_fraction = self._partial_tp_fraction
+        trailing_enabled = self._trailing_enabled
+        trail_atr_mult = self._trail_atr_mult
         
-        bot_token = self.telegram_config.get("bot_token")
-        chat_id = self.telegram_config.get("chat_id")
+        sweep_start = time.perf_counter()
+        # Tüm pozisyonlar için tek seferde fiyat al
+        try:
+            prices = await self._get_prices([p.get("symbol") for p in positions])
+        except Exception as e:
+            logger.warning("[WATCHDOG] Toplu fiyat alınamadı: %s", e)
+            return
         
-        for position in positions[:]:
+        # ATR sadece trailing'deki (partial alınmış) pozisyonlar için gerekli
+        trail_atrs = {}
+        if trailing_enabled:
+            trail_atrs = await self._get_trail_atrs(
+                {p.get("symbol") for p in positions if p.get("partial_taken", False)}
+            )
+        
+        # Tetik/trailing adayları toplu seçilir; close_position listeden silse de
+        # referanslar önceden alındığı için döngü etkilenmez
+        candidates = self._v1_watchdog_candidates(
+            positions, prices, trail_atrs, partial_tp_enabled, trailing_enabled
+        )
+        for position in [positions[i] for i in candidates]:
             symbol = position.get("symbol")
             position_id = position.get("id")
             entry_price = position.get("entry_price", 0)
@@ -919,19 +1595,12 @@ class PositionManager:
             partial_tp_price = position.get("partial_tp_price", 0)
             
             # Güncel fiyat ve ATR
-            current_price = self.market_data_engine.get_current_price(symbol)
+            current_price = prices.get(symbol)
             if not current_price:
                 continue
             
-            # Snapshot'tan ATR al (trailing için)
-            try:
-                snapshot = self.market_data_engine.build_snapshot(symbol)
-                tf_1h = snapshot.get("tf", {}).get("1h", {})
-                atr = tf_1h.get("atr", snapshot.get("technical", {}).get("atr", 0))
-                highest_close = tf_1h.get("highest_close_trail", current_price)
-            except:
-                atr = 0
-                highest_close = current_price
+            # Trailing için ATR (sweep başında toplu çekildi)
+            atr = trail_atrs.get(symbol, 0)
             
             # ─────────────────────────────────────────────────────────────────────
             # 1. SL Kontrolü
@@ -940,23 +1609,22 @@ class PositionManager:
                 # Standardized watchdog event log
                 exit_reason = ExitReason.TRAIL_STOP if partial_taken else ExitReason.STOP_LOSS
                 logger.info(
-                    f"[WATCHDOG] {symbol} | event=stop_triggered | "
-                    f"exit_reason={exit_reason} | price=${current_price:.4f} | "
-                    f"sl=${current_sl:.4f} | partial_taken={partial_taken}"
+                    "[WATCHDOG] %s | event=stop_triggered | exit_reason=%s | price=$%.4f | "
+                    "sl=$%.4f | partial_taken=%s",
+                    symbol, exit_reason, current_price, current_sl, partial_taken
                 )
                 
-                success, pnl, closed = self.execution_manager.close_position(
+                success, pnl, closed = self._close_position(
                     position_id, current_price, str(exit_reason)
                 )
                 
                 if success:
                     self.register_trade_result(pnl)
-                    logger.info(f"🛑 {exit_reason}: {symbol} kapatıldı | PnL: ${pnl:.2f}")
+                    logger.info("🛑 %s: %s kapatıldı | PnL: $%.2f", exit_reason, symbol, pnl)
                     
-                    if self.telegram_fn and bot_token and chat_id:
+                    if self._tg_enabled:
                         await self._send_close_notification(
-                            bot_token, chat_id, symbol, entry_price, 
-                            current_price, pnl, exit_reason
+                            symbol, entry_price, current_price, pnl, exit_reason
                         )
                 continue
             
@@ -964,9 +1632,8 @@ class PositionManager:
             # 2. Partial TP Kontrolü (1R)
             # ─────────────────────────────────────────────────────────────────────
             if partial_tp_enabled and not partial_taken and entry_price > 0 and initial_sl > 0:
-                # 1R hesapla
-                stop_distance = entry_price - initial_sl
-                one_r_price = entry_price + stop_distance
+                # 1R seviyesi açılışta hesaplanıp saklanır (eski pozisyonlar için fallback)
+                one_r_price = position.get("one_r_price") or (entry_price + (entry_price - initial_sl))
                 
                 if partial_tp_price <= 0:
                     partial_tp_price = one_r_price
@@ -977,36 +1644,33 @@ class PositionManager:
                     
                     # Standardized watchdog event log
                     logger.info(
-                        f"[WATCHDOG] {symbol} | event=partial_tp_triggered | "
-                        f"exit_reason={ExitReason.PARTIAL_TP} | price=${current_price:.4f} | "
-                        f"1R=${one_r_price:.4f} | sell_qty={sell_qty:.6f}"
+                        "[WATCHDOG] %s | event=partial_tp_triggered | exit_reason=%s | price=$%.4f | "
+                        "1R=$%.4f | sell_qty=%.6f",
+                        symbol, ExitReason.PARTIAL_TP, current_price, one_r_price, sell_qty
                     )
                     
                     # Kısmi satış yap
-                    success, pnl, _ = self.execution_manager.close_position(
+                    success, pnl, _ = self._close_position(
                         position_id, current_price, str(ExitReason.PARTIAL_TP),
                         partial_qty=sell_qty
                     )
                     
                     if success:
                         # Pozisyon güncelle - partial_taken=True
-                        for pos in self.portfolio.get("positions", []):
-                            if pos.get("id") == position_id:
-                                pos["partial_taken"] = True
-                                pos["partial_tp_price"] = one_r_price
-                                pos["quantity"] = remaining_qty
-                                pos["highest_close_since_entry"] = current_price
-                                break
+                        # Pozisyon dict'i listede yerinde duruyor, doğrudan güncelle
+                        position["partial_taken"] = True
+                        position["partial_tp_price"] = one_r_price
+                        position["quantity"] = remaining_qty
+                        position["highest_close_since_entry"] = current_price
                         
-                        if self.save_portfolio_fn:
-                            self.save_portfolio_fn(self.portfolio)
+                        self._schedule_save()
                         
                         logger.info(
-                            f"✅ Partial TP: {symbol} {sell_qty:.6f} satıldı @ ${current_price:.4f} | "
-                            f"Kalan: {remaining_qty:.6f}"
+                            "✅ Partial TP: %s %.6f satıldı @ $%.4f | Kalan: %.6f",
+                            symbol, sell_qty, current_price, remaining_qty
                         )
                         
-                        if self.telegram_fn and bot_token and chat_id:
+                        if self._tg_enabled:
                             mesaj = (
                                 f"📊 <b>PARTIAL TP (1R)</b>\n\n"
                                 f"<b>Coin:</b> {symbol}\n"
@@ -1015,10 +1679,7 @@ class PositionManager:
                                 f"<b>PnL:</b> ${pnl:.2f}\n\n"
                                 f"🔄 Trailing stop aktif edildi"
                             )
-                            try:
-                                await self.telegram_fn(bot_token, chat_id, mesaj)
-                            except Exception as e:
-                                logger.error(f"Telegram hatası: {e}")
+                            self._enqueue_telegram(mesaj)
                     continue
             
             # ─────────────────────────────────────────────────────────────────────
@@ -1039,26 +1700,23 @@ class PositionManager:
                     
                     # Standardized watchdog event log
                     logger.info(
-                        f"[WATCHDOG] {symbol} | event=trailing_updated | "
-                        f"old_sl=${old_sl:.4f} | new_sl=${new_trail_sl:.4f} | "
-                        f"highest_close=${highest_close_saved:.4f} | atr=${atr:.4f}"
+                        "[WATCHDOG] %s | event=trailing_updated | old_sl=$%.4f | new_sl=$%.4f | "
+                        "highest_close=$%.4f | atr=$%.4f",
+                        symbol, old_sl, new_trail_sl, highest_close_saved, atr
                     )
                     
                     # Pozisyon güncelle
-                    for pos in self.portfolio.get("positions", []):
-                        if pos.get("id") == position_id:
-                            pos["current_sl"] = new_trail_sl
-                            pos["highest_close_since_entry"] = highest_close_saved
-                            pos["last_trailing_update_ts"] = int(time.time())
-                            break
+                    position["current_sl"] = new_trail_sl
+                    position["highest_close_since_entry"] = highest_close_saved
+                    position["last_trailing_update_ts"] = int(time.time())
                     
-                    if self.save_portfolio_fn:
-                        self.save_portfolio_fn(self.portfolio)
+                    self._schedule_save()
+        
+        # Sweep boyunca biriken değişiklikler tek yazımla diske
+        self.flush_pending_save()
+        self._record_latency("sweep", sweep_start)
     
-    async def _send_close_notification(
-        self, bot_token, chat_id, symbol, entry_price, 
-        exit_price, pnl, reason
-    ):
+    async def _send_close_notification(self, symbol, entry_price, exit_price, pnl, reason):
         """Telegram kapatma bildirimi gönder."""
         profit_pct = ((exit_price / entry_price) - 1) * 100 if entry_price else 0
         emoji = "💰" if pnl > 0 else "🛑"
@@ -1073,10 +1731,7 @@ class PositionManager:
             f"💰 Toplam Portföy: ${total_value:,.2f}"
         )
         
-        try:
-            await self.telegram_fn(bot_token, chat_id, mesaj)
-        except Exception as e:
-            logger.error(f"Telegram hatası: {e}")
+        self._enqueue_telegram(mesaj)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1110,6 +1765,9 @@ async def demo():
     class MockMDE:
         def get_current_price(self, symbol):
             return 102.0  # Mevcut fiyat
+        
+        async def get_current_prices(self, symbols, max_age=None):
+            return {symbol: 102.0 for symbol in symbols}
     
     # Mock execution manager
     class MockEM:
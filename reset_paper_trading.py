@@ -21,6 +21,8 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+from utils.io import write_atomic_json
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -59,6 +61,14 @@ RESET_FILES = {
     }
 }
 
+# Binary state files to delete (recreated on next start)
+DELETE_FILES = [
+    "history.jsonl",
+    "data/order_ledger.db",
+    "data/order_ledger.db-wal",
+    "data/order_ledger.db-shm"
+]
+
 # Optional log files to clear (only with --all flag)
 LOG_PATTERNS = [
     "logs/trader.log",
@@ -66,6 +76,11 @@ LOG_PATTERNS = [
     "logs/diagnostics_*.json"
 ]
 
+# CLI flag'leri ve onay cevapları
+_FORCE_FLAGS = frozenset(("--force", "-f"))
+_ALL_FLAGS = frozenset(("--all", "-a"))
+_YES_ANSWERS = frozenset(("y", "yes"))
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -77,10 +92,14 @@ def reset_file(relative_path: str, default_content: dict) -> bool:
     # Create directory if needed
     file_path.parent.mkdir(parents=True, exist_ok=True)
     
+    # Write default content (orjson varsa onunla, atomik)
+    if write_atomic_json(str(file_path), default_content):
+        print(f"  ✅ Reset: {relative_path}")
+        return True
+    
     try:
-        # Write default content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(default_content, f, indent=2, ensure_ascii=False)
+        # Fallback: düz yazım (tek write çağrısı)
+        file_path.write_bytes(json.dumps(default_content, indent=2, ensure_ascii=False).encode("utf-8"))
         
         print(f"  ✅ Reset: {relative_path}")
         return True
@@ -90,19 +109,31 @@ def reset_file(relative_path: str, default_content: dict) -> bool:
 
 def clear_log_files() -> int:
     """Clear all log files. Returns count of files deleted."""
-    import glob
+    from fnmatch import fnmatch
     
     deleted = 0
     
+    # Desenleri dizine göre grupla: her dizin tek scandir geçişiyle taranır
+    patterns_by_dir = {}
     for pattern in LOG_PATTERNS:
-        full_pattern = str(BASE_DIR / pattern)
-        for file_path in glob.glob(full_pattern):
-            try:
-                os.remove(file_path)
-                print(f"  🗑️ Deleted: {os.path.basename(file_path)}")
-                deleted += 1
-            except Exception as e:
-                print(f"  ⚠️ Could not delete {file_path}: {e}")
+        directory, name_pattern = os.path.split(pattern)
+        patterns_by_dir.setdefault(directory, []).append(name_pattern)
+    
+    for directory, name_patterns in patterns_by_dir.items():
+        try:
+            with os.scandir(BASE_DIR / directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or not any(fnmatch(entry.name, p) for p in name_patterns):
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                        print(f"  🗑️ Deleted: {entry.name}")
+                        deleted += 1
+                    except OSError as e:
+                        print(f"  ⚠️ Could not delete {entry.path}: {e}")
+        except FileNotFoundError:
+            # Dizin yoksa silinecek log da yok
+            continue
     
     # Create empty trader.log
     trader_log = BASE_DIR / "logs" / "trader.log"
@@ -133,8 +164,9 @@ def get_current_state() -> dict:
 def main():
     import sys
     
-    force_mode = "--force" in sys.argv or "-f" in sys.argv
-    clear_logs = "--all" in sys.argv or "-a" in sys.argv
+    args = set(sys.argv[1:])
+    force_mode = not args.isdisjoint(_FORCE_FLAGS)
+    clear_logs = not args.isdisjoint(_ALL_FLAGS)
     custom_balance = None
     
     # Check for custom balance
@@ -155,7 +187,7 @@ def main():
         print(f"\n📊 Current State:")
         print(f"   Balance: ${current.get('balance', 0):.2f}")
         print(f"   Open Positions: {len(current.get('positions', []))}")
-        print(f"   Trade History: {len(current.get('history', []))} trades")
+        print(f"   Trade History: {len(current.get('history', [])) + current.get('history_archived', 0)} trades")
     
     # Show what will be reset
     starting_balance = custom_balance or DEFAULT_STARTING_BALANCE
@@ -169,7 +201,7 @@ def main():
     if not force_mode:
         print("\n" + "-" * 60)
         response = input("⚠️ This will DELETE all trading data. Continue? (y/N): ").strip().lower()
-        if response not in ['y', 'yes']:
+        if response not in _YES_ANSWERS:
             print("❌ Cancelled.")
             return
     
@@ -187,6 +219,15 @@ def main():
         if reset_file(file_path, default_content):
             success_count += 1
     
+    for relative_path in DELETE_FILES:
+        file_path = BASE_DIR / relative_path
+        if file_path.exists():
+            try:
+                file_path.unlink()
+                print(f"  🗑️ Deleted: {relative_path}")
+            except Exception as e:
+                print(f"  ⚠️ Could not delete {relative_path}: {e}")
+    
     # Clear logs if requested
     if clear_logs:
         print("\n" + "-" * 60)
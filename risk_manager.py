@@ -6,10 +6,21 @@ Bu modül tüm risk yönetimi, pozisyon büyüklüğü hesaplama ve güvenlik ko
 StrategyEngine sadece sinyal üretir (BUY/SELL/HOLD), RiskManager bu sinyali doğrular ve parametreleri (Miktar, SL/TP) belirler.
 """
 
-from typing import Dict, Any, Optional
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from config import SETTINGS
 
+# NumPy import (çok sembollü batch SL/TP ve miktar hesabı için - opsiyonel)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 # Logger import
 try:
     from trade_logger import logger
@@ -18,6 +29,54 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
 
+# Güçlü olduğunda alımı engelleyen trend değerleri
+_BEARISH_TRENDS = frozenset(("BEARISH", "NEUTRAL_BEARISH"))
+
+# Eksik snapshot bölümleri için paylaşılan salt okunur boş mapping
+# (her çağrıda `{}` default'u oluşturmamak için)
+_EMPTY = MappingProxyType({})
+
+# SL/TP bias çarpanları ("tighter" %25 daha sıkı, "looser" %25 daha geniş)
+_BIAS_MULTIPLIERS = {"tighter": 0.75, "looser": 1.25, "neutral": 1.0}
+
+
+def _kelly_fraction(returns) -> float:
+    """
+    İşlem getirilerinden (kesir, örn. 0.02 = %2) tam Kelly payı.
+    
+    k = p - (1 - p) / b; p = kazanma oranı, b = ort. kazanç / ort. kayıp.
+    Kazanç veya kayıp hiç yoksa ya da avantaj negatifse 0 döner.
+    """
+    if NUMPY_AVAILABLE:
+        r = np.asarray(returns, dtype=float)
+        r = r[np.isfinite(r)]
+        wins = r[r > 0]
+        losses = -r[r < 0]
+        if r.size == 0 or wins.size == 0 or losses.size == 0:
+            return 0.0
+        p = wins.size / r.size
+        b = wins.mean() / losses.mean()
+    else:
+        wins = [x for x in returns if x > 0]
+        losses = [-x for x in returns if x < 0]
+        if not wins or not losses:
+            return 0.0
+        p = len(wins) / len(returns)
+        b = (sum(wins) / len(wins)) / (sum(losses) / len(losses))
+    return max(0.0, float(p - (1 - p) / b))
+
+
+@dataclass(frozen=True, slots=True)
+class GuardResult:
+    """_check_guardrails sonucu (değiştirilemez, dict yerine slot'lu)."""
+    passed: bool
+    reason: str = ""
+    blocked_by: Optional[str] = None
+
+
+# Guardrail'lerden geçen değerlendirmelerin ortak sonucu
+_GUARDRAIL_OK = GuardResult(True, "OK")
+
 class RiskManager:
     """
     Risk yönetimi ve pozisyon boyutlandırma sınıfı.
@@ -28,6 +87,20 @@ class RiskManager:
     - V1 strateji modu için özel parametreler
     """
     
+    # Sabit öznitelik seti: __dict__ yerine slot erişimi (guardrail/sizing sıcak yolu)
+    __slots__ = (
+        "config",
+        "_min_adx", "_min_adx_soft", "_soften_adx_conf",
+        "_min_volume", "_min_volume_m", "_fng_extreme_fear",
+        "_risk_per_trade", "_initial_balance", "_strategy_mode",
+        "_risk_per_trade_v1", "_target_atr_pct", "_min_vol_scale", "_max_vol_scale",
+        "_max_consecutive_stops", "_consecutive_stops_cooldown",
+        "_consecutive_stop_count", "_last_stop_time", "_in_cooldown",
+        "_cooldown_end_time", "_cooldown_end_monotonic",
+        "_kelly_enabled", "_kelly_multiplier", "_kelly_window", "_kelly_min_trades",
+        "_kelly_min_risk_fraction", "_kelly_no_history_warned",
+    )
+    
     def __init__(
         self,
         config: Dict[str, Any] = None,
@@ -42,7 +115,11 @@ class RiskManager:
         # Use config or fall back to SETTINGS
         self._min_adx = self.config.get("min_adx") or SETTINGS.MIN_ADX_ENTRY
         self._min_volume = self.config.get("min_volume") or getattr(SETTINGS, 'MIN_VOLUME_GUARDRAIL', 1_000_000)
+        self._min_volume_m = self._min_volume / 1_000_000  # Log/mesajlar için $M cinsinden
         self._fng_extreme_fear = self.config.get("fng_extreme_fear") or getattr(SETTINGS, 'FNG_EXTREME_FEAR', 20)
+        # ADX yumuşatma eşikleri (her BUY değerlendirmesinde SETTINGS'e gitmemek için)
+        self._soften_adx_conf = SETTINGS.SOFTEN_ADX_WHEN_CONF_GE
+        self._min_adx_soft = SETTINGS.MIN_ADX_ENTRY_SOFT
         self._risk_per_trade = self.config.get("risk_per_trade") or getattr(SETTINGS, 'RISK_PER_TRADE', 0.02)
         self._initial_balance = initial_balance
         
@@ -53,16 +130,25 @@ class RiskManager:
         self._min_vol_scale = getattr(SETTINGS, 'MIN_VOL_SCALE', 0.5)
         self._max_vol_scale = getattr(SETTINGS, 'MAX_VOL_SCALE', 1.5)
         
+        # Kelly boyutlandırma (opsiyonel)
+        self._kelly_enabled = getattr(SETTINGS, 'KELLY_SIZING_ENABLED', False)
+        self._kelly_multiplier = getattr(SETTINGS, 'KELLY_FRACTION', 0.5)
+        self._kelly_window = getattr(SETTINGS, 'KELLY_WINDOW', 50)
+        self._kelly_min_trades = getattr(SETTINGS, 'KELLY_MIN_TRADES', 20)
+        self._kelly_min_risk_fraction = getattr(SETTINGS, 'KELLY_MIN_RISK_FRACTION', 0.25)
+        self._kelly_no_history_warned = False
+        
         # Ardışık stop takibi
         self._max_consecutive_stops = getattr(SETTINGS, 'MAX_CONSECUTIVE_STOPS', 3)
         self._consecutive_stops_cooldown = getattr(SETTINGS, 'CONSECUTIVE_STOPS_EXTRA_COOLDOWN', 30)
         self._consecutive_stop_count = 0
         self._last_stop_time = None
         self._in_cooldown = False
-        self._cooldown_end_time = None
+        self._cooldown_end_time = None       # Duvar saati (sadece log/gösterim)
+        self._cooldown_end_monotonic = 0.0   # Cooldown kontrolü (NTP sıçramalarından etkilenmez)
         
         logger.debug(
-            f"RiskManager başlatıldı: ADX={self._min_adx}, Volume=${self._min_volume/1e6:.1f}M, "
+            f"RiskManager başlatıldı: ADX={self._min_adx}, Volume=${self._min_volume_m:.1f}M, "
             f"Risk={self._risk_per_trade*100:.1f}%, Mode={self._strategy_mode}"
         )
 
@@ -75,34 +161,103 @@ class RiskManager:
         """
         Giriş (BUY) sinyalini risk kurallarına göre değerlendirir ve tamamlar.
         """
-        result = base_decision.copy()
-        result.setdefault("metadata", {})
-        
-        # 1. Base Decision Check
-        if base_decision.get("action") != "BUY":
-            result["allowed"] = False
-            result["reason"] = f"Base signal not BUY ({base_decision.get('action')})"
+        result, sizing = self._screen_entry(snapshot, base_decision)
+        if sizing is None:
             return result
+        
+        # 3. Calculate SL/TP
+        price, atr, sl_bias, tp_bias = sizing
+        sl_tp = self._calculate_sl_tp(price, atr, sl_bias=sl_bias, tp_bias=tp_bias)
+        
+        # 4. Calculate Quantity
+        quantity = self._calculate_quantity(
+            portfolio.get("balance", 0), price, sl_tp["stop_loss"],
+            risk_pct=self._kelly_risk_pct(portfolio)
+        )
+        return self._finish_entry(result, sl_tp["stop_loss"], sl_tp["take_profit"], quantity)
+
+    def evaluate_entry_risk_batch(
+        self,
+        snapshots: List[Dict[str, Any]],
+        base_decisions: List[Dict[str, Any]],
+        portfolio: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Çok sembol için evaluate_entry_risk'in toplu hali (aynı portföy).
+        
+        Guardrail'ler sembol başına skaler kontrol edilir (red sebepleri
+        birebir aynı kalır); geçen BUY'lar için SL/TP ve miktar tek
+        calculate_sl_tp_batch / calculate_quantity_batch çağrısıyla hesaplanır.
+        Kelly riski taramada bir kez okunur.
+        
+        Returns:
+            snapshots sırasıyla evaluate_entry_risk ile aynı yapıda sonuçlar
+        """
+        results = []
+        pending = []  # (index, price, atr, sl_bias, tp_bias)
+        for snapshot, base_decision in zip(snapshots, base_decisions):
+            result, sizing = self._screen_entry(snapshot, base_decision)
+            if sizing is not None:
+                pending.append((len(results), *sizing))
+            results.append(result)
+        
+        if not pending:
+            return results
+        
+        _, prices, atrs, sl_biases, tp_biases = zip(*pending)
+        stop_losses, take_profits = self.calculate_sl_tp_batch(prices, atrs, sl_biases, tp_biases)
+        quantities = self.calculate_quantity_batch(
+            portfolio.get("balance", 0), prices, stop_losses,
+            risk_pct=self._kelly_risk_pct(portfolio)
+        )
+        for (index, *_), sl, tp, qty in zip(pending, stop_losses, take_profits, quantities):
+            results[index] = self._finish_entry(results[index], sl, tp, qty)
+        return results
+
+    def _screen_entry(
+        self,
+        snapshot: Dict[str, Any],
+        base_decision: Dict[str, Any]
+    ) -> tuple:
+        """
+        Boyutlandırma öncesi giriş kontrolleri (sinyal, guardrail, fiyat).
+        
+        Returns:
+            (result, sizing): reddedilirse sizing None ve result nihai karardır;
+            geçerse sizing = (price, atr, sl_bias, tp_bias)
+        """
+        # 1. Base Decision Check (taramadaki sinyallerin çoğu HOLD: tek dict ile dön)
+        action = base_decision.get("action")
+        if action != "BUY":
+            return {
+                **base_decision,
+                "allowed": False,
+                "reason": f"Base signal not BUY ({action})",
+                "metadata": base_decision.get("metadata", {}),
+            }, None
+        
+        # Tek dict kuruluşu; metadata'ya yazılacağı için kopyalanır (çağıranın
+        # base_decision["metadata"]'sı guardrails_passed/bias ile kirlenmesin)
+        result = {**base_decision, "metadata": dict(base_decision.get("metadata") or _EMPTY)}
 
         # 2. Guardrails Check
         confidence = base_decision.get("confidence", 0)
         guardrails = self._check_guardrails(snapshot, confidence=confidence)
         
-        if not guardrails["passed"]:
+        if not guardrails.passed:
             result["allowed"] = False
             result["action"] = "HOLD"
-            result["reason"] = f"Risk Guardrail: {guardrails['reason']}"
-            return result
+            result["reason"] = f"Risk Guardrail: {guardrails.reason}"
+            return result, None
         
         result["metadata"]["guardrails_passed"] = True
         
-        # 3. Calculate SL/TP
-        technical = snapshot.get("technical", {})
+        technical = snapshot.get("technical") or _EMPTY
         price = snapshot.get("price") or technical.get("price")
         if not price:
             result["allowed"] = False
             result["reason"] = "No price data for sizing"
-            return result
+            return result, None
             
         atr = technical.get("atr", 0)
         
@@ -110,17 +265,20 @@ class RiskManager:
         metadata = base_decision.get("metadata", {})
         sl_bias = metadata.get("sl_bias", "neutral")
         tp_bias = metadata.get("tp_bias", "neutral")
-        
-        sl_tp = self._calculate_sl_tp(price, atr, sl_bias=sl_bias, tp_bias=tp_bias)
-        result["stop_loss"] = sl_tp["stop_loss"]
-        result["take_profit"] = sl_tp["take_profit"]
         result["metadata"]["sl_bias"] = sl_bias
         result["metadata"]["tp_bias"] = tp_bias
-        
-        # 4. Calculate Quantity
-        balance = portfolio.get("balance", 0)
-        
-        quantity = self._calculate_quantity(balance, price, result["stop_loss"])
+        return result, (price, atr, sl_bias, tp_bias)
+
+    @staticmethod
+    def _finish_entry(
+        result: Dict[str, Any],
+        stop_loss: float,
+        take_profit: float,
+        quantity: float
+    ) -> Dict[str, Any]:
+        """Hesaplanan SL/TP ve miktarı sonuca yazar; miktar 0 ise HOLD'a çevirir."""
+        result["stop_loss"] = stop_loss
+        result["take_profit"] = take_profit
         
         if quantity <= 0:
             result["allowed"] = False
@@ -144,16 +302,13 @@ class RiskManager:
         
         Output: "allowed", "action", "reason", "quantity"
         """
-        result = base_decision.copy()
-        result.setdefault("metadata", {})
-        
-        current_price = snapshot.get("price")
-        
         # 1. Hard Logic Checks (Pos SL/TP) - Bunlar StrategyEngine'de de olabilir ama
         # RiskManager bunları kesinleştirmeli.
         # StrategyEngine zaten "SL tetiklendi" diyorsa burada onaylarız.
         
         if base_decision.get("action") == "SELL":
+            result = base_decision.copy()
+            result.setdefault("metadata", {})
             result["allowed"] = True
             
             # Miktar kontrolü (Strategy engine genelde hepsini sat der)
@@ -172,30 +327,29 @@ class RiskManager:
         # Olağanüstü durumlar için buraya ek kural konabilir (örn. %50 ani düşüş).
         # Şimdilik StrategyEngine kararına uyuyoruz.
         
-        result["allowed"] = False
-        return result
+        return {**base_decision, "allowed": False, "metadata": base_decision.get("metadata", {})}
 
-    def _check_guardrails(self, snapshot: Dict[str, Any], confidence: int = 0) -> Dict[str, Any]:
+    def _check_guardrails(self, snapshot: Dict[str, Any], confidence: int = 0) -> GuardResult:
         """Güvenlik kontrolleri (StrategyEngine'den taşındı)."""
-        technical = snapshot.get("technical", {})
-        sentiment = snapshot.get("sentiment", {})
+        technical = snapshot.get("technical") or _EMPTY
+        sentiment = snapshot.get("sentiment") or _EMPTY
         
         # 1. Trend check (Düşüş trendinde alım yapma)
         trend = technical.get("trend", "NEUTRAL")
-        if trend in ["BEARISH", "NEUTRAL_BEARISH"]:
+        if trend in _BEARISH_TRENDS:
             if technical.get("trend_strength") == "STRONG":
-                return {"passed": False, "reason": f"Strong downtrend ({trend})"}
+                return GuardResult(False, f"Strong downtrend ({trend})")
         
         # 2. ADX check with Softening
         adx = technical.get("adx")
         threshold = self._min_adx
         
         # Optional softening if confidence is high
-        if confidence >= SETTINGS.SOFTEN_ADX_WHEN_CONF_GE:
-             threshold = min(threshold, SETTINGS.MIN_ADX_ENTRY_SOFT)
+        if confidence >= self._soften_adx_conf:
+             threshold = min(threshold, self._min_adx_soft)
              
         if adx is not None and adx < threshold:
-            return {"passed": False, "reason": f"Low ADX ({adx:.1f} < {threshold})"}
+            return GuardResult(False, f"Low ADX ({adx:.1f} < {threshold})")
         
         # 3. Volume check
         # Volume is now at root of snapshot (USDT volume)
@@ -205,27 +359,17 @@ class RiskManager:
              volume = technical.get("volume_24h")
         
         # If volume data is missing or non-positive, DO NOT enforce volume guardrail.
-        if volume is None or volume <= 0:
-             # from trade_logger import logger # risk_manager doesn't have logger by default?
-             # Assuming we prefer silent skip or print. We can just pass.
-             pass 
-        else:
-            if volume < self._min_volume:
-                vol_m = volume / 1_000_000
-                min_m = self._min_volume / 1_000_000
-                return {
-                    "passed": False, 
-                    "reason": f"Low Volume: ${vol_m:.1f}M < ${min_m:.1f}M",
-                    "blocked_by": "volume"
-                }
+        if volume is not None and 0 < volume < self._min_volume:
+            return GuardResult(
+                False, f"Low Volume: ${volume / 1_000_000:.1f}M < ${self._min_volume_m:.1f}M", blocked_by="volume"
+            )
         
         # 4. Fear & Greed check (Extreme Fear'da alma)
-        fng = sentiment.get("fear_greed", {})
-        fng_value = fng.get("value")
+        fng_value = (sentiment.get("fear_greed") or _EMPTY).get("value")
         if fng_value is not None and fng_value <= self._fng_extreme_fear:
-             return {"passed": False, "reason": f"Extreme Fear ({fng_value})"}
+             return GuardResult(False, f"Extreme Fear ({fng_value})")
              
-        return {"passed": True, "reason": "OK"}
+        return _GUARDRAIL_OK
 
     def _calculate_sl_tp(
         self,
@@ -248,15 +392,8 @@ class RiskManager:
             - looser: Mesafeyi %25 artırır (daha geniş)
             - neutral: Varsayılan değer (değişiklik yok)
         """
-        # Bias multipliers
-        bias_map = {
-            "tighter": 0.75,  # %25 daha sıkı
-            "looser": 1.25,   # %25 daha geniş
-            "neutral": 1.0
-        }
-        
-        sl_mult = bias_map.get(sl_bias, 1.0)
-        tp_mult = bias_map.get(tp_bias, 1.0)
+        sl_mult = _BIAS_MULTIPLIERS.get(sl_bias, 1.0)
+        tp_mult = _BIAS_MULTIPLIERS.get(tp_bias, 1.0)
         
         if not atr or atr <= 0:
             # Fallback: %3 SL, %5 TP (bias uygulanır)
@@ -281,7 +418,8 @@ class RiskManager:
         balance: float,
         price: float,
         stop_loss: float,
-        atr: float = None
+        atr: float = None,
+        risk_pct: float = None
     ) -> float:
         """
         Risk tabanlı pozisyon boyutu.
@@ -290,15 +428,18 @@ class RiskManager:
         - atr_pct = atr / price * 100
         - vol_scale = clamp(TARGET_ATR_PCT / atr_pct, MIN_VOL_SCALE, MAX_VOL_SCALE)
         - qty *= vol_scale
+        
+        risk_pct verilirse (örn. Kelly ile kısılmış) mod bazlı sabit riskin yerine kullanılır.
         """
         if balance <= 0:
             return 0.0
         
         # V1 modunda risk yüzdesini kullan
-        if self._strategy_mode == "REGIME_SWING_TREND_V1":
-            risk_pct = self._risk_per_trade_v1
-        else:
-            risk_pct = self._risk_per_trade
+        if risk_pct is None:
+            if self._strategy_mode == "REGIME_SWING_TREND_V1":
+                risk_pct = self._risk_per_trade_v1
+            else:
+                risk_pct = self._risk_per_trade
 
         if not stop_loss or stop_loss >= price:
             # Fallback: bakiyenin risk%'si
@@ -334,6 +475,140 @@ class RiskManager:
         # Fallback
         return round((balance * risk_pct) / price, 6)
     
+    def _kelly_risk_pct(self, portfolio: Dict[str, Any]) -> Optional[float]:
+        """
+        KELLY_SIZING_ENABLED ise son işlemlerden kesirli Kelly ile kısılmış risk yüzdesi.
+        
+        Sonuç mod bazlı sabit risk ile sınırlıdır (Kelly riski artırmaz, sadece
+        avantaj zayıfken azaltır). Avantaj <= 0 olsa da risk KELLY_MIN_RISK_FRACTION
+        tabanının altına inmez: 0 risk her BUY'ı HOLD'a çevirir, yeni işlem
+        kapanmadığı için pencere hiç değişmez ve bot kalıcı olarak kilitlenirdi.
+        Kapalıysa veya yeterli işlem yoksa None.
+        
+        portfolio["history"] (profit_pct içeren kapanmış işlemler) gerektirir;
+        backtest bunu geçer. Kelly açıkken history verilmezse bir kez uyarılır.
+        """
+        if not self._kelly_enabled:
+            return None
+        history = portfolio.get("history")
+        if history is None:
+            if not self._kelly_no_history_warned:
+                self._kelly_no_history_warned = True
+                logger.warning(
+                    "[KELLY] KELLY_SIZING_ENABLED=True ama portfolio['history'] verilmedi; "
+                    "sabit risk kullanılıyor"
+                )
+            return None
+        if len(history) < self._kelly_min_trades:
+            return None
+        
+        returns = [
+            (trade.get("profit_pct") or 0) / 100.0
+            for trade in history[-self._kelly_window:]
+        ]
+        base = self._risk_per_trade_v1 if self._strategy_mode == "REGIME_SWING_TREND_V1" else self._risk_per_trade
+        kelly = _kelly_fraction(returns) * self._kelly_multiplier
+        risk_pct = min(base, max(kelly, base * self._kelly_min_risk_fraction))
+        if risk_pct <= 0:
+            return None
+        logger.debug(f"[KELLY] k={kelly:.4f} ({len(returns)} işlem) -> risk={risk_pct:.4f}")
+        return risk_pct
+    
+    def calculate_sl_tp_batch(
+        self,
+        prices: list,
+        atrs: list,
+        sl_bias="neutral",
+        tp_bias="neutral"
+    ) -> tuple:
+        """
+        Çok sembol için _calculate_sl_tp'nin toplu hali.
+        
+        NumPy varsa tek vektör işlemiyle hesaplanır (100+ sembollük taramada
+        interpreter döngüsü yerine C döngüsü), yoksa skaler metoda düşer.
+        sl_bias/tp_bias tek bir değer (tüm semboller) ya da sembol başına
+        liste olabilir (LLM metadata'sından gelen bias'lar).
+        
+        Returns:
+            (stop_losses, take_profits): fiyat sırasıyla float listeleri
+        """
+        count = len(prices)
+        sl_biases = [sl_bias] * count if isinstance(sl_bias, str) else list(sl_bias)
+        tp_biases = [tp_bias] * count if isinstance(tp_bias, str) else list(tp_bias)
+        
+        if not NUMPY_AVAILABLE:
+            sl_tp = [
+                self._calculate_sl_tp(p, a, sb, tb)
+                for p, a, sb, tb in zip(prices, atrs, sl_biases, tp_biases)
+            ]
+            return [x["stop_loss"] for x in sl_tp], [x["take_profit"] for x in sl_tp]
+        
+        bias_get = _BIAS_MULTIPLIERS.get
+        sl_mult = np.fromiter((bias_get(b, 1.0) for b in sl_biases), float, count)
+        tp_mult = np.fromiter((bias_get(b, 1.0) for b in tp_biases), float, count)
+        px = np.asarray(prices, dtype=float)
+        atr = np.nan_to_num(np.asarray(atrs, dtype=float))
+        has_atr = atr > 0
+        # ATR yoksa %3 SL / %5 TP fallback (bias uygulanır)
+        sl = np.where(has_atr, px - 2 * atr * sl_mult, px * (1 - 0.03 * sl_mult))
+        tp = np.where(has_atr, px + 3 * atr * tp_mult, px * (1 + 0.05 * tp_mult))
+        return np.round(sl, 2).tolist(), np.round(tp, 2).tolist()
+    
+    def calculate_quantity_batch(
+        self,
+        balance: float,
+        prices: list,
+        stop_losses: list,
+        atrs: list = None,
+        risk_pct: float = None
+    ) -> list:
+        """
+        Çok sembol için _calculate_quantity'nin toplu hali (aynı bakiye).
+        
+        Geçersiz SL (yok veya fiyatın üstünde) için bakiye risk%'si fallback'i,
+        V1 modunda volatilite ölçeği ve %10 max cap skaler metotla aynıdır.
+        risk_pct verilirse (örn. Kelly) tüm semboller için o kullanılır.
+        
+        Returns:
+            Fiyat sırasıyla miktar listesi
+        """
+        if atrs is None:
+            atrs = [None] * len(prices)
+        if not NUMPY_AVAILABLE or balance <= 0:
+            return [
+                self._calculate_quantity(balance, p, sl, a, risk_pct=risk_pct)
+                for p, sl, a in zip(prices, stop_losses, atrs)
+            ]
+        
+        if risk_pct is None:
+            if self._strategy_mode == "REGIME_SWING_TREND_V1":
+                risk_pct = self._risk_per_trade_v1
+            else:
+                risk_pct = self._risk_per_trade
+        
+        px = np.asarray(prices, dtype=float)
+        sl = np.nan_to_num(np.asarray([x or 0 for x in stop_losses], dtype=float))
+        risk_amount = balance * risk_pct
+        valid = (sl != 0) & (sl < px)
+        
+        # Geçersiz satırlarda 1.0 bölen: sonuç np.where ile zaten atılıyor
+        risk_per_unit = np.where(valid, px - sl, 1.0)
+        quantity = risk_amount / risk_per_unit
+        
+        if self._strategy_mode == "REGIME_SWING_TREND_V1":
+            atr = np.nan_to_num(np.asarray([a or 0 for a in atrs], dtype=float))
+            atr_pct = atr / px * 100
+            scale = np.clip(
+                self._target_atr_pct / np.where(atr_pct > 0, atr_pct, 1.0),
+                self._min_vol_scale, self._max_vol_scale
+            )
+            quantity = np.where(atr_pct > 0, quantity * scale, quantity)
+        
+        # Max Cap: Bakiyenin %10'u
+        quantity = np.minimum(quantity, (balance * 0.10) / px)
+        quantity = np.where(valid, quantity, risk_amount / px)
+        return np.round(quantity, 6).tolist()
+    
     # ═══════════════════════════════════════════════════════════════════════════
     # V1: Ardışık Stop Yönetimi
     # ═══════════════════════════════════════════════════════════════════════════
@@ -346,10 +621,9 @@ class RiskManager:
             True: Cooldown başladı
             False: Cooldown başlamadı
         """
-        import time as t
         
         self._consecutive_stop_count += 1
-        self._last_stop_time = t.time()
+        self._last_stop_time = time.time()
         
         logger.info(
             f"[RISK] Stop #{ self._consecutive_stop_count} / {self._max_consecutive_stops}"
@@ -358,7 +632,9 @@ class RiskManager:
         if self._consecutive_stop_count >= self._max_consecutive_stops:
             self._in_cooldown = True
             cooldown_minutes = getattr(SETTINGS, 'COOLDOWN_MINUTES', 60) + self._consecutive_stops_cooldown
-            self._cooldown_end_time = t.time() + (cooldown_minutes * 60)
+            cooldown_sec = cooldown_minutes * 60
+            self._cooldown_end_time = self._last_stop_time + cooldown_sec
+            self._cooldown_end_monotonic = time.monotonic() + cooldown_sec
             logger.warning(
                 f"[RISK] ⚠️ MAX CONSECUTIVE STOPS reached! "
                 f"Cooldown for {cooldown_minutes} minutes"
@@ -380,18 +656,19 @@ class RiskManager:
         Returns:
             Tuple[bool, str]: (in_cooldown, reason)
         """
-        import time as t
         
         if not self._in_cooldown:
             return False, ""
         
-        if t.time() >= self._cooldown_end_time:
+        # Mesaj sadece cooldown aktifken (çağıran loglarken) formatlanır
+        remaining_sec = self._cooldown_end_monotonic - time.monotonic()
+        if remaining_sec <= 0:
             self._in_cooldown = False
             self._consecutive_stop_count = 0
             logger.info("[RISK] Cooldown ended, trading resumed")
             return False, ""
         
-        remaining = int((self._cooldown_end_time - t.time()) / 60)
+        remaining = int(remaining_sec / 60)
         return True, f"Cooldown active ({remaining} min remaining)"
     
     def get_consecutive_stops(self) -> int:
@@ -459,7 +736,7 @@ def demo():
     
     for tc in test_cases:
         result = rm._check_guardrails(tc["snapshot"])
-        status = "✅ PASSED" if result["passed"] else f"❌ BLOCKED: {result['reason']}"
+        status = "✅ PASSED" if result.passed else f"❌ BLOCKED: {result.reason}"
         print(f"   {tc['name']}: {status}")
     
     print("\n" + "-" * 60)
@@ -38,18 +38,25 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 from config import SETTINGS
+from utils.io import loads_json
 # llm_utils removed - inline implementations below
 
+# Markdown kod bloğu çitleri (modül yüklenirken bir kez derlenir)
+_FENCE_OPEN_RE = re.compile(r'^```(?:json)?\s*\n?')
+_FENCE_CLOSE_RE = re.compile(r'\n?```\s*$')
+
 def _safe_json_parse(text: str) -> Tuple[Optional[Any], Optional[str]]:
     """Simple JSON parser (llm_utils replacement)."""
     if not text:
         return None, "empty_input"
     text = text.strip()
-    # Remove markdown code fences
-    text = re.sub(r'^```(?:json)?\s*\n?', '', text)
-    text = re.sub(r'\n?```\s*$', '', text)
+    # Remove markdown code fences (çit yoksa regex hiç çalışmaz)
+    if text.startswith("```"):
+        text = _FENCE_OPEN_RE.sub('', text)
+    if text.endswith("```"):
+        text = _FENCE_CLOSE_RE.sub('', text)
     try:
-        return json.loads(text.strip()), None
+        return loads_json(text.strip()), None
     except json.JSONDecodeError as e:
         return None, f"json_error: {str(e)[:50]}"
 
@@ -116,6 +123,8 @@ except ImportError:
     GEMINI_AVAILABLE = False
     genai = None
 
+from utils.gemini import get_gemini_model
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONSTANTS & DEFAULTS
@@ -1087,14 +1096,7 @@ Reply ONLY JSON (NO markdown, NO text before/after):
             return None
         
         try:
-            genai.configure(api_key=self._gemini_key)
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
-            model = genai.GenerativeModel('models/gemini-2.5-flash', safety_settings=safety_settings)
+            model = get_gemini_model(self._gemini_key)
             
             # Metrics tracking
             self.llm_metrics["strategy_calls"] += 1
@@ -1139,7 +1141,7 @@ Reply ONLY JSON (NO markdown, NO text before/after):
                 if extracted:
                     try:
                         import json
-                        result = json.loads(extracted)
+                        result = loads_json(extracted)
                         parse_error = None
                         logger.debug(f"[LLM FALLBACK] Parsed via extract_json_block")
                     except json.JSONDecodeError as e:
@@ -1323,16 +1325,7 @@ Reply ONLY JSON (NO markdown, NO text before/after):
             return None
         
         try:
-            genai.configure(api_key=self._gemini_key)
-            
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
-            
-            model = genai.GenerativeModel('models/gemini-2.5-flash', safety_settings=safety_settings)
+            model = get_gemini_model(self._gemini_key)
             
             # Build compact prompt
             tech_summary = technical.get("summary", "Veri yok")
@@ -1389,7 +1382,7 @@ SADECE JSON yanıt ver:
                 # Extract JSON
                 match = re.search(r'\{[^}]+\}', text)
                 if match:
-                    return json.loads(match.group())
+                    return loads_json(match.group())
         
         except Exception as e:
             logger.error("[LLM STATUS] Gemini çağrısı başarısız oldu → FALLBACK tetiklendi.", exc_info=True)
@@ -1413,14 +1406,7 @@ SADECE JSON yanıt ver:
         if not self._enable_llm or not GEMINI_AVAILABLE:
             return None
         try:
-            genai.configure(api_key=self._gemini_key)
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
-            model = genai.GenerativeModel('models/gemini-2.5-flash', safety_settings=safety_settings)
+            model = get_gemini_model(self._gemini_key)
             
             # Get coin-specific news if available (from snapshot via news_summary)
             coin_news_str = ""
@@ -1506,8 +1492,7 @@ Evaluation:
                 logger.info(f"[LLM RETRY] Attempt {attempt + 1}/{max_attempts}")
             
             try:
-                genai.configure(api_key=self._gemini_key)
-                model = genai.GenerativeModel('models/gemini-2.5-flash')
+                model = get_gemini_model(self._gemini_key, safety=False)
                 
                 loop = asyncio.get_event_loop()
                 def sync_generate():
@@ -1580,8 +1565,7 @@ Examples:
 {{"decision": "BUY", "confidence": 82, "sl_bias": "tighter", "tp_bias": "looser", "reason": "Strong trend + bullish sentiment"}}
 {{"decision": "SELL", "confidence": 75, "sl_bias": "tighter", "tp_bias": "neutral", "reason": "Momentum reversal + weak volume"}}"""
         try:
-            genai.configure(api_key=self._gemini_key)
-            model = genai.GenerativeModel('models/gemini-2.5-flash')
+            model = get_gemini_model(self._gemini_key, safety=False)
             logger.info("[LLM DEBUG] Gemini çağrısı başlatılıyor.")
             logger.info(f"[LLM DEBUG] Gönderilen Prompt:\n{prompt}")
 
@@ -1607,7 +1591,7 @@ Examples:
                 text = response.text.strip()
                 match = re.search(r'\{.*\}', text, re.DOTALL)
                 if match:
-                    return json.loads(match.group())
+                    return loads_json(match.group())
         except Exception as e:
             logger.error("[LLM STATUS] Gemini çağrısı başarısız oldu → FALLBACK tetiklendi.", exc_info=True)
             logger.warning(f"[StrategyEngine] LLM consistency hatası: {e}")
@@ -73,6 +73,8 @@ class TelegramCommandHandler:
         
         self._running = False
         self._last_update_id = 0
+        # Poll ve gönderimler için tek HTTP oturumu (TLS bağlantısı korunur)
+        self._session: Optional[aiohttp.ClientSession] = None
         
         # Command registry
         self._commands = {
@@ -93,18 +95,21 @@ class TelegramCommandHandler:
         self._running = True
         logger.info(f"[TG_CMD] Starting command polling (interval={self.POLL_INTERVAL}s)")
         
-        while self._running:
-            try:
-                await self._poll_updates()
-            except asyncio.CancelledError:
-                logger.info("[TG_CMD] Polling cancelled")
-                break
-            except Exception as e:
-                import traceback
-                logger.error(f"[TG_CMD] Polling error: {type(e).__name__}: {e}")
-                logger.debug(f"[TG_CMD] Polling traceback: {traceback.format_exc()}")
-            
-            await asyncio.sleep(self.POLL_INTERVAL)
+        try:
+            while self._running:
+                try:
+                    await self._poll_updates()
+                except asyncio.CancelledError:
+                    logger.info("[TG_CMD] Polling cancelled")
+                    break
+                except Exception as e:
+                    import traceback
+                    logger.error(f"[TG_CMD] Polling error: {type(e).__name__}: {e}")
+                    logger.debug(f"[TG_CMD] Polling traceback: {traceback.format_exc()}")
+                
+                await asyncio.sleep(self.POLL_INTERVAL)
+        finally:
+            await self._close_session()
         
         logger.info("[TG_CMD] Polling stopped")
     
@@ -112,6 +117,18 @@ class TelegramCommandHandler:
         """Stop the polling loop."""
         self._running = False
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Paylaşılan HTTP oturumunu döndür (ilk kullanımda veya kapandıysa oluştur)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+    
+    async def _close_session(self):
+        """Paylaşılan HTTP oturumunu kapat."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     async def _poll_updates(self):
         """Poll Telegram API for new updates with graceful error handling."""
         url = f"{self.API_BASE}{self.bot_token}/getUpdates"
@@ -122,21 +139,21 @@ class TelegramCommandHandler:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # Total timeout slightly higher than long polling timeout
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=35)) as resp:
-                    if resp.status != 200:
-                        logger.debug(f"[TG_CMD] Poll returned status {resp.status}")
-                        return
-                    
-                    data = await resp.json()
-                    
-                    if not data.get("ok"):
-                        return
-                    
-                    for update in data.get("result", []):
-                        await self._handle_update(update)
-                        self._last_update_id = max(self._last_update_id, update.get("update_id", 0))
+            session = self._get_session()
+            # Total timeout slightly higher than long polling timeout
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=35)) as resp:
+                if resp.status != 200:
+                    logger.debug(f"[TG_CMD] Poll returned status {resp.status}")
+                    return
+                
+                data = await resp.json()
+            
+            if not data.get("ok"):
+                return
+            
+            for update in data.get("result", []):
+                await self._handle_update(update)
+                self._last_update_id = max(self._last_update_id, update.get("update_id", 0))
         except asyncio.TimeoutError:
             # Normal for long polling when no updates - not an error
             logger.debug("[TG_CMD] Poll timeout (normal for long polling)")
@@ -197,11 +214,11 @@ class TelegramCommandHandler:
             "disable_web_page_preview": True
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status != 200:
-                    error = await resp.text()
-                    logger.error(f"[TG_CMD] Send failed: {error}")
+        session = self._get_session()
+        async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            if resp.status != 200:
+                error = await resp.text()
+                logger.error(f"[TG_CMD] Send failed: {error}")
     
     # ═══════════════════════════════════════════════════════════════════════════
     # COMMAND HANDLERS
@@ -252,20 +269,22 @@ class TelegramCommandHandler:
         positions = portfolio.get("positions", [])
         history = portfolio.get("history", [])
         
-        # Calculate stats
+        # Calculate stats + today's PnL in a single pass over history
+        today = datetime.now().strftime("%Y-%m-%d")
         total_trades = len(history)
-        winning = len([h for h in history if h.get("profit_loss", 0) > 0])
-        losing = len([h for h in history if h.get("profit_loss", 0) < 0])
-        total_pnl = sum(h.get("profit_loss", 0) for h in history)
+        winning = losing = 0
+        total_pnl = today_pnl = 0.0
+        for h in history:
+            pnl = h.get("profit_loss", 0) or 0
+            total_pnl += pnl
+            if pnl > 0:
+                winning += 1
+            elif pnl < 0:
+                losing += 1
+            if str(h.get("exit_time", "")).startswith(today):
+                today_pnl += pnl
         win_rate = (winning / total_trades * 100) if total_trades > 0 else 0
         
-        # Today's PnL
-        today = datetime.now().strftime("%Y-%m-%d")
-        today_pnl = sum(
-            h.get("profit_loss", 0) for h in history 
-            if str(h.get("exit_time", "")).startswith(today)
-        )
-        
         # Build message
         lines = [
             "💼 <b>PORTFÖY ÖZETİ</b>",
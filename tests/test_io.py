@@ -0,0 +1,46 @@
+"""
+test_io.py - Unit Tests for Atomic JSON I/O
+============================================
+
+Tests write_atomic_json round-trips, including non-finite floats.
+"""
+
+import sys
+import os
+import math
+import shutil
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+from utils.io import write_atomic_json, read_json_safe
+
+
+class TestWriteAtomicJson(unittest.TestCase):
+    """write_atomic_json must round-trip the same values with or without orjson."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "portfolio.json")
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_round_trip(self):
+        data = {"balance": 1000.5, "positions": [{"symbol": "BTC", "quantity": 0.01}]}
+        self.assertTrue(write_atomic_json(self.path, data))
+        self.assertEqual(read_json_safe(self.path), data)
+    
+    def test_non_finite_floats_survive(self):
+        data = {"profit_pct": float("nan"), "history": [{"atr": float("inf")}, {"sl": float("-inf")}]}
+        self.assertTrue(write_atomic_json(self.path, data))
+        loaded = read_json_safe(self.path)
+        self.assertTrue(math.isnan(loaded["profit_pct"]))
+        self.assertEqual(loaded["history"][0]["atr"], float("inf"))
+        self.assertEqual(loaded["history"][1]["sl"], float("-inf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+test_order_executor.py - Unit Tests for Order Executor
+=======================================================
+
+Tests integer slippage/fee simulation and simulated order responses.
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+import order_executor
+from order_executor import OrderExecutor
+
+
+class TestSimulateSlippageAndFees(unittest.TestCase):
+    """Rates below 1 bp resolution must be applied exactly, not rounded."""
+    
+    def setUp(self):
+        self.executor = OrderExecutor(dry_run=True)
+    
+    def test_fractional_bp_fee(self):
+        # %0.075 (7.5 bp) fee on $1000 notional = $0.75 (not 8 bp = $0.80)
+        price, fee = self.executor.simulate_slippage_and_fees(
+            100.0, 10.0, slippage_pct=0.0, fee_pct=0.00075
+        )
+        self.assertEqual(price, 100.0)
+        self.assertEqual(fee, 0.75)
+    
+    def test_fractional_bp_slippage(self):
+        # 1.5 bp slippage on 20000 = 20003.0 (not 2 bp = 20004.0)
+        price, fee = self.executor.simulate_slippage_and_fees(
+            20000.0, 1.0, slippage_pct=0.00015, fee_pct=0.001
+        )
+        self.assertEqual(price, 20003.0)
+        self.assertEqual(fee, 20.003)
+    
+    def test_simulated_limit_family_reports_price(self):
+        order = self.executor._create_simulated_order(
+            "BTCUSDT", "BUY", 0.01, order_type="STOP_LOSS_LIMIT", price=42000.0
+        )
+        self.assertEqual(order["type"], "STOP_LOSS_LIMIT")
+        self.assertEqual(float(order["price"]), 42000.0)
+    
+    @unittest.skipUnless(order_executor.NUMPY_AVAILABLE, "numpy not installed")
+    def test_batch_matches_scalar(self):
+        prices, quantities = [100.0, 20000.0], [10.0, 1.0]
+        exec_px, fees = order_executor.simulate_slippage_and_fees_batch(
+            prices, quantities, slippage_bp=1.5, fee_bp=7.5
+        )
+        for i, (p, q) in enumerate(zip(prices, quantities)):
+            px, fee = self.executor.simulate_slippage_and_fees(p, q, slippage_pct=0.00015, fee_pct=0.00075)
+            self.assertEqual(exec_px[i], px)
+            self.assertEqual(fees[i], fee)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+test_order_ledger.py - Unit Tests for Order Ledger
+===================================================
+
+Tests signal_id idempotency, persistence and legacy JSON migration.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+from order_ledger import OrderLedger
+
+
+class TestOrderLedger(unittest.TestCase):
+    """Tests for OrderLedger blocking and persistence."""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "ledger.db")
+        self.ledger = OrderLedger(filepath=self.db_path, enabled=True, legacy_json_path=None)
+    
+    def tearDown(self):
+        self.ledger.close()
+        shutil.rmtree(self.test_dir)
+    
+    def test_new_signal_not_blocked(self):
+        """Unknown signal_id should not be blocked."""
+        self.assertEqual(self.ledger.is_blocked("SIG_1"), (False, "new_signal"))
+    
+    def test_filled_signal_blocked(self):
+        """Filled signal_id should be blocked as duplicate."""
+        self.ledger.record("SIG_1", "BTCUSDT", "BUY", "filled", [123], 0.01, 42000.0)
+        blocked, reason = self.ledger.is_blocked("SIG_1")
+        self.assertTrue(blocked)
+        self.assertEqual(reason, "duplicate_signal_status_filled")
+    
+    def test_update_status(self):
+        """update_status should change status and keep untouched fields."""
+        self.ledger.record("SIG_1", "BTCUSDT", "BUY", "submitted", [1], 0.0, 0.0)
+        self.assertTrue(self.ledger.update_status("SIG_1", "filled", filled_qty=0.5))
+        entry = self.ledger.get_entry("SIG_1")
+        self.assertEqual(entry["status"], "filled")
+        self.assertEqual(entry["filled_qty"], 0.5)
+        self.assertEqual(entry["order_ids"], [1])
+        self.assertFalse(self.ledger.update_status("MISSING", "filled"))
+    
+    def test_persistence(self):
+        """Entries should survive reopening the database."""
+        self.ledger.record("SIG_1", "BTCUSDT", "BUY", "filled")
+        reopened = OrderLedger(filepath=self.db_path, enabled=True, legacy_json_path=None)
+        try:
+            self.assertTrue(reopened.is_blocked("SIG_1")[0])
+        finally:
+            reopened.close()
+
+    def test_startup_cache_is_bounded(self):
+        """Only the newest entries are preloaded; older ones still block via lookup."""
+        for i in range(5):
+            self.ledger.record(f"SIG_{i}", "BTCUSDT", "BUY", "filled")
+            self.ledger._conn.execute("UPDATE ledger SET created_ts = ? WHERE signal_id = ?", (i, f"SIG_{i}"))
+
+        class SmallLedger(OrderLedger):
+            STATUS_CACHE_SIZE = 2
+
+        reopened = SmallLedger(filepath=self.db_path, enabled=True, legacy_json_path=None)
+        try:
+            self.assertEqual(list(reopened._status_cache), ["SIG_3", "SIG_4"])
+            self.assertTrue(reopened.is_blocked("SIG_0")[0])
+            self.assertEqual(reopened.is_blocked("SIG_NEW"), (False, "new_signal"))
+        finally:
+            reopened.close()
+
+    def test_closed_ledger_acts_disabled(self):
+        """Calls after close() should not raise."""
+        self.ledger.record("SIG_1", "BTCUSDT", "BUY", "filled")
+        self.ledger.close()
+        self.assertEqual(self.ledger.is_blocked("SIG_1"), (False, "ledger_disabled"))
+        self.assertFalse(self.ledger.update_status("SIG_1", "canceled"))
+        self.assertIsNone(self.ledger.get_entry("SIG_1"))
+
+    def test_cleanup_old(self):
+        """cleanup_old should delete only entries past max age."""
+        self.ledger.record("OLD", "BTCUSDT", "BUY", "filled")
+        self.ledger.record("NEW", "BTCUSDT", "BUY", "filled")
+        self.ledger._conn.execute("UPDATE ledger SET created_ts = 0 WHERE signal_id = 'OLD'")
+        self.assertEqual(self.ledger.cleanup_old(max_age_days=30), 1)
+        self.assertIsNone(self.ledger.get_entry("OLD"))
+        self.assertIsNotNone(self.ledger.get_entry("NEW"))
+    
+    def test_legacy_json_migration(self):
+        """Legacy JSON ledger should be imported on first open."""
+        legacy_path = os.path.join(self.test_dir, "ledger.json")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump({"SIG_OLD": {"symbol": "ETHUSDT", "side": "BUY", "status": "filled",
+                                   "created_ts": 1, "order_ids": [], "filled_qty": 1.0,
+                                   "avg_price": 3000.0}}, f)
+        migrated = OrderLedger(filepath=os.path.join(self.test_dir, "m.db"),
+                               enabled=True, legacy_json_path=legacy_path)
+        try:
+            self.assertTrue(migrated.is_blocked("SIG_OLD")[0])
+            self.assertEqual(migrated.get_entry("SIG_OLD")["symbol"], "ETHUSDT")
+        finally:
+            migrated.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+test_position_manager.py - Unit Tests for Position Manager
+===========================================================
+
+Tests SL/TP hit detection (NumPy vs fallback) and quiet-band settings.
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unittest
+from unittest import mock
+
+import position_manager
+from position_manager import PositionManager
+
+
+class TestDetectSlTpHits(unittest.TestCase):
+    """NumPy and fallback paths must agree on SL/TP triggers."""
+    
+    POSITIONS = [
+        {"symbol": "BTC", "stop_loss": 90, "take_profit": 110},   # SL hit
+        {"symbol": "ETH", "stop_loss": 90, "take_profit": 110},   # TP hit
+        {"symbol": "SOL", "stop_loss": 0, "take_profit": 0},      # 0 = no level
+        {"symbol": "XRP", "stop_loss": None, "take_profit": None},
+        {"symbol": "ADA"},                                        # missing levels
+        {"symbol": "DOGE", "stop_loss": 90, "take_profit": 110},  # no price
+    ]
+    PRICES = {"BTC": 85.0, "ETH": 120.0, "SOL": 50.0, "XRP": 50.0, "ADA": 50.0}
+    EXPECTED_SL = [True, False, False, False, False, False]
+    EXPECTED_TP = [False, True, False, False, False, False]
+    
+    def test_fallback_path(self):
+        with mock.patch.object(position_manager, "NUMPY_AVAILABLE", False):
+            sl_hit, tp_hit = PositionManager._detect_sltp_hits(self.POSITIONS, self.PRICES)
+        self.assertEqual(sl_hit, self.EXPECTED_SL)
+        self.assertEqual(tp_hit, self.EXPECTED_TP)
+    
+    @unittest.skipUnless(position_manager.NUMPY_AVAILABLE, "numpy not installed")
+    def test_numpy_path_matches_fallback(self):
+        vectorized = PositionManager._detect_sltp_hits(self.POSITIONS, self.PRICES)
+        with mock.patch.object(position_manager, "NUMPY_AVAILABLE", False):
+            fallback = PositionManager._detect_sltp_hits(self.POSITIONS, self.PRICES)
+        self.assertEqual(vectorized, fallback)
+        self.assertEqual(vectorized, (self.EXPECTED_SL, self.EXPECTED_TP))
+
+
+
+class TestQuietBandRatio(unittest.TestCase):
+    """Out-of-range SLTP_QUIET_BAND_RATIO values are clamped to [0, 1)."""
+    
+    def test_clamp(self):
+        validate = PositionManager._validated_quiet_band_ratio
+        self.assertEqual(validate(0.5), 0.5)
+        self.assertEqual(validate(0), 0)
+        self.assertEqual(validate(-0.2), 0.0)
+        self.assertLess(validate(1.0), 1.0)
+        self.assertLess(validate(3.0), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
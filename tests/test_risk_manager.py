@@ -12,7 +12,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import unittest
-from risk_manager import RiskManager
+import risk_manager
+from risk_manager import RiskManager, _kelly_fraction
 
 
 class TestRiskManagerInit(unittest.TestCase):
@@ -124,6 +125,105 @@ class TestCalculateQuantity(unittest.TestCase):
         self.assertLessEqual(qty, 1.0)  # Should be at most 10% of balance/price = 1
 
 
+class TestBatchSizing(unittest.TestCase):
+    """Batch SL/TP and quantity must match the scalar methods."""
+    
+    def setUp(self):
+        self.rm = RiskManager()
+    
+    def test_sl_tp_batch_matches_scalar(self):
+        prices = [100.0, 50.0, 2.5]
+        atrs = [2.0, 0, None]
+        sls, tps = self.rm.calculate_sl_tp_batch(prices, atrs, sl_bias="tighter")
+        for price, atr, sl, tp in zip(prices, atrs, sls, tps):
+            expected = self.rm._calculate_sl_tp(price, atr, sl_bias="tighter")
+            self.assertAlmostEqual(sl, expected["stop_loss"], places=2)
+            self.assertAlmostEqual(tp, expected["take_profit"], places=2)
+    
+    def test_sl_tp_batch_per_symbol_bias(self):
+        biases = ["tighter", "looser"]
+        sls, _ = self.rm.calculate_sl_tp_batch([100.0, 100.0], [2.0, 2.0], sl_bias=biases)
+        for bias, sl in zip(biases, sls):
+            self.assertAlmostEqual(sl, self.rm._calculate_sl_tp(100.0, 2.0, sl_bias=bias)["stop_loss"], places=2)
+    
+    def test_quantity_batch_matches_scalar(self):
+        prices = [100.0, 100.0, 100.0, 20.0]
+        stop_losses = [90.0, 99.9, 105.0, None]
+        qtys = self.rm.calculate_quantity_batch(1000, prices, stop_losses)
+        for price, sl, qty in zip(prices, stop_losses, qtys):
+            self.assertAlmostEqual(qty, self.rm._calculate_quantity(1000, price, sl), places=6)
+
+    def test_entry_risk_batch_matches_scalar(self):
+        def snapshot(price, adx=30):
+            return {
+                "price": price,
+                "technical": {"trend": "BULLISH", "adx": adx, "atr": (price or 0) * 0.02},
+                "volume_24h": 5_000_000,
+                "sentiment": {"fear_greed": {"value": 50}},
+            }
+        snapshots = [snapshot(100.0), snapshot(50.0, adx=5), snapshot(2.5), snapshot(None)]
+        decisions = [
+            {"action": "BUY", "confidence": 80, "metadata": {"sl_bias": "tighter"}},
+            {"action": "BUY", "confidence": 80},
+            {"action": "HOLD", "confidence": 80},
+            {"action": "BUY", "confidence": 80},
+        ]
+        portfolio = {"balance": 1000}
+        batch = self.rm.evaluate_entry_risk_batch(snapshots, decisions, portfolio)
+        for snap, decision, result in zip(snapshots, decisions, batch):
+            expected = self.rm.evaluate_entry_risk(snap, decision, portfolio)
+            self.assertEqual(result.keys(), expected.keys())
+            for key, value in expected.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(result[key], value, places=6)
+                else:
+                    self.assertEqual(result[key], value)
+        self.assertTrue(batch[0]["allowed"])
+
+
+class TestKellySizing(unittest.TestCase):
+    """Tests for the optional Kelly risk cap."""
+    
+    def test_kelly_fraction(self):
+        # p = 0.6, b = 1 -> k = 0.6 - 0.4 = 0.2
+        self.assertAlmostEqual(_kelly_fraction([0.02] * 6 + [-0.02] * 4), 0.2)
+        # No edge or one-sided history -> 0
+        self.assertEqual(_kelly_fraction([0.01, -0.03]), 0.0)
+        self.assertEqual(_kelly_fraction([0.01, 0.02]), 0.0)
+    
+    def test_kelly_only_lowers_risk(self):
+        rm = RiskManager()
+        rm._kelly_enabled = True
+        rm._kelly_min_trades = 10
+        rm._strategy_mode = "LEGACY"
+        weak = {"history": [{"profit_pct": 1.0}] * 5 + [{"profit_pct": -1.0}] * 5}
+        strong = {"history": [{"profit_pct": 5.0}] * 9 + [{"profit_pct": -1.0}]}
+        # No edge -> floored risk, never 0 (0 would turn every BUY into HOLD forever)
+        self.assertAlmostEqual(rm._kelly_risk_pct(weak), rm._risk_per_trade * 0.25)
+        losing = {"history": [{"profit_pct": -1.0}] * 10}
+        self.assertGreater(rm._kelly_risk_pct(losing), 0)
+        snapshot = {
+            "price": 100.0,
+            "technical": {"trend": "BULLISH", "adx": 30, "atr": 2.0},
+            "volume_24h": 5_000_000,
+            "sentiment": {"fear_greed": {"value": 50}},
+        }
+        decision = rm.evaluate_entry_risk(
+            snapshot, {"action": "BUY", "confidence": 80}, {"balance": 1000, **losing}
+        )
+        self.assertTrue(decision["allowed"])
+        self.assertLessEqual(rm._kelly_risk_pct(strong), rm._risk_per_trade)
+        self.assertIsNone(rm._kelly_risk_pct({"history": []}))
+    
+    def test_kelly_warns_once_without_history(self):
+        rm = RiskManager()
+        rm._kelly_enabled = True
+        with self.assertLogs(risk_manager.logger, level="WARNING") as logs:
+            self.assertIsNone(rm._kelly_risk_pct({"balance": 1000}))
+            self.assertIsNone(rm._kelly_risk_pct({"balance": 1000}))
+        self.assertEqual(len([m for m in logs.output if "KELLY" in m]), 1)
+
+
 class TestCheckGuardrails(unittest.TestCase):
     """Tests for risk guardrails."""
     
@@ -144,7 +244,7 @@ class TestCheckGuardrails(unittest.TestCase):
             }
         }
         result = self.rm._check_guardrails(snapshot, confidence=70)
-        self.assertTrue(result["passed"])
+        self.assertTrue(result.passed)
     
     def test_block_strong_bearish(self):
         """Should block on strong bearish trend."""
@@ -158,8 +258,8 @@ class TestCheckGuardrails(unittest.TestCase):
             "sentiment": {"fear_greed": {"value": 50}}
         }
         result = self.rm._check_guardrails(snapshot)
-        self.assertFalse(result["passed"])
-        self.assertIn("downtrend", result["reason"])
+        self.assertFalse(result.passed)
+        self.assertIn("downtrend", result.reason)
     
     def test_block_low_adx(self):
         """Should block on low ADX (weak trend)."""
@@ -173,8 +273,8 @@ class TestCheckGuardrails(unittest.TestCase):
             "sentiment": {"fear_greed": {"value": 50}}
         }
         result = self.rm._check_guardrails(snapshot)
-        self.assertFalse(result["passed"])
-        self.assertIn("ADX", result["reason"])
+        self.assertFalse(result.passed)
+        self.assertIn("ADX", result.reason)
     
     def test_block_low_volume(self):
         """Should block on low volume."""
@@ -188,8 +288,8 @@ class TestCheckGuardrails(unittest.TestCase):
             "sentiment": {"fear_greed": {"value": 50}}
         }
         result = self.rm._check_guardrails(snapshot)
-        self.assertFalse(result["passed"])
-        self.assertIn("Volume", result["reason"])
+        self.assertFalse(result.passed)
+        self.assertIn("Volume", result.reason)
     
     def test_block_extreme_fear(self):
         """Should block on extreme fear."""
@@ -205,8 +305,8 @@ class TestCheckGuardrails(unittest.TestCase):
             }
         }
         result = self.rm._check_guardrails(snapshot)
-        self.assertFalse(result["passed"])
-        self.assertIn("Fear", result["reason"])
+        self.assertFalse(result.passed)
+        self.assertIn("Fear", result.reason)
     
     def test_skip_volume_check_when_missing(self):
         """Should skip volume check when data missing."""
@@ -221,7 +321,7 @@ class TestCheckGuardrails(unittest.TestCase):
         }
         result = self.rm._check_guardrails(snapshot)
         # Should pass (volume check skipped)
-        self.assertTrue(result["passed"])
+        self.assertTrue(result.passed)
 
 
 class TestEvaluateEntryRisk(unittest.TestCase):
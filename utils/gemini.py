@@ -0,0 +1,71 @@
+"""
+utils/gemini.py - Paylaşılan Gemini Model Örnekleri
+===================================================
+
+Her LLM çağrısında genai.configure() + GenerativeModel() kurmak yerine
+API key başına tek yapılandırma ve tek model örneği kullanılır.
+
+Usage:
+    from utils.gemini import get_gemini_model
+
+    model = get_gemini_model(SETTINGS.GEMINI_API_KEY)
+    response = model.generate_content(prompt)
+"""
+
+from threading import Lock
+
+# Gemini import (opsiyonel)
+try:
+    import google.generativeai as genai
+    GEMINI_AVAILABLE = True
+except ImportError:
+    genai = None
+    GEMINI_AVAILABLE = False
+
+GEMINI_MODEL_NAME = "models/gemini-2.5-flash"
+
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+]
+
+_lock = Lock()
+_configured_key = None
+_models = {}  # {safety: GenerativeModel}
+
+
+def get_gemini_model(api_key: str, safety: bool = True):
+    """
+    API key için paylaşılan GenerativeModel'i döndür.
+
+    genai.configure() sadece key değiştiğinde çağrılır; model örnekleri
+    (safety ayarlı / ayarsız) key değişene kadar yeniden kullanılır.
+
+    Args:
+        api_key: Gemini API key
+        safety: True ise SAFETY_SETTINGS (BLOCK_NONE) uygulanır
+
+    Raises:
+        ImportError: google-generativeai kurulu değilse
+    """
+    global _configured_key
+
+    if not GEMINI_AVAILABLE:
+        raise ImportError("google-generativeai kurulu değil")
+
+    with _lock:
+        if api_key != _configured_key:
+            genai.configure(api_key=api_key)
+            _configured_key = api_key
+            _models.clear()
+
+        model = _models.get(safety)
+        if model is None:
+            if safety:
+                model = genai.GenerativeModel(GEMINI_MODEL_NAME, safety_settings=SAFETY_SETTINGS)
+            else:
+                model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+            _models[safety] = model
+        return model
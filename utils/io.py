@@ -5,20 +5,33 @@ utils/io.py - Atomic File I/O Helpers
 Production-grade file I/O utilities for crash-safe JSON writes.
 
 Usage:
-    from utils.io import write_atomic_json, read_json_safe
+    from utils.io import write_atomic_json, write_atomic_bytes, read_json_safe, loads_json
     
     # Atomic write (crash-safe)
     write_atomic_json("portfolio.json", portfolio_data)
     
     # Safe read with schema healing
     data = read_json_safe("portfolio.json", default={"balance": 1000})
+    
+    # Append-only JSON-Lines (örn. kapanmış işlem arşivi)
+    append_jsonl("history.jsonl", [trade])
+    trades = read_jsonl("history.jsonl")
 """
 
 import os
 import json
+import math
 import tempfile
 from typing import Any, Optional
 
+# orjson opsiyonel - varsa JSON serialize ~5-10x hızlı, yoksa stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 
 def rotate_backups(filepath: str, max_backups: int = 3) -> None:
     """
@@ -62,10 +75,35 @@ def rotate_backups(filepath: str, max_backups: int = 3) -> None:
         print(f"[BACKUP_ROTATION_ERROR] {filepath}: {e}")
 
 
+def _has_non_finite(data: Any) -> bool:
+    """
+    Veride NaN/±Inf float var mı (iç içe dict/list/tuple dahil).
+    
+    orjson bunları sessizce null yazar; stdlib json NaN/Infinity olarak
+    korur ve geri float okunur. Böyle veride orjson kullanılmamalı.
+    """
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
 def write_atomic_json(path: str, data: Any, indent: int = 2, backup: bool = False, max_backups: int = 3) -> bool:
     """
     Atomik JSON yazımı - crash durumunda dosya bozulmaz.
     
+    Veri önce bytes'a serialize edilir (orjson kuruluysa ve indent 2/None ise
+    orjson, aksi halde veya orjson veriyi desteklemiyorsa stdlib json), sonra
+    write_atomic_bytes ile tek write + fsync + rename yapılır. NaN/±Inf içeren
+    veri stdlib json ile yazılır (orjson bunları null'a çevirirdi).
+    
     Flow:
     1. (Opsiyonel) Backup rotation yap
     2. Geçici dosyaya yaz (.tmp suffix)
@@ -79,6 +117,43 @@ def write_atomic_json(path: str, data: Any, indent: int = 2, backup: bool = Fals
         backup: Enable backup rotation before overwrite
         max_backups: Number of backup files to keep (default: 3)
     
+    Returns:
+        bool: Başarılı ise True
+    """
+    # Payload tek seferde bytes olarak hazırlanır: tmp dosyaya tek write çağrısı
+    payload = None
+    if ORJSON_AVAILABLE and indent in (2, None) and not _has_non_finite(data):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        try:
+            payload = orjson.dumps(data, option=option)
+        except TypeError:
+            payload = None
+    
+    if payload is None:
+        try:
+            payload = json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8")
+        except Exception as e:
+            print(f"[ATOMIC_WRITE_ERROR] {path}: {e}")
+            return False
+    
+    return write_atomic_bytes(path, payload, backup=backup, max_backups=max_backups)
+
+
+def write_atomic_bytes(path: str, payload: bytes, backup: bool = False, max_backups: int = 3) -> bool:
+    """
+    Atomik ham byte yazımı - önceden serialize edilmiş veri için (örn. orjson).
+    
+    Akış: backup -> tmp -> fsync -> rename; serialize adımı çağırana
+    bırakılır (write_atomic_json da bu fonksiyon üzerinden yazar).
+    
+    Args:
+        path: Hedef dosya yolu
+        payload: Yazılacak byte içeriği
+        backup: Enable backup rotation before overwrite
+        max_backups: Number of backup files to keep (default: 3)
+    
     Returns:
         bool: Başarılı ise True
     """
@@ -95,21 +170,22 @@ def write_atomic_json(path: str, data: Any, indent: int = 2, backup: bool = Fals
         if backup and os.path.exists(path):
             rotate_backups(path, max_backups)
         
-        # 2. Geçici dosyaya yaz
+        # 2. Geçici dosyaya yaz - hedefle aynı dizinde: os.replace ancak aynı
+        #    dosya sisteminde atomiktir (farklı FS'de kopyalama olurdu)
         with tempfile.NamedTemporaryFile(
-            mode='w',
+            mode='wb',
             suffix='.tmp',
             dir=dir_name,
-            delete=False,
-            encoding='utf-8'
+            delete=False
         ) as tmp_file:
-            json.dump(data, tmp_file, indent=indent, ensure_ascii=False)
+            tmp_path = tmp_file.name
+            tmp_file.write(payload)
             tmp_file.flush()
-            # 3. fsync ile diske zorla
+            # 3. fsync ile diske zorla - rename'den önce veri diskte olmalı,
+            #    yoksa crash sonrası hedef boş/yarım dosyaya işaret edebilir
             os.fsync(tmp_file.fileno())
-            tmp_path = tmp_file.name
         
-        # 4. Atomik rename
+        # 4. Atomik rename - okuyan taraf ya eski ya yeni dosyayı görür, yarımını asla
         os.replace(tmp_path, path)
         
         return True
@@ -118,7 +194,7 @@ def write_atomic_json(path: str, data: Any, indent: int = 2, backup: bool = Fals
         print(f"[ATOMIC_WRITE_ERROR] Permission denied for {path}: {e}")
         return False
     except Exception as e:
-        # Cleanup temp file if exists
+        # Cleanup temp file if exists (hedef dosya dokunulmadan kalır)
         try:
             if 'tmp_path' in locals() and os.path.exists(tmp_path):
                 os.remove(tmp_path)
@@ -129,6 +205,21 @@ def write_atomic_json(path: str, data: Any, indent: int = 2, backup: bool = Fals
         return False
 
 
+def loads_json(text) -> Any:
+    """
+    JSON string/bytes parse - orjson kuruluysa onunla (2-5x hızlı).
+    
+    orjson'un reddettiği ama stdlib'in kabul ettiği girdide (örn. NaN)
+    json.loads'a düşülür; geçersiz girdide json.JSONDecodeError yükselir.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
 def read_json_safe(path: str, default: Any = None, schema_keys: list = None) -> Any:
     """
     Güvenli JSON okuma - hata durumunda default döner.
@@ -166,6 +257,72 @@ def read_json_safe(path: str, default: Any = None, schema_keys: list = None) ->
         return default
 
 
+def append_jsonl(path: str, records: list, fsync: bool = True) -> bool:
+    """
+    Kayıtları JSON-Lines dosyasının sonuna ekle (dosyanın geri kalanı yazılmaz).
+    
+    Args:
+        path: Hedef .jsonl dosyası
+        records: JSON serializable kayıtlar (her biri bir satır)
+        fsync: Dönmeden önce diske zorla
+    
+    Returns:
+        bool: Başarılı ise True
+    """
+    if not records:
+        return True
+    
+    dir_name = os.path.dirname(path) or "."
+    try:
+        os.makedirs(dir_name, exist_ok=True)
+    except Exception:
+        pass
+    
+    try:
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        return True
+    except Exception as e:
+        print(f"[JSONL_APPEND_ERROR] {path}: {e}")
+        return False
+
+
+def read_jsonl(path: str, limit: Optional[int] = None) -> list:
+    """
+    JSON-Lines dosyasını oku; bozuk satırlar atlanır.
+    
+    Args:
+        path: .jsonl dosya yolu
+        limit: Sadece ilk `limit` kayıt (None = hepsi)
+    
+    Returns:
+        Kayıt listesi (dosya yoksa boş)
+    """
+    records = []
+    if not os.path.exists(path):
+        return records
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if limit is not None and len(records) >= limit:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    print(f"[JSONL_READ_ERROR] {path}: {e}")
+    except Exception as e:
+        print(f"[FILE_READ_ERROR] {path}: {e}")
+    return records
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TEST
 # ═══════════════════════════════════════════════════════════════════════════════